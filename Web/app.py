@@ -1,4 +1,5 @@
 import sys
+import time
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QIcon
@@ -15,8 +16,9 @@ logger = logging.getLogger(__name__)
 
 
 class WhatsAppAutomatorApp(QApplication):
-    def __init__(self, argv):
+    def __init__(self, argv, started: float):
         super().__init__(argv)
+        self.started = started
         self.setApplicationName(APP_NAME)
         self.setApplicationDisplayName(f"{APP_NAME} v{APP_VERSION}")
         self.setOrganizationName("WhatsApp Automator")
@@ -31,7 +33,7 @@ class WhatsAppAutomatorApp(QApplication):
 
     def run(self):
         try:
-            self.main_window = MainWindow()
+            self.main_window = MainWindow(app_started=self.started)
             self.main_window.show()
             logger.info(f"{APP_NAME} started successfully")
             return self.exec()
@@ -41,7 +43,27 @@ class WhatsAppAutomatorApp(QApplication):
 
 
 def main():
-    app = WhatsAppAutomatorApp(sys.argv)
+    started = time.perf_counter()
+    if "--login" in sys.argv[1:]:
+        # Link the session from a terminal, no display needed
+        import argparse
+        from ui.terminal_login import run_terminal_login
+        from services.worker_pool import worker_profile_name
+
+        parser = argparse.ArgumentParser(description="Link a WhatsApp session from the terminal")
+        parser.add_argument("--login", action="store_true", help="show the QR code in this terminal")
+        target = parser.add_mutually_exclusive_group()
+        target.add_argument("--worker", type=int, metavar="N",
+                            help="link the profile of parallel browser N (1 is the main profile)")
+        target.add_argument("--profile", help="link the Chrome profile with this folder name")
+        args = parser.parse_args()
+
+        if args.worker is not None and args.worker < 1:
+            parser.error("--worker counts from 1")
+        profile_name = args.profile or worker_profile_name((args.worker or 1) - 1)
+        sys.exit(run_terminal_login(profile_name))
+
+    app = WhatsAppAutomatorApp(sys.argv, started)
     sys.exit(app.run())
 
 
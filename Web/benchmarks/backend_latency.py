@@ -0,0 +1,90 @@
+import sys
+import time
+import argparse
+import statistics
+import tempfile
+from pathlib import Path
+from urllib.parse import quote
+from selenium.webdriver.common.by import By
+from services.whatsapp_service import WhatsAppService
+from services.browser_backend import WebDriverBackend, CdpBackend
+from config import BROWSER_BACKEND_CDP
+
+# A chat-like page: a composer, a file input and a column of outgoing bubbles
+MOCK_PAGE = """
+<html><body>
+<div id="main">
+""" + "".join(f'<div class="message-out">bubble {i}</div>' for i in range(50)) + """
+</div>
+<div id="box" contenteditable="true" role="textbox" style="min-height:40px"></div>
+<input type="file" multiple>
+</body></html>
+"""
+
+BUBBLE_XPATH = "//div[@id='main']//div[contains(@class,'message-out')]"
+
+
+def time_command(command, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        command()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings)
+
+
+def compare_backends(service: WhatsAppService, upload: Path, repeat: int):
+    backends = [WebDriverBackend(service.driver)]
+    try:
+        backends.append(CdpBackend(service.driver))
+    except Exception as e:
+        print(f"DevTools backend unavailable: {e}", file=sys.stderr)
+
+    try:
+        service.driver.get("data:text/html;charset=utf-8," + quote(MOCK_PAGE))
+        box = service.driver.find_element(By.ID, "box")
+        box.click()
+
+        commands = {
+            "evaluate": lambda backend: backend.evaluate("document.title"),
+            "count": lambda backend: backend.count(BUBBLE_XPATH),
+            "insert_text": lambda backend: backend.insert_text(box, "hello"),
+            "set_files": lambda backend: backend.set_files((By.CSS_SELECTOR, 'input[type="file"]'), [str(upload)]),
+        }
+
+        print(f"{'command':<12}" + "".join(f"{backend.name + ' (ms)':>16}" for backend in backends))
+        for name, command in commands.items():
+            medians = [time_command(lambda: command(backend), repeat) for backend in backends]
+            row = f"{name:<12}" + "".join(f"{median * 1000:>16.2f}" for median in medians)
+            if len(medians) == 2 and backends[1].name == BROWSER_BACKEND_CDP:
+                row += f"  {medians[0] / medians[1]:.1f}x"
+            print(row)
+    finally:
+        for backend in backends:
+            backend.close()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare per-command latency of the WebDriver and DevTools backends")
+    parser.add_argument("--repeat", type=int, default=50, help="runs per command, the median is reported")
+    args = parser.parse_args(argv)
+
+    # One scratch directory for the browser profile, the service's caches and the upload file
+    with tempfile.TemporaryDirectory(prefix="backend-latency-") as workdir:
+        service = WhatsAppService(profile_name="benchmark_profile", data_dir=Path(workdir))
+        try:
+            if not service.initialize_driver(use_headless=True):
+                print("Could not start Chrome", file=sys.stderr)
+                return 1
+            upload = Path(workdir) / "upload.txt"
+            upload.write_text("benchmark")
+            compare_backends(service, upload, args.repeat)
+        finally:
+            service.close()
+            service.registration_cache.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
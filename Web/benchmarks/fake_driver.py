@@ -0,0 +1,213 @@
+import time
+import hashlib
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit, parse_qs
+from selenium.webdriver.common.keys import Keys
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    WebDriverException
+)
+from services.browser_backend import INSERT_TEXT_SCRIPT
+from services.delivery_tracker import TRACK_LAST_MESSAGE_SCRIPT, DRAIN_EVENTS_SCRIPT
+from config import (
+    WHATSAPP_WEB_URL,
+    LOGIN_CHECK_XPATH,
+    MESSAGE_INPUT_XPATH,
+    MESSAGE_INPUT_XPATH_FALLBACK,
+    SEND_BUTTON_XPATH,
+    OUTGOING_MESSAGE_XPATH,
+    CHAT_HEADER_TITLE_XPATH,
+    INVALID_NUMBER_POPUP_XPATH,
+    POPUP_CONFIRM_BUTTON_XPATH
+)
+
+
+class FakeElement:
+    def __init__(self, driver: "FakeDriver", role: str, text: str = ""):
+        self.driver = driver
+        self.role = role
+        self.generation = driver.generation
+        self._text = text
+
+    def _check(self):
+        self.driver._command()
+        if self.generation != self.driver.generation:
+            raise StaleElementReferenceException(f"{self.role} belongs to a page that was left")
+
+    @property
+    def text(self) -> str:
+        self._check()
+        return self._text
+
+    def is_displayed(self) -> bool:
+        self._check()
+        return self.role != "popup_button" or self.driver.popup
+
+    def is_enabled(self) -> bool:
+        self._check()
+        return True
+
+    def get_attribute(self, name: str) -> Optional[str]:
+        self._check()
+        return None
+
+    def click(self):
+        self._check()
+        self.driver.focused = self
+        if self.role == "send_button":
+            self.driver._send()
+        elif self.role == "popup_button":
+            self.driver.popup = False
+
+    def clear(self):
+        self._check()
+        self._text = ""
+
+    def send_keys(self, *keys: str):
+        self._check()
+        for key in keys:
+            if key == Keys.ENTER and self.role == "composer":
+                self.driver._send()
+            else:
+                self._text += "".join(char for char in key if char >= " " or char == "\n")
+
+
+class _SwitchTo:
+    def __init__(self, driver: "FakeDriver"):
+        self.driver = driver
+
+    @property
+    def active_element(self):
+        self.driver._command()
+        return self.driver.focused
+
+
+class FakeDriver:
+    """Stands in for a Chrome WebDriver on the send path, without a browser.
+
+    Answers the XPaths from config.py the way a logged-in WhatsApp Web does: /send
+    URLs open a chat (or, for `invalid_rate` of the numbers, the invalid-number
+    popup), the send button adds an outgoing bubble. `command_latency` is added to
+    every call to stand for the ChromeDriver round trip; `open_latency` and
+    `send_latency` delay the chat and the bubble like page rendering does.
+    """
+
+    def __init__(self, command_latency: float = 0.0, open_latency: float = 0.0,
+                 send_latency: float = 0.0, invalid_rate: float = 0.0):
+        self.command_latency = command_latency
+        self.open_latency = open_latency
+        self.send_latency = send_latency
+        self.invalid_rate = invalid_rate
+        self.current_url = "about:blank"
+        self.capabilities: Dict = {}
+        self.service = None
+        self.switch_to = _SwitchTo(self)
+        self.generation = 0
+        self.focused = None
+        self.popup = False
+        self.commands = 0
+        self.sent: List[str] = []
+        self._ready_at = 0.0
+        self._chat: Optional[str] = None
+        self._bubbles: List[float] = []  # times at which the bubbles of the open chat render
+        self._elements: Dict[str, FakeElement] = {}
+
+    def _command(self):
+        self.commands += 1
+        if self.command_latency:
+            time.sleep(self.command_latency)
+
+    def is_registered(self, phone: str) -> bool:
+        digest = hashlib.sha256(phone.encode()).digest()
+        return int.from_bytes(digest[:4], "big") / 2 ** 32 >= self.invalid_rate
+
+    def get(self, url: str):
+        self._command()
+        self.current_url = url
+        self.generation += 1
+        self.focused = None
+        self._bubbles = []
+        self._ready_at = time.monotonic() + self.open_latency
+
+        parts = urlsplit(url)
+        phone = parse_qs(parts.query).get("phone", [""])[0] if parts.path.endswith("/send") else ""
+        self._chat = phone if phone and self.is_registered(phone) else None
+        self.popup = bool(phone) and self._chat is None
+        self._elements = {
+            "shell": FakeElement(self, "shell"),
+            "composer": FakeElement(self, "composer"),
+            "send_button": FakeElement(self, "send_button"),
+            "title": FakeElement(self, "title", f"+{phone}"),
+            "popup": FakeElement(self, "popup", "Phone number shared via url is invalid."),
+            "popup_button": FakeElement(self, "popup_button", "OK"),
+        }
+
+    def _matches(self, xpath: str) -> List[FakeElement]:
+        if not self.current_url.startswith(WHATSAPP_WEB_URL):
+            return []
+        now = time.monotonic()
+        if xpath == LOGIN_CHECK_XPATH:
+            return [self._elements["shell"]]
+        if now < self._ready_at:
+            return []
+        if self._chat is not None:
+            if xpath in (MESSAGE_INPUT_XPATH, MESSAGE_INPUT_XPATH_FALLBACK):
+                return [self._elements["composer"]]
+            if xpath == SEND_BUTTON_XPATH:
+                return [self._elements["send_button"]]
+            if xpath == CHAT_HEADER_TITLE_XPATH:
+                return [self._elements["title"]]
+            if xpath == OUTGOING_MESSAGE_XPATH:
+                return [self._elements["shell"]] * sum(1 for at in self._bubbles if at <= now)
+        elif self.popup:
+            if xpath == INVALID_NUMBER_POPUP_XPATH:
+                return [self._elements["popup"]]
+            if xpath == POPUP_CONFIRM_BUTTON_XPATH:
+                return [self._elements["popup_button"]]
+        return []
+
+    def find_element(self, by: str, value: str) -> FakeElement:
+        self._command()
+        found = self._matches(value)
+        if not found:
+            raise NoSuchElementException(f"No element for {value[:60]}")
+        return found[0]
+
+    def find_elements(self, by: str, value: str) -> List[FakeElement]:
+        self._command()
+        return self._matches(value)
+
+    def _send(self):
+        composer = self._elements["composer"]
+        if self._chat is None or not composer._text.strip():
+            return
+        self.sent.append(self._chat)
+        composer._text = ""
+        self._bubbles.append(time.monotonic() + self.send_latency)
+
+    def execute_script(self, script: str, *args):
+        self._command()
+        if script == INSERT_TEXT_SCRIPT:
+            element, text = args
+            element._check()
+            element._text += text
+            return None
+        if script == TRACK_LAST_MESSAGE_SCRIPT:
+            return f"true_{self._chat}_{len(self._bubbles)}" if self._bubbles else None
+        if script == DRAIN_EVENTS_SCRIPT:
+            return [[], 0]
+        if script == "return 1":
+            return 1
+        return None
+
+    def execute_cdp_cmd(self, command: str, params: dict):
+        self._command()
+        raise WebDriverException("DevTools is not available in the fake driver")
+
+    def get_log(self, log_type: str) -> list:
+        return []
+
+    def quit(self):
+        self.generation += 1
+        self.current_url = "about:blank"
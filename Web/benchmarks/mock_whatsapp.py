@@ -0,0 +1,330 @@
+import re
+import sys
+import json
+import time
+import random
+import hashlib
+import argparse
+import threading
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+from urllib.parse import urlsplit, parse_qs
+from config import LOGIN_CHECK_XPATH, ATTACHMENT_ADD_BUTTON_XPATH, MEDIA_CAPTION_INPUT_XPATH
+
+
+def xpath_class(xpath: str) -> str:
+    """The exact class attribute an XPath from config.py matches on."""
+    return re.search(r"@class='([^']+)'", xpath).group(1)
+
+
+# A stripped-down WhatsApp Web that carries the DOM hooks config.py selects on:
+# the logged-in shell, the chat list search, the Lexical composer, send buttons,
+# outgoing bubbles with ticks, the attachment inputs and preview tray, the
+# invalid-number popup and the offline banner. Behaviour is driven by window.MOCK.
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>WhatsApp (mock)</title>
+<style>
+body { font-family: sans-serif; margin: 0; display: flex; height: 100vh; }
+#side { width: 320px; border-right: 1px solid #ddd; }
+#main { flex: 1; display: flex; flex-direction: column; }
+#messages { flex: 1; overflow-y: auto; padding: 8px; }
+.message-out { background: #d9fdd3; margin: 4px 0 4px auto; padding: 6px; max-width: 60%; }
+[contenteditable] { min-height: 24px; border: 1px solid #ccc; padding: 4px; }
+#tray { position: fixed; inset: 0; background: #fff; padding: 16px; }
+#tray img { width: 64px; height: 64px; object-fit: cover; }
+.popup { position: fixed; top: 30%; left: 30%; background: #fff; border: 1px solid #999; padding: 24px; }
+</style></head>
+<body>
+<div class="__LOGIN_CLASS__">
+<div id="side">
+  <div id="offline"></div>
+  <div class="lexical-rich-text-input"><div id="search" role="textbox" contenteditable="true"></div></div>
+  <div id="pane-side"></div>
+</div>
+<div id="main-holder"></div>
+</div>
+<div id="popups"></div>
+<script>
+const MOCK = window.MOCK = __CONFIG__;
+const byId = function (id) { return document.getElementById(id); };
+const later = function (seconds, action) { setTimeout(action, seconds * 1000); };
+let counter = 0;
+
+const renderRows = function (numbers) {
+    const pane = byId('pane-side');
+    pane.innerHTML = '';
+    numbers.forEach(function (number) {
+        const row = document.createElement('div');
+        row.setAttribute('role', 'listitem');
+        row.textContent = '+' + number;
+        row.addEventListener('click', function () { openChat(number); });
+        pane.appendChild(row);
+    });
+    if (!numbers.length) {
+        pane.innerHTML = '<span>No chats, contacts or messages found</span>';
+    }
+};
+
+const sendBubble = function (text) {
+    if (Math.random() < MOCK.dropRate) { return; }  // lost on the way, no bubble
+    later(MOCK.sendLatency, function () {
+        const id = 'true_' + MOCK.chat + '_' + (++counter);
+        const bubble = document.createElement('div');
+        bubble.className = 'message-out';
+        bubble.setAttribute('data-id', id);
+        bubble.innerHTML = '<span class="text"></span> <span data-icon="msg-time"></span>';
+        bubble.querySelector('.text').textContent = text;
+        byId('messages').appendChild(bubble);
+        const tick = bubble.querySelector('[data-icon]');
+        later(MOCK.tickLatency, function () { tick.setAttribute('data-icon', 'msg-check'); });
+        later(MOCK.tickLatency * 2, function () { tick.setAttribute('data-icon', 'msg-dblcheck'); });
+        fetch('/api/sent', {method: 'POST', body: JSON.stringify({phone: MOCK.chat, length: text.length})});
+    });
+};
+
+const pasteAsParagraphs = function (event) {
+    // Like Lexical: synthetic key events are ignored, pasted text becomes one paragraph per line
+    event.preventDefault();
+    const box = event.currentTarget;
+    event.clipboardData.getData('text/plain').split('\\n').forEach(function (line) {
+        const paragraph = document.createElement('p');
+        paragraph.textContent = line;
+        box.appendChild(paragraph);
+    });
+};
+
+const openChat = function (number) {
+    MOCK.chat = number;
+    byId('main-holder').innerHTML =
+        '<div id="main"><header><span dir="auto"></span></header><div id="messages"></div>' +
+        '<footer>' +
+        '<div class="__ATTACH_CLASS__" role="button" title="Attach">+</div>' +
+        '<input type="file" multiple style="display:none">' +
+        '<input type="file" multiple accept="image/*,video/mp4,video/3gpp,video/quicktime" style="display:none">' +
+        '<div class="lexical-rich-text-input"><div role="textbox" contenteditable="true" ' +
+        'data-lexical-editor="true" tabindex="10" data-tab="10" aria-owns="emoji-suggestion" ' +
+        'aria-label="Type a message"></div></div>' +
+        '<button aria-label="Send">Send</button>' +
+        '</footer></div>';
+    document.querySelector('#main header span').textContent = '+' + number;
+    const composer = document.querySelector('#main [data-lexical-editor]');
+    composer.addEventListener('paste', pasteAsParagraphs);
+    const send = function () {
+        const text = composer.innerText.trim();
+        if (!text) { return; }
+        composer.innerHTML = '';
+        sendBubble(text);
+    };
+    composer.addEventListener('keydown', function (event) {
+        if (event.key === 'Enter' && !event.shiftKey) { event.preventDefault(); send(); }
+    });
+    document.querySelector('#main button[aria-label="Send"]').addEventListener('click', send);
+    document.querySelectorAll('#main input[type=file]').forEach(function (input) {
+        input.addEventListener('change', function () { showTray(Array.from(input.files)); });
+    });
+};
+
+const showTray = function (files) {
+    const tray = document.createElement('div');
+    tray.id = 'tray';
+    files.forEach(function (file) {
+        const item = document.createElement('div');
+        item.setAttribute('role', 'listitem');
+        const image = document.createElement('img');
+        image.src = URL.createObjectURL(file);
+        item.appendChild(image);
+        tray.appendChild(item);
+    });
+    tray.insertAdjacentHTML('beforeend',
+        '<div class="__CAPTION_CLASS__"><p contenteditable="true"></p></div>' +
+        '<div role="button" aria-label="Send"><span data-icon="wds-ic-send-filled">Send</span></div>');
+    tray.querySelector('p').addEventListener('paste', pasteAsParagraphs);
+    tray.querySelector('[aria-label="Send"]').addEventListener('click', function () {
+        const megabytes = files.reduce(function (sum, file) { return sum + file.size; }, 0) / 1048576;
+        later(MOCK.uploadLatencyPerMb * megabytes, function () {
+            tray.remove();
+            files.forEach(function (file) { sendBubble(file.name); });
+        });
+    });
+    // The preview renders after a short delay, like the real upload tray
+    later(MOCK.sendLatency, function () { document.body.appendChild(tray); });
+};
+
+const showInvalidPopup = function () {
+    byId('popups').innerHTML =
+        '<div class="popup" data-animate-modal-popup="true"><div>Phone number shared via url is invalid.</div>' +
+        '<button>OK</button></div>';
+    byId('popups').querySelector('button').addEventListener('click', function () {
+        byId('popups').innerHTML = '';
+    });
+};
+
+byId('search').addEventListener('input', function () {
+    const digits = byId('search').innerText.replace(/\\D/g, '');
+    byId('pane-side').innerHTML = '';
+    later(MOCK.searchLatency, function () {
+        if (!digits) { renderRows(MOCK.recentChats); return; }
+        fetch('/api/lookup?phone=' + digits).then(function (r) { return r.json(); }).then(function (result) {
+            renderRows(result.registered ? [digits] : []);
+        });
+    });
+});
+
+renderRows(MOCK.recentChats);
+if (MOCK.offline) {
+    byId('offline').innerHTML = '<span data-icon="alert-computer"></span> Computer not connected';
+    later(MOCK.offlineDuration, function () { byId('offline').innerHTML = ''; });
+}
+if (MOCK.phone) {
+    later(MOCK.openLatency + (MOCK.offline ? MOCK.offlineDuration : 0), function () {
+        if (MOCK.registered) { openChat(MOCK.phone); } else { showInvalidPopup(); }
+    });
+}
+localStorage.setItem('last-wid-md', '"mock@c.us"');  // lets the session probe see a linked profile
+indexedDB.open('wawc', 1);
+</script>
+</body></html>
+"""
+
+
+@dataclass
+class MockOptions:
+    """Artificial latency (seconds) and failure injection of the mock."""
+    page_latency: float = 0.2       # server side, before the page is returned
+    open_latency: float = 0.3       # /send route until the chat or the popup shows
+    search_latency: float = 0.1     # chat list search until the results render
+    send_latency: float = 0.2       # send click until the bubble shows
+    tick_latency: float = 0.5       # per tick step: pending -> sent -> delivered
+    upload_latency_per_mb: float = 0.5
+    invalid_rate: float = 0.0       # share of numbers that are not on WhatsApp
+    drop_rate: float = 0.0          # share of sends that never produce a bubble
+    offline_rate: float = 0.0       # share of page loads that start offline
+    offline_duration: float = 3.0
+    seed: int = 0
+
+
+class MockWhatsAppServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], options: MockOptions):
+        super().__init__(address, MockRequestHandler)
+        self.options = options
+        self.random = random.Random(options.seed)
+        self.lock = threading.Lock()
+        self.stats: Dict[str, int] = {"page_loads": 0, "chat_opens": 0, "invalid": 0, "offline": 0, "sent": 0}
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def is_registered(self, phone: str) -> bool:
+        # Stable per number, so a re-check gives the same answer
+        digest = hashlib.sha256(f"{self.options.seed}:{phone}".encode()).digest()
+        return int.from_bytes(digest[:4], "big") / 2 ** 32 >= self.options.invalid_rate
+
+    def count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def render(self, phone: str) -> str:
+        options = self.options
+        with self.lock:
+            offline = self.random.random() < options.offline_rate
+        registered = self.is_registered(phone) if phone else True
+        self.count("page_loads")
+        if phone:
+            self.count("chat_opens" if registered else "invalid")
+        if offline:
+            self.count("offline")
+
+        config = {
+            "phone": phone,
+            "registered": registered,
+            "offline": offline,
+            "recentChats": ["15550000001", "15550000002", "15550000003"],
+            "openLatency": options.open_latency,
+            "searchLatency": options.search_latency,
+            "sendLatency": options.send_latency,
+            "tickLatency": options.tick_latency,
+            "uploadLatencyPerMb": options.upload_latency_per_mb,
+            "dropRate": options.drop_rate,
+            "offlineDuration": options.offline_duration,
+        }
+        return (PAGE
+                .replace("__CONFIG__", json.dumps(config))
+                .replace("__LOGIN_CLASS__", xpath_class(LOGIN_CHECK_XPATH))
+                .replace("__ATTACH_CLASS__", xpath_class(ATTACHMENT_ADD_BUTTON_XPATH))
+                .replace("__CAPTION_CLASS__", xpath_class(MEDIA_CAPTION_INPUT_XPATH)))
+
+
+class MockRequestHandler(BaseHTTPRequestHandler):
+    server: MockWhatsAppServer
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        phone = "".join(filter(str.isdigit, query.get("phone", [""])[0]))
+
+        if url.path in ("/", "/send"):
+            time.sleep(self.server.options.page_latency)
+            self._reply(200, "text/html; charset=utf-8", self.server.render(phone if url.path == "/send" else ""))
+        elif url.path == "/api/lookup":
+            self._reply(200, "application/json", json.dumps({"registered": self.server.is_registered(phone)}))
+        elif url.path == "/api/stats":
+            with self.server.lock:
+                self._reply(200, "application/json", json.dumps(self.server.stats))
+        else:
+            self._reply(404, "text/plain", "not found")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if urlsplit(self.path).path == "/api/sent":
+            self.server.count("sent")
+            self._reply(204, "text/plain", "")
+        else:
+            self._reply(404, "text/plain", "not found")
+
+    def _reply(self, status: int, content_type: str, body: str):
+        data = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_in_background(options: MockOptions, host: str = "127.0.0.1", port: int = 0) -> MockWhatsAppServer:
+    """Start the mock on a daemon thread; port 0 picks a free port (see server.url)."""
+    server = MockWhatsAppServer((host, port), options)
+    threading.Thread(target=server.serve_forever, name="mock-whatsapp", daemon=True).start()
+    return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Serve a local stand-in for WhatsApp Web")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    for name, default in asdict(MockOptions()).items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(default), default=default)
+    args = parser.parse_args(argv)
+
+    options = MockOptions(**{name: getattr(args, name) for name in asdict(MockOptions())})
+    server = MockWhatsAppServer((args.host, args.port), options)
+    print(f"Mock WhatsApp Web on {server.url}, run the app with WHATSAPP_WEB_URL={server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"Stats: {json.dumps(server.stats)}")
+        server.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+from urllib.parse import quote
+from selenium.webdriver.common.by import By
+from services.whatsapp_service import WhatsAppService
+from config import MAX_MESSAGE_LENGTH
+
+# Stand-in for the Lexical composer: a contenteditable that, like Lexical,
+# turns pasted plain text into one paragraph per line.
+COMPOSER_PAGE = """
+<html><body>
+<div id="box" contenteditable="true" role="textbox" style="min-height:40px"></div>
+<script>
+document.getElementById('box').addEventListener('paste', function (event) {
+    event.preventDefault();
+    const box = document.getElementById('box');
+    event.clipboardData.getData('text/plain').split('\\n').forEach(function (line) {
+        const paragraph = document.createElement('p');
+        paragraph.textContent = line;
+        box.appendChild(paragraph);
+    });
+});
+</script>
+</body></html>
+"""
+
+SIZES = [100, 1000, MAX_MESSAGE_LENGTH]
+
+
+def build_message(length: int) -> str:
+    line = "The quick brown fox jumps over the lazy dog, again and again. "
+    text = ""
+    while len(text) < length:
+        text += line.strip() + "\n"
+    return text[:length].rstrip("\n")
+
+
+def time_entry(service: WhatsAppService, method, text: str, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        service.driver.get("data:text/html;charset=utf-8," + quote(COMPOSER_PAGE))
+        box = service.driver.find_element(By.ID, "box")
+        box.click()
+        started = time.perf_counter()
+        method(box, text)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare keystroke typing with single-call text injection")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size, the fastest one is reported")
+    args = parser.parse_args(argv)
+
+    # The browser profile and the service's caches must not touch the user's real ones
+    with tempfile.TemporaryDirectory(prefix="text-entry-") as workdir:
+        service = WhatsAppService(profile_name="benchmark_profile", data_dir=Path(workdir))
+        try:
+            if not service.initialize_driver(use_headless=True):
+                print("Could not start Chrome", file=sys.stderr)
+                return 1
+
+            print(f"{'chars':>6} {'keys (s)':>10} {'inject (s)':>11} {'speedup':>8}")
+            for size in SIZES:
+                text = build_message(size)
+                typed = time_entry(service, service._type_text, text, args.repeat)
+                injected = time_entry(service, service._inject_text, text, args.repeat)
+                print(f"{size:>6} {typed:>10.3f} {injected:>11.3f} {typed / injected:>7.1f}x")
+        finally:
+            service.close()
+            service.registration_cache.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows, peak RSS and CPU time come from psutil there if installed
+    resource = None
+
+DRIVER_FAKE = "fake"
+DRIVER_MOCK = "mock"
+DEFAULT_SIZES = {DRIVER_FAKE: [100, 10_000, 100_000], DRIVER_MOCK: [100]}
+
+# Metric -> True if higher is better. Everything else in a result is informational.
+COMPARED_METRICS = {
+    "messages_per_minute": True,
+    "p50_ms": False,
+    "p95_ms": False,
+    "p99_ms": False,
+    "peak_rss_mb": False,
+    "cpu_seconds": False,
+}
+
+
+def percentile(sorted_values: List[float], share: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(share * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def process_usage() -> Dict[str, float]:
+    """Peak RSS (MB) and CPU seconds of this process so far."""
+    if resource is not None:
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+        peak = usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+        return {"peak_rss_mb": peak, "cpu_seconds": usage.ru_utime + usage.ru_stime}
+    try:
+        import psutil
+    except ImportError:
+        return {"peak_rss_mb": 0.0, "cpu_seconds": 0.0}
+    process = psutil.Process()
+    times = process.cpu_times()
+    return {"peak_rss_mb": process.memory_info().peak_wset / (1024 * 1024),
+            "cpu_seconds": times.user + times.system}
+
+
+def run_scenario(driver_kind: str, size: int, invalid_rate: float, command_latency: float) -> Dict:
+    """Send a synthetic campaign of `size` contacts through BulkSendWorker in this process."""
+    # Imported here so that WHATSAPP_WEB_URL set by the parent process applies
+    from services.whatsapp_service import WhatsAppService
+
+    # Nothing from the run may end up in the user's profiles, caches or send history
+    with tempfile.TemporaryDirectory(prefix="throughput-") as workdir:
+        service = WhatsAppService(profile_name="benchmark_profile", data_dir=Path(workdir))
+        try:
+            return _run_campaign(service, driver_kind, size, invalid_rate, command_latency)
+        finally:
+            service.close()
+            service.registration_cache.close()
+
+
+def _run_campaign(service, driver_kind: str, size: int, invalid_rate: float, command_latency: float) -> Dict:
+    """The measured part of run_scenario, on a service whose files live in a temporary directory."""
+    from models.contact import Contact
+    from models.message import Message
+    from services.whatsapp_service import BulkSendWorker
+    from services.rate_limiter import RateLimit
+    from services.memory_governor import browser_rss
+    from benchmarks.fake_driver import FakeDriver
+    from config import NAVIGATION_MODE_URL
+
+    if driver_kind == DRIVER_FAKE:
+        service.driver = FakeDriver(command_latency=command_latency, invalid_rate=invalid_rate)
+        service.is_logged_in = True
+        # Stands for a browser in the configured mode, so ensure_session does not relaunch it
+        service.current_headless_mode = service.headless_enabled
+        # The fake has no chat list search and can not be relaunched
+        service.navigation_mode = NAVIGATION_MODE_URL
+        service.memory_governor.enabled = False
+    else:
+        service.headless_enabled = True
+        if not service.ensure_session():
+            raise RuntimeError("Could not start headless Chrome against the mock page")
+
+    contacts = [Contact(phone=f"+1555{index:07d}", name=f"Contact {index}") for index in range(size)]
+    message = Message(text="Hello %NAME%, this is a benchmark message.\nSecond line.")
+    worker = BulkSendWorker(service, contacts, message, rate_limit=RateLimit(interval=0), delivery_horizon=0)
+
+    completions: List[float] = []
+    browser_peak = [0]
+
+    def on_sent(phone: str, success: bool):
+        completions.append(time.perf_counter())
+        if driver_kind == DRIVER_MOCK and len(completions) % 50 == 1:
+            browser_peak[0] = max(browser_peak[0], browser_rss(service.driver) or 0)
+
+    results = {}
+    worker.message_sent.connect(on_sent)
+    worker.completed.connect(lambda successful, failed: results.update(successful=successful, failed=failed))
+
+    before = process_usage()
+    started = time.perf_counter()
+    worker.run()  # on this thread, signals are delivered directly
+    elapsed = time.perf_counter() - started
+    after = process_usage()
+
+    latencies = sorted((end - start) * 1000 for start, end in zip([started] + completions, completions))
+    result = {
+        "driver": driver_kind,
+        "contacts": size,
+        "successful": results.get("successful", 0),
+        "failed": results.get("failed", 0),
+        "wall_seconds": round(elapsed, 3),
+        "messages_per_minute": round(len(completions) * 60 / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "p99_ms": round(percentile(latencies, 0.99), 3),
+        "mean_ms": round(statistics.fmean(latencies), 3) if latencies else 0.0,
+        "peak_rss_mb": round(after["peak_rss_mb"], 1),
+        "cpu_seconds": round(after["cpu_seconds"] - before["cpu_seconds"], 3),
+        "cpu_percent": round((after["cpu_seconds"] - before["cpu_seconds"]) * 100 / elapsed, 1) if elapsed else 0.0,
+    }
+    if driver_kind == DRIVER_FAKE:
+        result["driver_commands"] = service.driver.commands
+    elif browser_peak[0]:
+        result["browser_peak_rss_mb"] = round(browser_peak[0] / (1024 * 1024), 1)
+    return result
+
+
+def run(args) -> int:
+    sizes = args.sizes or DEFAULT_SIZES[args.driver]
+    env = dict(os.environ)
+    server = None
+    if args.driver == DRIVER_MOCK:
+        from benchmarks.mock_whatsapp import MockOptions, serve_in_background
+        server = serve_in_background(MockOptions(invalid_rate=args.invalid_rate))
+        env["WHATSAPP_WEB_URL"] = server.url
+
+    scenarios = {}
+    try:
+        for size in sizes:
+            # One process per scenario, so peak RSS and CPU time belong to it alone
+            command = [sys.executable, "-m", "benchmarks.throughput", "scenario",
+                       "--driver", args.driver, "--contacts", str(size),
+                       "--invalid-rate", str(args.invalid_rate),
+                       "--command-latency", str(args.command_latency)]
+            completed = subprocess.run(command, env=env, capture_output=True, text=True)
+            if completed.returncode != 0:
+                print(completed.stderr, file=sys.stderr)
+                return completed.returncode
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+            scenarios[f"{args.driver}-{size}"] = result
+            print(f"{args.driver:>5} {size:>7} contacts: {result['messages_per_minute']:>10.1f} msg/min  "
+                  f"p50 {result['p50_ms']:.2f} ms  p95 {result['p95_ms']:.2f} ms  p99 {result['p99_ms']:.2f} ms  "
+                  f"peak RSS {result['peak_rss_mb']:.0f} MB  CPU {result['cpu_percent']:.0f}%")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    output = Path(args.output or f"throughput-{args.driver}-{datetime.now():%Y%m%d-%H%M%S}.json")
+    output.write_text(json.dumps({
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "invalid_rate": args.invalid_rate,
+            "command_latency": args.command_latency,
+        },
+        "scenarios": scenarios,
+    }, indent=2))
+    print(f"Results written to {output}")
+    return 0
+
+
+def compare(baseline: Dict, current: Dict, threshold: float) -> List[str]:
+    """Lines describing metrics that got worse by more than `threshold` percent."""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        reference = baseline["scenarios"].get(name)
+        if reference is None:
+            continue
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = reference.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) * 100 / old
+            worse = -change if higher_is_better else change
+            marker = "REGRESSION" if worse > threshold else ""
+            print(f"{name:<14} {metric:<20} {old:>12.2f} -> {new:>12.2f}  {change:+7.1f}%  {marker}")
+            if marker:
+                regressions.append(f"{name} {metric}: {old} -> {new} ({change:+.1f}%)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk send throughput benchmark with JSON baselines")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the scenarios and save the results")
+    run_parser.add_argument("--driver", choices=[DRIVER_FAKE, DRIVER_MOCK], default=DRIVER_FAKE,
+                            help="fake: in-process fake WebDriver; mock: headless Chrome against benchmarks.mock_whatsapp")
+    run_parser.add_argument("--sizes", type=int, nargs="+", help="contact list sizes (default: 100 10000 100000 for fake, 100 for mock)")
+    run_parser.add_argument("--invalid-rate", type=float, default=0.0, help="share of numbers not on WhatsApp")
+    run_parser.add_argument("--command-latency", type=float, default=0.0,
+                            help="seconds added to every fake driver call, e.g. 0.002 for a ChromeDriver round trip")
+    run_parser.add_argument("--output", help="JSON file for the results")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions against a baseline")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=10.0, help="allowed change in percent")
+
+    scenario_parser = commands.add_parser("scenario", help=argparse.SUPPRESS)
+    scenario_parser.add_argument("--driver", required=True)
+    scenario_parser.add_argument("--contacts", type=int, required=True)
+    scenario_parser.add_argument("--invalid-rate", type=float, default=0.0)
+    scenario_parser.add_argument("--command-latency", type=float, default=0.0)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        return run(args)
+    if args.command == "scenario":
+        print(json.dumps(run_scenario(args.driver, args.contacts, args.invalid_rate, args.command_latency)))
+        return 0
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    current = json.loads(Path(args.current).read_text())
+    for option in ("invalid_rate", "command_latency", "platform"):
+        if baseline["meta"].get(option) != current["meta"].get(option):
+            print(f"Note: {option} differs ({baseline['meta'].get(option)} vs {current['meta'].get(option)})")
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.threshold:.0f}%:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0f}%")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
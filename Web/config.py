@@ -1,7 +1,10 @@
+import os
+
 APP_NAME = "WhatsApp Automator"
 APP_VERSION = "1.0.0"
 
-WHATSAPP_WEB_URL = "https://web.whatsapp.com"
+# Can point at a local stand-in, e.g. benchmarks/mock_whatsapp.py
+WHATSAPP_WEB_URL = os.environ.get("WHATSAPP_WEB_URL", "https://web.whatsapp.com").rstrip("/")
 
 # Primary Search Bar Input selector
 SEARCH_BAR_INPUT_XPATH = "//div[contains(@class,'lexical-rich-text-input')]//div[@role='textbox' and @contenteditable='true']"
@@ -21,13 +24,40 @@ MEDIA_SEND_BUTTON_XPATH = "//div[@role='button' and @aria-label='Send']//span[@d
 # Using contains() to match divs that have these classes, even if there are additional classes
 LOGIN_CHECK_XPATH = "//div[@class='x1c4vz4f xs83m0k xdl72j9 x1g77sc7 x78zum5 xozqiw3 x1oa3qoh x12fk4p8 xeuugli x2lwn1j x1nhvcw1 xdt5ytf x1cy8zhl xh8yej3 x5yr21d']"
 
+# QR code on the login screen: a canvas inside the element carrying the pairing data
+QR_CODE_XPATH = "//div[@data-ref]//canvas"
+# How often the in-app login dialog refreshes the QR code and checks for a login
+QR_REFRESH_INTERVAL_MS = 1000
+QR_LOGIN_TIMEOUT = 300
+
 # TODO: Need to find these selectors from current WhatsApp Web:
-# QR_CODE_XPATH = "// NEED SELECTOR FOR QR CODE CANVAS/IMAGE"
 ATTACHMENT_ADD_BUTTON_XPATH = "//div[@class='x100vrsf x1vqgdyp x78zum5 x6s0dn4 xpvyfi4']"
 # ATTACHMENT_CONFIRM_BUTTON_XPATH = "//div[@class='x1hx0egp x6ikm8r x1odjw0f x1k6rcq7 x1lkfr7t']//p[@class='selectable-text copyable-text x15bjb6t x1n2onr6']"
 # CHAT_SEARCH_XPATH = "// NEED SELECTOR FOR SEARCH/FILTER CHATS INPUT"
 NEW_CHAT_BUTTON_XPATH = "//div[@class='_ajv7 x1n2onr6 x1okw0bk x5yr21d x1c9tyrk xeusxvb x1pahc9y x1ertn4p xlkovuz x16j0l1c x1hm9lzh xyklrzc x1z0qo99']"
 
+# Chat list search results and the title of the currently open conversation
+SEARCH_RESULT_XPATH = "//div[@id='pane-side']//div[@role='listitem']"
+# Shown in place of the results when a search matches no chat or contact
+SEARCH_NO_RESULTS_XPATH = "//div[@id='pane-side']//span[contains(text(), 'No chats, contacts or messages found')]"
+CHAT_HEADER_TITLE_XPATH = "//div[@id='main']//header//span[@dir='auto']"
+
+# Outgoing message bubbles in the open conversation
+OUTGOING_MESSAGE_XPATH = "//div[@id='main']//div[contains(@class,'message-out')]"
+# File inputs revealed by the attachment menu
+DOCUMENT_FILE_INPUT_CSS = 'input[type="file"]'
+MEDIA_FILE_INPUT_XPATH = "//input[@type='file'][contains(@accept, 'image/*')]"
+# Thumbnails in the preview tray when several files are uploaded at once
+MEDIA_PREVIEW_THUMBNAIL_XPATH = "//div[@role='listitem' and .//img[starts-with(@src, 'blob:')]]"
+
+
+# Page states raced against the composer when a chat is opened via the /send URL
+# route: the popup WhatsApp shows for numbers without an account, and the banner
+# shown while the computer or phone is not connected
+INVALID_NUMBER_POPUP_XPATH = "//div[@data-animate-modal-popup='true' or @role='dialog'][.//*[contains(text(), 'shared via url is invalid')]]"
+POPUP_CONFIRM_BUTTON_XPATH = "//div[@data-animate-modal-popup='true' or @role='dialog']//button"
+OFFLINE_BANNER_XPATH = "//div[@id='side']//span[@data-icon='alert-computer' or @data-icon='alert-phone']"
+
 
 # Media input for captions
 MEDIA_CAPTION_INPUT_XPATH = "//div[@class='x1hx0egp x6ikm8r x1odjw0f x1k6rcq7 x1lkfr7t']//p"
@@ -35,6 +65,116 @@ MEDIA_CAPTION_INPUT_XPATH = "//div[@class='x1hx0egp x6ikm8r x1odjw0f x1k6rcq7 x1
 DEFAULT_TIMEOUT = 30
 DEFAULT_MESSAGE_DELAY = 5
 
+# Token bucket pacing per account: DEFAULT_MESSAGE_DELAY is the interval at the
+# sustained rate, a burst of 1 keeps sends evenly spaced. Jitter is a fraction of
+# the interval. Waits are slept in slices so a stop request is noticed quickly.
+DEFAULT_RATE_BURST = 1
+DEFAULT_RATE_JITTER = 0.0
+MAX_RATE_JITTER = 0.5
+RATE_WAIT_SLICE = 0.25
+
+# Parallel bulk sending: each extra browser worker gets its own linked profile
+DEFAULT_WORKER_COUNT = 1
+MAX_WORKER_COUNT = 8
+
+# Chat navigation: "in_app" opens chats inside the already loaded WhatsApp Web page
+# and falls back to "url", which reloads the whole page for every contact
+NAVIGATION_MODE_IN_APP = "in_app"
+NAVIGATION_MODE_URL = "url"
+DEFAULT_NAVIGATION_MODE = NAVIGATION_MODE_IN_APP
+IN_APP_LOOKUP_TIMEOUT = 5
+
+# Upper bounds (seconds) for the event-driven waits in the send path. Each wait
+# returns as soon as its condition holds, these only cap the worst case.
+COMPOSER_READY_TIMEOUT = 3
+ATTACHMENT_MENU_TIMEOUT = 5
+ATTACHMENT_PREVIEW_TIMEOUT = 30
+SEND_BUTTON_TIMEOUT = 2
+SEND_CONFIRM_TIMEOUT = 10
+# The offline banner also flashes while the page connects, the composer gets this
+# long to appear anyway before the chat counts as offline
+OFFLINE_GRACE_PERIOD = 3
+# How long a bulk run waits for a lost connection to come back before moving on
+OFFLINE_RECOVERY_TIMEOUT = 60
+
+# Registration pre-check: results are cached per E.164 number for this many days,
+# the validate-list job opens at most one chat per VALIDATION_INTERVAL seconds
+REGISTRATION_CACHE_TTL_DAYS = 30
+VALIDATION_INTERVAL = 1.0
+
+# Per-stage send timing (Settings > "Record send timings"): histogram bucket bounds
+# in seconds, metric name prefix in the Prometheus file and Logs tab refresh interval
+METRICS_HISTOGRAM_BUCKETS = [0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300]
+METRICS_PREFIX = "whatsapp_automator"
+METRICS_SUMMARY_INTERVAL_MS = 2000
+
+# Why a send failed, beyond a generic error
+SEND_FAILURE_NOT_ON_WHATSAPP = "not_on_whatsapp"
+SEND_FAILURE_OFFLINE = "offline"
+
+# Backend for the DOM operations of a send: "webdriver" goes through ChromeDriver,
+# "cdp" sends DevTools commands straight to Chrome's debugging websocket
+BROWSER_BACKEND_WEBDRIVER = "webdriver"
+BROWSER_BACKEND_CDP = "cdp"
+DEFAULT_BROWSER_BACKEND = BROWSER_BACKEND_WEBDRIVER
+CDP_COMMAND_TIMEOUT = 10
+
+# Lean sending (headless only): URL patterns blocked via DevTools. The send flow
+# itself needs the app bundles and styles from static.whatsapp.net, the websocket
+# and media uploads (mmg.whatsapp.net/mms/...), so none of these patterns may
+# match them. Inbound media is downloaded from the /v/ paths.
+LEAN_BLOCKED_URL_PATTERNS = [
+    "*://pps.whatsapp.net/*",          # profile pictures
+    "*://mmg.whatsapp.net/v/*",        # inbound media, thumbnails and stickers
+    "*://media*.whatsapp.net/v/*",
+    "*://*.fbcdn.net/*",               # link preview images
+    "*.woff*",                         # web fonts
+    "*.ttf*",
+    "*static.whatsapp.net/*.png*",     # decorative images
+    "*static.whatsapp.net/*.jpg*",
+    "*static.whatsapp.net/*.gif*",
+    "*.mp3*",                          # notification sounds
+    "*.ogg*",
+]
+
+# Memory governor: relaunch the browser between contacts after this many messages,
+# or earlier when a sample (taken every MEMORY_SAMPLE_INTERVAL messages) is over budget
+RECYCLE_AFTER_MESSAGES = 300
+MEMORY_SAMPLE_INTERVAL = 5
+BROWSER_RSS_BUDGET_MB = 1536
+JS_HEAP_BUDGET_MB = 512
+LOW_MEMORY_CHROME_FLAGS = [
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--renderer-process-limit=2",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,BackForwardCache",
+    "--disk-cache-size=52428800",
+]
+
+# Crash watchdog: a browser that does not answer a trivial script within this many
+# seconds counts as dead. A contact is retried at most MAX_CRASH_RETRIES times.
+LIVENESS_PING_TIMEOUT = 5
+MAX_CRASH_RETRIES = 2
+
+# Threads lent to async sessions for blocking WebDriver calls. Sessions only hold
+# one while a call is in flight, so this can stay well below the session count.
+BROWSER_CALL_THREADS = 4
+
+# How long a bulk run keeps watching for delivered/read ticks after the last send
+DEFAULT_DELIVERY_WAIT_HORIZON = 15
+# Messages whose ticks the page keeps watching at once; older ones are given up
+DELIVERY_TRACKED_LIMIT = 200
+WAIT_POLL_INTERVAL = 0.1
+
+# Text entry: "inject" pastes the whole message into the composer with one script
+# call (keeps emoji and line breaks), "keys" types it line by line
+TEXT_ENTRY_MODE_INJECT = "inject"
+TEXT_ENTRY_MODE_KEYS = "keys"
+DEFAULT_TEXT_ENTRY_MODE = TEXT_ENTRY_MODE_INJECT
+
 PLACEHOLDER_NAME = "%NAME%"
 PLACEHOLDER_PHONE = "%PHONE%"
 PLACEHOLDER_DATE = "%DATE%"
@@ -42,6 +182,14 @@ PLACEHOLDER_DATE = "%DATE%"
 MAX_MESSAGE_LENGTH = 4096
 MAX_ATTACHMENT_SIZE = 16 * 1024 * 1024
 
+# Attachment preprocessing: images are downscaled and recompressed, videos over
+# MAX_ATTACHMENT_SIZE are transcoded (needs ffmpeg). Results are cached on disk.
+IMAGE_MAX_DIMENSION = 1600
+IMAGE_JPEG_QUALITY = 80
+VIDEO_MAX_HEIGHT = 720
+VIDEO_CRF = 28
+MEDIA_CACHE_MAX_BYTES = 512 * 1024 * 1024
+
 SUPPORTED_IMAGE_FORMATS = [".jpg", ".jpeg", ".png", ".gif", ".webp"]
 SUPPORTED_DOCUMENT_FORMATS = [".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx", ".txt"]
 SUPPORTED_VIDEO_FORMATS = [".mp4", ".avi", ".mov", ".wmv", ".flv"]
@@ -15,6 +15,7 @@ class MediaType(Enum):
 class Attachment:
     file_path: str
     media_type: MediaType
+    caption: str = ""
 
 @dataclass
 class Message:
@@ -40,9 +41,9 @@ class Message:
 
         return personalized
 
-    def add_attachment(self, media_type, file_path: str):
+    def add_attachment(self, media_type, file_path: str, caption: str = ""):
         if file_path not in self.attachments:
-            attachment = Attachment(file_path = file_path, media_type = media_type)
+            attachment = Attachment(file_path = file_path, media_type = media_type, caption = caption)
             self.attachments.append(attachment)
 
     def remove_attachment(self, file_path: str):
@@ -66,7 +67,14 @@ class Message:
     def to_dict(self) -> dict:
         return {
             'text': self.text,
-            'attachments': [attachment.file_path for attachment in self.attachments],
+            'attachments': [
+                {
+                    'file_path': attachment.file_path,
+                    'media_type': attachment.media_type.name,
+                    'caption': attachment.caption
+                }
+                for attachment in self.attachments
+            ],
             'scheduled_time': self.scheduled_time.isoformat() if self.scheduled_time else None,
             'template_name': self.template_name
         }
@@ -77,9 +85,23 @@ class Message:
         if data.get('scheduled_time'):
             scheduled_time = datetime.fromisoformat(data['scheduled_time'])
 
+        from utils.file_handler import FileHandler
+
+        attachments = []
+        for item in data.get('attachments', []):
+            if isinstance(item, str):
+                # Older files stored only the path
+                item = {'file_path': item}
+            media_type = item.get('media_type')
+            attachments.append(Attachment(
+                file_path=item['file_path'],
+                media_type=MediaType[media_type] if media_type else FileHandler.detect_media_type(item['file_path']),
+                caption=item.get('caption', '')
+            ))
+
         return cls(
             text=data.get('text', ''),
-            attachments=data.get('attachments', []),
+            attachments=attachments,
             scheduled_time=scheduled_time,
             template_name=data.get('template_name', '')
         )
@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Optional
+from PyQt6.QtCore import QObject, QThread, pyqtSignal
+from models.contact import Contact
+from models.message import Message
+from services.whatsapp_service import WhatsAppService
+from config import BROWSER_CALL_THREADS
+
+logger = logging.getLogger(__name__)
+
+
+class EventLoopThread(QThread):
+    """Runs the one asyncio event loop shared by every async session.
+
+    Blocking browser calls are handed to a small thread pool, so the GUI thread
+    never waits on the browser and an idle session holds no thread.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=BROWSER_CALL_THREADS, thread_name_prefix="browser-call")
+        )
+        self._ready.set()
+        self.loop.run_forever()
+        self.loop.run_until_complete(self.loop.shutdown_default_executor())
+        self.loop.close()
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Schedule a coroutine from any thread."""
+        self._ready.wait()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def stop(self):
+        if self.isRunning():
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.wait()
+
+
+_event_loop_thread: Optional[EventLoopThread] = None
+
+
+def event_loop_thread() -> EventLoopThread:
+    global _event_loop_thread
+    if _event_loop_thread is None:
+        _event_loop_thread = EventLoopThread()
+        _event_loop_thread.start()
+    return _event_loop_thread
+
+
+def shutdown_event_loop():
+    global _event_loop_thread
+    if _event_loop_thread is not None:
+        _event_loop_thread.stop()
+        _event_loop_thread = None
+
+
+class AsyncCall(QObject):
+    """Runs a coroutine on the shared loop and reports the outcome as Qt signals.
+
+    The signals are delivered on the thread owning this object (normally the GUI
+    thread), so slots can touch widgets directly.
+    """
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, coro: Awaitable, parent=None):
+        super().__init__(parent)
+        self.coro = coro
+        self.future: Optional[Future] = None
+
+    def start(self):
+        """Submit the coroutine. Connect the signals first, a quick call may finish right away."""
+        self.future = event_loop_thread().submit(self.coro)
+        self.future.add_done_callback(self._done)
+
+    def _done(self, future: Future):
+        if future.cancelled():
+            self.failed.emit("Cancelled")
+        elif future.exception() is not None:
+            self.failed.emit(str(future.exception()))
+        else:
+            self.finished.emit(future.result())
+
+
+class AsyncWhatsAppService:
+    """asyncio front end for a WhatsAppService, used by the single message tab.
+
+    Each step runs in the shared browser-call pool, serialized per session because
+    a WebDriver is not thread safe. The steps are the service's own blocking
+    methods, so there is one implementation of a send. Progress is still reported
+    through the wrapped service's status_update, message_sent and error_occurred
+    signals.
+    """
+
+    def __init__(self, service: WhatsAppService):
+        self.service = service
+        self._browser_lock: Optional[asyncio.Lock] = None
+
+    async def call(self, fn: Callable, *args) -> Any:
+        """Run a blocking browser call without holding up the loop."""
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def send_message(self, contact: Contact, message: Message, country_code: str = "") -> bool:
+        if not await self.call(self.service.ensure_session):
+            return False
+        prepared = await asyncio.get_running_loop().run_in_executor(
+            None, self.service.prepare_send, contact, message, country_code
+        )
+        return await self.call(self.service.send_prepared, prepared)
@@ -0,0 +1,167 @@
+import json
+import logging
+import threading
+from typing import Any, List, Tuple
+from urllib.request import urlopen
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import WebDriverException
+from services.wait_conditions import count_elements
+from config import BROWSER_BACKEND_WEBDRIVER, BROWSER_BACKEND_CDP, CDP_COMMAND_TIMEOUT
+
+try:
+    import websocket
+except ImportError:  # websocket-client is optional, the WebDriver backend is used without it
+    websocket = None
+
+logger = logging.getLogger(__name__)
+
+# Pastes arguments[1] into the editable element arguments[0]. Lexical turns the
+# pasted plain text into paragraphs, so emoji and line breaks survive.
+INSERT_TEXT_SCRIPT = """
+const box = arguments[0];
+const text = arguments[1];
+box.focus();
+const data = new DataTransfer();
+data.setData('text/plain', text);
+box.dispatchEvent(new ClipboardEvent('paste', {clipboardData: data, bubbles: true, cancelable: true}));
+"""
+
+COUNT_XPATH_EXPRESSION = (
+    "document.evaluate({xpath}, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null).snapshotLength"
+)
+FIND_XPATH_EXPRESSION = (
+    "document.evaluate({xpath}, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue"
+)
+
+
+class CdpError(WebDriverException):
+    """A DevTools command failed or the debugging connection was lost."""
+
+
+class WebDriverBackend:
+    """Runs the hot DOM operations of a send through ChromeDriver's HTTP API."""
+
+    name = BROWSER_BACKEND_WEBDRIVER
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def evaluate(self, expression: str) -> Any:
+        return self.driver.execute_script(f"return {expression};")
+
+    def count(self, xpath: str) -> int:
+        return count_elements(self.driver, xpath)
+
+    def insert_text(self, element, text: str):
+        self.driver.execute_script(INSERT_TEXT_SCRIPT, element, text)
+
+    def set_files(self, locator: Tuple[str, str], paths: List[str]):
+        self.driver.find_element(*locator).send_keys("\n".join(paths))
+
+    def close(self):
+        pass
+
+
+class CdpBackend(WebDriverBackend):
+    """Runs the same operations as Chrome DevTools Protocol commands on the page's
+    debugging websocket, skipping the ChromeDriver HTTP round trip.
+
+    Element lookups and waits still go through Selenium; only the calls made once
+    or more per message are moved here.
+    """
+
+    name = BROWSER_BACKEND_CDP
+
+    def __init__(self, driver):
+        super().__init__(driver)
+        if websocket is None:
+            raise CdpError("websocket-client is not installed")
+
+        address = driver.capabilities.get("goog:chromeOptions", {}).get("debuggerAddress")
+        if not address:
+            raise CdpError("ChromeDriver did not report a debugger address")
+
+        # ChromeDriver uses the DevTools target id as window handle
+        with urlopen(f"http://{address}/json/list", timeout=CDP_COMMAND_TIMEOUT) as response:
+            targets = json.load(response)
+        handle = driver.current_window_handle
+        target = next((t for t in targets if t.get("id") == handle), None)
+        if target is None:
+            raise CdpError(f"No DevTools target for window {handle}")
+
+        # Without an Origin header Chrome accepts the connection regardless of --remote-allow-origins
+        self._socket = websocket.create_connection(
+            target["webSocketDebuggerUrl"], timeout=CDP_COMMAND_TIMEOUT, suppress_origin=True
+        )
+        self._lock = threading.Lock()
+        self._next_id = 0
+        logger.info(f"Connected to DevTools at {address}")
+
+    def command(self, method: str, **params) -> dict:
+        with self._lock:
+            self._next_id += 1
+            command_id = self._next_id
+            try:
+                self._socket.send(json.dumps({"id": command_id, "method": method, "params": params}))
+                while True:
+                    reply = json.loads(self._socket.recv())
+                    if reply.get("id") == command_id:  # Anything else is an event
+                        break
+            except (OSError, websocket.WebSocketException) as e:
+                raise CdpError(f"DevTools connection lost during {method}: {str(e)}")
+
+        if "error" in reply:
+            raise CdpError(f"{method} failed: {reply['error'].get('message')}")
+        return reply.get("result", {})
+
+    def _evaluate(self, expression: str, by_value: bool = True) -> dict:
+        result = self.command("Runtime.evaluate", expression=expression, returnByValue=by_value)
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            raise CdpError(details.get("exception", {}).get("description") or details.get("text"))
+        return result["result"]
+
+    def evaluate(self, expression: str) -> Any:
+        return self._evaluate(expression).get("value")
+
+    def count(self, xpath: str) -> int:
+        try:
+            return self.evaluate(COUNT_XPATH_EXPRESSION.format(xpath=json.dumps(xpath)))
+        except CdpError:
+            return 0
+
+    def insert_text(self, element, text: str):
+        # The caller has focused the element already
+        if "\n" not in text:
+            self.command("Input.insertText", text=text)
+            return
+        # Input.insertText does not split lines into paragraphs, paste multi-line text instead
+        self.evaluate(f"(function () {{ {INSERT_TEXT_SCRIPT} }}).apply(null, "
+                      f"[document.activeElement, {json.dumps(text)}])")
+
+    def set_files(self, locator: Tuple[str, str], paths: List[str]):
+        by, value = locator
+        if by == By.XPATH:
+            expression = FIND_XPATH_EXPRESSION.format(xpath=json.dumps(value))
+        else:
+            expression = f"document.querySelector({json.dumps(value)})"
+        handle = self._evaluate(expression, by_value=False)
+        if "objectId" not in handle:
+            raise CdpError(f"File input not found: {value}")
+        self.command("DOM.setFileInputFiles", files=paths, objectId=handle["objectId"])
+
+    def close(self):
+        try:
+            self._socket.close()
+        except Exception:
+            pass
+
+
+def create_backend(driver, name: str) -> WebDriverBackend:
+    """Build the requested backend, falling back to WebDriver if DevTools is unreachable."""
+    if name == BROWSER_BACKEND_CDP:
+        try:
+            return CdpBackend(driver)
+        except Exception as e:
+            logger.warning(f"DevTools backend unavailable, using WebDriver: {str(e)}")
+    return WebDriverBackend(driver)
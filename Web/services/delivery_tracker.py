@@ -0,0 +1,156 @@
+import time
+import logging
+from typing import Callable, Dict, List, Optional, Tuple
+from selenium.common.exceptions import WebDriverException
+from config import OUTGOING_MESSAGE_XPATH, DELIVERY_TRACKED_LIMIT
+
+logger = logging.getLogger(__name__)
+
+STATUS_UNKNOWN = "unknown"
+STATUS_PENDING = "pending"
+STATUS_SENT = "sent"
+STATUS_DELIVERED = "delivered"
+STATUS_READ = "read"
+
+STATUS_ORDER = [STATUS_UNKNOWN, STATUS_PENDING, STATUS_SENT, STATUS_DELIVERED, STATUS_READ]
+
+# Installs a MutationObserver that watches the tick icon of every tracked outgoing
+# message and queues (message id, status) pairs whenever one changes. A message is
+# dropped from the tracked map once it is delivered or read, or no longer on screen,
+# so each DOM mutation only looks up messages that can still change.
+INSTALL_OBSERVER_SCRIPT = """
+if (window.__waDelivery) { return; }
+const state = {events: [], tracked: {}};
+window.__waDelivery = state;
+const statusOf = function (row) {
+    const icon = row.querySelector('span[data-icon^="msg-"]');
+    if (!icon) { return null; }
+    const label = (icon.getAttribute('aria-label') || '').trim().toLowerCase();
+    if (label.startsWith('read')) { return 'read'; }
+    switch (icon.getAttribute('data-icon')) {
+        case 'msg-dblcheck': return 'delivered';
+        case 'msg-check': return 'sent';
+        case 'msg-time': return 'pending';
+    }
+    return null;
+};
+state.scan = function () {
+    for (const id in state.tracked) {
+        const row = document.querySelector('[data-id="' + CSS.escape(id) + '"]');
+        if (!row) {
+            delete state.tracked[id];
+            continue;
+        }
+        const status = statusOf(row);
+        if (status && status !== state.tracked[id]) {
+            state.tracked[id] = status;
+            state.events.push([id, status]);
+        }
+        if (status === 'delivered' || status === 'read') { delete state.tracked[id]; }
+    }
+};
+new MutationObserver(state.scan).observe(document.body, {
+    subtree: true, childList: true, attributes: true, attributeFilter: ['data-icon', 'aria-label']
+});
+"""
+
+# Starts tracking the newest outgoing message of the open chat and returns its id.
+# Beyond arguments[1] tracked messages the oldest ones are given up.
+TRACK_LAST_MESSAGE_SCRIPT = """
+const bubbles = document.evaluate(arguments[0], document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+const state = window.__waDelivery;
+if (!bubbles.snapshotLength || !state) { return null; }
+const row = bubbles.snapshotItem(bubbles.snapshotLength - 1).closest('[data-id]');
+if (!row) { return null; }
+const id = row.getAttribute('data-id');
+state.tracked[id] = 'unknown';
+const ids = Object.keys(state.tracked);
+for (let i = 0; i < ids.length - arguments[1]; i++) { delete state.tracked[ids[i]]; }
+state.scan();
+return id;
+"""
+
+# Returns the queued status changes and how many tracked messages are still on
+# screen without a final (delivered/read) status, which are the ones left tracked
+DRAIN_EVENTS_SCRIPT = """
+const state = window.__waDelivery;
+if (!state) { return [[], 0]; }
+state.scan();
+return [state.events.splice(0), Object.keys(state.tracked).length];
+"""
+
+
+class DeliveryTracker:
+    """Follows the sent/delivered/read ticks of sent messages without blocking the sender.
+
+    Status changes are collected in the page by a MutationObserver and drained with
+    one cheap script call per poll. Updates stop once a message is delivered or
+    read, its chat is left or the page reloads; the last status seen is kept.
+    """
+
+    def __init__(self, bubble_xpath: str = OUTGOING_MESSAGE_XPATH):
+        self.bubble_xpath = bubble_xpath
+        self.statuses: Dict[str, str] = {}
+        self._phones_by_id: Dict[str, str] = {}
+        self._live = 0
+
+    def reset(self):
+        self.statuses.clear()
+        self._phones_by_id.clear()
+        self._live = 0
+
+    def track(self, driver, phone: str) -> Optional[str]:
+        self.statuses.setdefault(phone, STATUS_UNKNOWN)
+        try:
+            driver.execute_script(INSTALL_OBSERVER_SCRIPT)
+            message_id = driver.execute_script(TRACK_LAST_MESSAGE_SCRIPT, self.bubble_xpath, DELIVERY_TRACKED_LIMIT)
+        except WebDriverException as e:
+            logger.debug(f"Could not track delivery for {phone}: {str(e)}")
+            return None
+
+        if message_id:
+            self._phones_by_id[message_id] = phone
+        return message_id
+
+    def poll(self, driver) -> List[Tuple[str, str]]:
+        """Drain status changes from the page. Returns (phone, new status) pairs."""
+        try:
+            events, self._live = driver.execute_script(DRAIN_EVENTS_SCRIPT)
+        except (WebDriverException, TypeError, ValueError):
+            self._live = 0
+            return []
+
+        changes = []
+        for message_id, status in events:
+            phone = self._phones_by_id.get(message_id)
+            if phone is None:
+                continue
+            # Ticks only move forward, ignore re-renders showing an older state
+            if STATUS_ORDER.index(status) > STATUS_ORDER.index(self.statuses.get(phone, STATUS_UNKNOWN)):
+                self.statuses[phone] = status
+                changes.append((phone, status))
+        return changes
+
+    def has_live_messages(self) -> bool:
+        """Whether the last poll saw tracked messages on screen still waiting for a final tick."""
+        return self._live > 0
+
+    def wait_for_final(self, driver, horizon: float,
+                       on_change: Optional[Callable[[str, str], None]] = None,
+                       poll_interval: float = 0.5):
+        """Keep polling for up to `horizon` seconds, or until no message that is still
+        on screen is waiting for its delivered/read tick."""
+        deadline = time.monotonic() + horizon
+        while True:
+            for phone, status in self.poll(driver):
+                if on_change:
+                    on_change(phone, status)
+            if not self._live or time.monotonic() >= deadline:
+                break
+            time.sleep(poll_interval)
+
+    def summary(self) -> Dict[str, int]:
+        counts = {status: 0 for status in STATUS_ORDER}
+        for status in self.statuses.values():
+            counts[status] += 1
+        return counts
@@ -0,0 +1,115 @@
+import sys
+import json
+import shutil
+import logging
+import subprocess
+from pathlib import Path
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CACHE_FILE = Path.home() / ".whatsapp_automator" / "driver_cache.json"
+
+LINUX_CHROME_BINARIES = ["google-chrome", "google-chrome-stable", "chromium", "chromium-browser"]
+MAC_CHROME_BINARY = "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome"
+
+_chrome_version: Optional[str] = None
+
+
+def detect_chrome_version() -> Optional[str]:
+    """Return the installed Chrome version (e.g. "127.0.6533.88") without touching the network."""
+    global _chrome_version
+    if _chrome_version:
+        return _chrome_version
+
+    version = None
+    if sys.platform.startswith("win"):
+        version = _windows_chrome_version()
+    else:
+        binaries = [MAC_CHROME_BINARY] if sys.platform == "darwin" else LINUX_CHROME_BINARIES
+        for binary in binaries:
+            path = binary if Path(binary).exists() else shutil.which(binary)
+            if not path:
+                continue
+            try:
+                output = subprocess.run([path, "--version"], capture_output=True, text=True, timeout=10).stdout
+            except (OSError, subprocess.SubprocessError):
+                continue
+            version = next((part for part in output.split() if part[:1].isdigit()), None)
+            if version:
+                break
+
+    _chrome_version = version
+    return version
+
+
+def _windows_chrome_version() -> Optional[str]:
+    try:
+        import winreg
+    except ImportError:
+        return None
+
+    for root in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+        try:
+            with winreg.OpenKey(root, r"Software\Google\Chrome\BLBeacon") as key:
+                return winreg.QueryValueEx(key, "version")[0]
+        except OSError:
+            continue
+    return None
+
+
+def _load_cache() -> dict:
+    try:
+        if CACHE_FILE.exists():
+            with open(CACHE_FILE, 'r') as file:
+                return json.load(file)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable driver cache {CACHE_FILE}: {str(e)}")
+    return {}
+
+
+def _save_cache(cache: dict):
+    try:
+        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(CACHE_FILE, 'w') as file:
+            json.dump(cache, file, indent=4)
+    except OSError as e:
+        logger.warning(f"Could not write driver cache {CACHE_FILE}: {str(e)}")
+
+
+def resolve_chromedriver(offline: bool = False) -> Tuple[str, bool]:
+    """Return the path of a ChromeDriver matching the installed Chrome.
+
+    Drivers are cached per Chrome major version, so only the first launch after a
+    Chrome upgrade goes through webdriver-manager. In offline mode the network is
+    never used: the cache or a chromedriver on PATH must provide the driver.
+
+    Returns:
+        (driver path, whether it came from the local cache)
+    """
+    version = detect_chrome_version()
+    major = version.split(".")[0] if version else "unknown"
+
+    cache = _load_cache()
+    cached_path = cache.get(major)
+    if cached_path and Path(cached_path).exists():
+        return cached_path, True
+
+    if offline:
+        path_driver = shutil.which("chromedriver")
+        if path_driver:
+            logger.info(f"Offline mode: using chromedriver from PATH ({path_driver})")
+            return path_driver, True
+        raise RuntimeError(
+            f"No cached ChromeDriver for Chrome {version or 'unknown version'} and offline mode is enabled. "
+            "Run once with network access or put a matching chromedriver on PATH."
+        )
+
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    driver_path = ChromeDriverManager().install()
+    if version:
+        cache[major] = driver_path
+        _save_cache(cache)
+        logger.info(f"Cached ChromeDriver for Chrome {major}: {driver_path}")
+    return driver_path, False
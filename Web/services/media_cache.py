@@ -0,0 +1,181 @@
+import os
+import shutil
+import hashlib
+import logging
+import threading
+import subprocess
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from models.message import Attachment, MediaType
+from config import (
+    MAX_ATTACHMENT_SIZE,
+    MEDIA_CACHE_MAX_BYTES,
+    IMAGE_MAX_DIMENSION,
+    IMAGE_JPEG_QUALITY,
+    VIDEO_MAX_HEIGHT,
+    VIDEO_CRF
+)
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional, images are then uploaded as they are
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = Path.home() / ".whatsapp_automator" / "media_cache"
+
+# Bump when the processing below changes so old artifacts are not reused
+PROCESSING_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+class MediaCache:
+    """Shrinks attachments once per campaign and keeps the results on disk.
+
+    Artifacts are keyed by the content hash of the source file plus the processing
+    settings, so renamed or copied files hit the same entry and changed settings
+    never reuse a stale one. The cache is trimmed to `max_bytes`, least recently
+    used entries first. Images need Pillow and videos need ffmpeg on PATH; without
+    them the original file is sent.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = MEDIA_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = True
+        self._resolved: Dict[Tuple[str, int, int, bool], Optional[Attachment]] = {}
+        self._lock = threading.Lock()
+        self._settings_tag = hashlib.sha256(repr((
+            PROCESSING_VERSION, IMAGE_MAX_DIMENSION, IMAGE_JPEG_QUALITY, VIDEO_MAX_HEIGHT, VIDEO_CRF
+        )).encode()).hexdigest()[:8]
+
+    def prepare_all(self, attachments: List[Attachment]) -> List[Attachment]:
+        """Process every attachment up front, returning the ones that can be sent."""
+        prepared = []
+        original_bytes = 0
+        upload_bytes = 0
+        for attachment in attachments:
+            result = self.resolve(attachment)
+            if result is None:
+                continue
+            original_bytes += os.path.getsize(attachment.file_path)
+            upload_bytes += os.path.getsize(result.file_path)
+            prepared.append(result)
+
+        if prepared:
+            logger.info(f"Attachments ready: {len(prepared)} file(s), {original_bytes / 1024:.0f} KB "
+                        f"-> {upload_bytes / 1024:.0f} KB per message")
+        return prepared
+
+    def resolve(self, attachment: Attachment) -> Optional[Attachment]:
+        """Return the attachment to upload in place of `attachment`.
+
+        Returns None if the file is still larger than MAX_ATTACHMENT_SIZE after
+        processing, since WhatsApp would reject it anyway.
+        """
+        source = Path(attachment.file_path)
+        stat = source.stat()
+        # Keyed on the setting too, turning shrinking off must not hand out a shrunk copy
+        memo_key = (str(source.absolute()), stat.st_mtime_ns, stat.st_size, self.enabled)
+
+        with self._lock:
+            if memo_key in self._resolved:
+                result = self._resolved[memo_key]
+            else:
+                result = self._resolve_uncached(attachment, source, stat.st_size)
+                self._resolved[memo_key] = result
+        # The memo is per file, the caption belongs to this message
+        return replace(result, caption=attachment.caption) if result is not None else None
+
+    def _resolve_uncached(self, attachment: Attachment, source: Path, size: int) -> Optional[Attachment]:
+        processed = None
+        if self.enabled:
+            try:
+                processed = self._cached_artifact(attachment.media_type, source)
+            except Exception as e:
+                logger.warning(f"Could not preprocess {source.name}, sending the original: {str(e)}")
+
+        if processed is not None and processed.stat().st_size < size:
+            logger.info(f"Using preprocessed {source.name}: {size / 1024:.0f} KB -> "
+                        f"{processed.stat().st_size / 1024:.0f} KB")
+            return replace(attachment, file_path=str(processed))
+
+        if size > MAX_ATTACHMENT_SIZE:
+            logger.warning(f"Skipping {source.name}: {size / 1024 / 1024:.1f} MB exceeds the "
+                           f"{MAX_ATTACHMENT_SIZE / 1024 / 1024:.0f} MB attachment limit")
+            return None
+        return attachment
+
+    def _cached_artifact(self, media_type: MediaType, source: Path) -> Optional[Path]:
+        if media_type == MediaType.Image:
+            if Image is None or source.suffix.lower() == ".gif":  # Keep animations intact
+                return None
+            suffix = ".png" if source.suffix.lower() == ".png" else ".jpg"
+            process = self._process_image
+        elif media_type == MediaType.Video:
+            if source.stat().st_size <= MAX_ATTACHMENT_SIZE or not shutil.which("ffmpeg"):
+                return None
+            suffix = ".mp4"
+            process = self._process_video
+        else:
+            return None
+
+        target = self.cache_dir / f"{self._content_hash(source)}-{self._settings_tag}{suffix}"
+        if target.exists():
+            os.utime(target)  # Mark as recently used
+            return target
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(target.stem + ".part" + suffix)
+        try:
+            process(source, partial)
+            partial.replace(target)
+        finally:
+            partial.unlink(missing_ok=True)
+
+        self._evict(keep=target)
+        return target
+
+    @staticmethod
+    def _content_hash(source: Path) -> str:
+        digest = hashlib.sha256()
+        with open(source, "rb") as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _process_image(source: Path, target: Path):
+        with Image.open(source) as image:
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION))
+            if target.suffix == ".png":
+                image.save(target, "PNG", optimize=True)
+            else:
+                image.convert("RGB").save(target, "JPEG", quality=IMAGE_JPEG_QUALITY, optimize=True)
+
+    @staticmethod
+    def _process_video(source: Path, target: Path):
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-i", str(source),
+             "-vf", f"scale=-2:'min({VIDEO_MAX_HEIGHT},ih)'",
+             "-c:v", "libx264", "-preset", "veryfast", "-crf", str(VIDEO_CRF),
+             "-c:a", "aac", "-b:a", "96k", "-movflags", "+faststart", str(target)],
+            check=True, capture_output=True
+        )
+
+    def _evict(self, keep: Path):
+        entries = sorted(
+            (path for path in self.cache_dir.iterdir()
+             if path.is_file() and ".part" not in path.name and path != keep),
+            key=lambda path: path.stat().st_mtime
+        )
+        total = keep.stat().st_size + sum(path.stat().st_size for path in entries)
+        for path in entries:
+            if total <= self.max_bytes:
+                break
+            total -= path.stat().st_size
+            path.unlink(missing_ok=True)
+            logger.info(f"Evicted {path.name} from the media cache")
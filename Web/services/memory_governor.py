@@ -0,0 +1,126 @@
+import os
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+from selenium.common.exceptions import WebDriverException
+from config import (
+    BROWSER_RSS_BUDGET_MB,
+    JS_HEAP_BUDGET_MB,
+    RECYCLE_AFTER_MESSAGES,
+    MEMORY_SAMPLE_INTERVAL
+)
+
+try:
+    import psutil
+except ImportError:  # psutil is optional, /proc is read directly on Linux without it
+    psutil = None
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+
+def child_pids(pid: int) -> List[int]:
+    """All descendants of a process, read from /proc."""
+    parents: Dict[int, List[int]] = {}
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            # The command name may contain spaces, the parent pid follows the closing paren
+            stat = (entry / "stat").read_text()
+            ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+        except (OSError, ValueError):
+            continue
+        parents.setdefault(ppid, []).append(int(entry.name))
+
+    found, todo = [], [pid]
+    while todo:
+        children = parents.get(todo.pop(), [])
+        found.extend(children)
+        todo.extend(children)
+    return found
+
+
+def _proc_rss(pid: int) -> int:
+    try:
+        return int(Path(f"/proc/{pid}/statm").read_text().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def browser_rss(driver) -> Optional[int]:
+    """Resident memory of all Chrome processes started by the driver, in bytes.
+
+    Shared pages are counted once per process, so this is an upper bound.
+    Returns None if the processes cannot be inspected on this platform.
+    """
+    try:
+        pid = driver.service.process.pid
+    except AttributeError:
+        return None
+
+    if psutil is not None:
+        try:
+            return sum(child.memory_info().rss for child in psutil.Process(pid).children(recursive=True))
+        except psutil.Error:
+            return None
+    if Path("/proc").is_dir():
+        return sum(_proc_rss(child) for child in child_pids(pid))
+    return None
+
+
+def js_heap_used(driver) -> Optional[int]:
+    """Used JavaScript heap of the current page in bytes, from DevTools performance metrics."""
+    try:
+        driver.execute_cdp_cmd("Performance.enable", {})
+        metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+    except (WebDriverException, KeyError):
+        return None
+    return next((int(m["value"]) for m in metrics if m.get("name") == "JSHeapUsedSize"), None)
+
+
+class MemoryGovernor:
+    """Decides when a long-running browser should be relaunched to give memory back.
+
+    The browser is recycled after `recycle_after` messages, or earlier once a sample
+    shows the Chrome processes or the page's JS heap over budget. Samples are taken
+    every `sample_every` messages to keep their cost out of the send loop.
+    """
+
+    def __init__(self, rss_budget_mb: int = BROWSER_RSS_BUDGET_MB,
+                 heap_budget_mb: int = JS_HEAP_BUDGET_MB,
+                 recycle_after: int = RECYCLE_AFTER_MESSAGES,
+                 sample_every: int = MEMORY_SAMPLE_INTERVAL):
+        self.rss_budget_mb = rss_budget_mb
+        self.heap_budget_mb = heap_budget_mb
+        self.recycle_after = recycle_after
+        self.sample_every = sample_every
+        self.enabled = True
+        self.recycles = 0
+        self.messages = 0
+
+    def reset(self):
+        self.messages = 0
+
+    def after_message(self, driver) -> Optional[str]:
+        """Count a sent message. Returns the reason to recycle now, or None."""
+        if not self.enabled:
+            return None
+        self.messages += 1
+
+        if self.recycle_after and self.messages >= self.recycle_after:
+            return f"{self.messages} messages since launch"
+        if self.messages % self.sample_every:
+            return None
+
+        rss = browser_rss(driver)
+        heap = js_heap_used(driver)
+        logger.debug(f"Browser memory after {self.messages} messages: "
+                     f"RSS {rss / MB if rss else 0:.0f} MB, JS heap {heap / MB if heap else 0:.0f} MB")
+
+        if rss is not None and rss > self.rss_budget_mb * MB:
+            return f"browser RSS {rss / MB:.0f} MB over the {self.rss_budget_mb} MB budget"
+        if heap is not None and heap > self.heap_budget_mb * MB:
+            return f"JS heap {heap / MB:.0f} MB over the {self.heap_budget_mb} MB budget"
+        return None
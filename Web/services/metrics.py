@@ -0,0 +1,217 @@
+import json
+import time
+import bisect
+import logging
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from config import METRICS_HISTOGRAM_BUCKETS, METRICS_PREFIX
+
+logger = logging.getLogger(__name__)
+
+METRICS_DIR = Path.home() / ".whatsapp_automator" / "metrics"
+
+# Returned by span() while disabled: entering and leaving it costs next to nothing
+_NULL_SPAN = nullcontext()
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+    """Cumulative-bucket histogram of durations in seconds, like a Prometheus histogram."""
+
+    def __init__(self, buckets: List[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # the last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def quantile(self, share: float) -> float:
+        """Upper bound of the bucket holding the given quantile."""
+        rank = share * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+
+class MetricsRegistry:
+    """Histograms and counters for the stages of a send, plus an optional JSON-lines trace.
+
+    Disabled by default. While disabled, span() hands out a shared no-op context and
+    count() returns at once, so the instrumentation can stay in the hot path.
+    """
+
+    def __init__(self, buckets: List[float] = METRICS_HISTOGRAM_BUCKETS):
+        self.buckets = list(buckets)
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, LabelKey], Histogram] = {}
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+        self._trace = None
+        self.trace_path: Optional[Path] = None
+
+    def configure(self, enabled: bool, trace: bool = True):
+        """Turn recording on or off; when on, spans are also appended to a daily trace file."""
+        self.enabled = enabled
+        if enabled and trace and self._trace is None:
+            METRICS_DIR.mkdir(parents=True, exist_ok=True)
+            self.trace_path = METRICS_DIR / f"trace-{datetime.now():%Y%m%d}.jsonl"
+            self._trace = self.trace_path.open("a", encoding="utf-8")
+            logger.info(f"Send timing trace: {self.trace_path}")
+        elif not (enabled and trace) and self._trace is not None:
+            with self._lock:
+                self._trace.close()
+                self._trace = None
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def span(self, stage: str, **attributes):
+        """Time a block as one stage of a send. Attributes go to the trace only."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return self._span(stage, attributes)
+
+    @contextmanager
+    def _span(self, stage: str, attributes: Dict):
+        started = time.perf_counter()
+        failed = False
+        try:
+            yield attributes  # the block may add attributes, e.g. the selector that won
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - started, attributes, failed)
+
+    def observe(self, stage: str, seconds: float, attributes: Optional[Dict] = None, failed: bool = False):
+        if not self.enabled:
+            return
+        key = ("send_stage_seconds", (("stage", stage),))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(seconds)
+            if self._trace is not None:
+                record = {"ts": round(time.time(), 3), "stage": stage, "ms": round(seconds * 1000, 2),
+                          "thread": threading.current_thread().name}
+                if failed:
+                    record["failed"] = True
+                if attributes:
+                    record.update(attributes)
+                self._trace.write(json.dumps(record) + "\n")
+
+    def count(self, name: str, amount: float = 1, **labels: str):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def flush(self):
+        with self._lock:
+            if self._trace is not None:
+                self._trace.flush()
+
+    def summary(self) -> str:
+        """One line per stage: count, mean, p50/p95 bucket bounds and max."""
+        with self._lock:
+            histograms = sorted(self._histograms.items(), key=lambda item: -item[1].sum)
+            counters = sorted(self._counters.items())
+        lines = []
+        for (_, labels), histogram in histograms:
+            if not histogram.count:
+                continue
+            lines.append(
+                f"{dict(labels)['stage']:<18} n={histogram.count:<6} "
+                f"mean={histogram.sum / histogram.count * 1000:8.1f}ms  "
+                f"p50<={histogram.quantile(0.5) * 1000:.0f}ms  p95<={histogram.quantile(0.95) * 1000:.0f}ms  "
+                f"max={histogram.max * 1000:.0f}ms  total={histogram.sum:.1f}s"
+            )
+        for (name, labels), value in counters:
+            label_text = ",".join(f"{key}={value}" for key, value in labels)
+            lines.append(f"{name}{{{label_text}}} = {value:g}")
+        return "\n".join(lines)
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = sorted(self._histograms.items())
+            counters = sorted(self._counters.items())
+
+        def label_text(labels: LabelKey, extra: str = "") -> str:
+            parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+            if extra:
+                parts.append(extra)
+            return "{" + ",".join(parts) + "}" if parts else ""
+
+        lines = []
+        typed = set()
+        for (name, labels), histogram in histograms:
+            metric = f"{METRICS_PREFIX}_{name}"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} histogram")
+                typed.add(metric)
+            cumulative = 0
+            for bound, count in zip(self.buckets + [float("inf")], histogram.counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound:g}"'
+                lines.append(f"{metric}_bucket{label_text(labels, le)} {cumulative}")
+            lines.append(f"{metric}_sum{label_text(labels)} {histogram.sum:.6f}")
+            lines.append(f"{metric}_count{label_text(labels)} {histogram.count}")
+        for (name, labels), value in counters:
+            metric = f"{METRICS_PREFIX}_{name}_total"
+            if metric not in typed:
+                lines.append(f"# TYPE {metric} counter")
+                typed.add(metric)
+            lines.append(f"{metric}{label_text(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, path: Optional[Path] = None) -> Path:
+        """Write the Prometheus file, by default where a textfile collector can pick it up."""
+        path = path or METRICS_DIR / "whatsapp_automator.prom"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Written next to the target and renamed, so a scraper never reads half a file
+        partial = path.with_suffix(".prom.tmp")
+        partial.write_text(self.prometheus_text(), encoding="utf-8")
+        partial.replace(path)
+        self.flush()
+        return path
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_registry = MetricsRegistry()
+
+
+def metrics_registry() -> MetricsRegistry:
+    return _registry
+
+
+def timed(stage: str):
+    """Decorator recording every call of a function as a span."""
+    def decorate(function):
+        @wraps(function)
+        def wrapper(*args, **kwargs):
+            with _registry.span(stage):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -0,0 +1,59 @@
+import json
+import logging
+from selenium.common.exceptions import WebDriverException
+from config import LEAN_BLOCKED_URL_PATTERNS
+
+logger = logging.getLogger(__name__)
+
+# ChromeDriver options that make Chrome report network events in the "performance" log
+PERFORMANCE_LOGGING_PREFS = {"enableNetwork": True, "enablePage": False}
+
+
+def apply_lean_profile(driver):
+    """Block resources the send flow never needs (see LEAN_BLOCKED_URL_PATTERNS)."""
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URL_PATTERNS})
+    logger.info(f"Lean sending profile active, blocking {len(LEAN_BLOCKED_URL_PATTERNS)} URL patterns")
+
+
+class NetworkMeter:
+    """Adds up the bytes Chrome transferred, read from ChromeDriver's performance log.
+
+    Only works for drivers started with performance logging enabled; for others
+    drain() does nothing.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.bytes = 0
+        self.requests = 0
+        self.blocked = 0
+
+    def drain(self, driver) -> int:
+        """Count and discard the buffered log entries. Returns the bytes they added.
+
+        ChromeDriver keeps every entry until it is read, so call this regularly
+        (once per message) and before the driver quits.
+        """
+        try:
+            entries = driver.get_log("performance")
+        except WebDriverException:
+            return 0
+
+        before = self.bytes
+        for entry in entries:
+            try:
+                event = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            if event.get("method") == "Network.loadingFinished":
+                self.bytes += event["params"].get("encodedDataLength", 0)
+                self.requests += 1
+            elif event.get("method") == "Network.loadingFailed" and event["params"].get("blockedReason"):
+                self.blocked += 1
+        return self.bytes - before
+
+    def summary(self) -> str:
+        return f"{self.bytes / 1024:.0f} KB over {self.requests} requests, {self.blocked} blocked"
@@ -0,0 +1,185 @@
+import time
+import random
+import logging
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+from config import (
+    DEFAULT_MESSAGE_DELAY,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_JITTER,
+    RATE_WAIT_SLICE
+)
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+@dataclass
+class RateLimit:
+    """Pacing settings of one account. Caps of 0 mean unlimited."""
+    interval: float = DEFAULT_MESSAGE_DELAY  # seconds between sends at the sustained rate
+    burst: int = DEFAULT_RATE_BURST          # sends allowed back to back after a pause
+    jitter: float = DEFAULT_RATE_JITTER      # +/- fraction of the interval added to each wait
+    hourly_cap: int = 0
+    daily_cap: int = 0
+
+    @property
+    def per_minute(self) -> float:
+        return 60.0 / self.interval if self.interval > 0 else float("inf")
+
+    def describe(self) -> str:
+        text = f"{self.per_minute:.1f} msg/min"
+        if self.burst > 1:
+            text += f", burst {self.burst}"
+        if self.jitter:
+            text += f", jitter {self.jitter:.0%}"
+        if self.hourly_cap:
+            text += f", max {self.hourly_cap}/h"
+        if self.daily_cap:
+            text += f", max {self.daily_cap}/day"
+        return text
+
+
+class RateLimiter:
+    """Token bucket pacing the sends of one account.
+
+    The bucket holds up to `burst` tokens and refills at one token per `interval`.
+    A token is taken when a send starts, so the interval runs from the start of the
+    previous send and the time a send takes is not added on top of it. Jitter moves
+    each slot by up to +/- `jitter` * interval; an early slot leaves the bucket in
+    debt, so the sustained rate stays as configured. Send times of the last day are
+    appended to `history_file`, one per line, so hourly and daily caps hold across runs.
+    """
+
+    def __init__(self, limit: Optional[RateLimit] = None, history_file: Optional[Path] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self.history_file = history_file
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._history = deque(self._load_history())  # wall clock times of sends in the last day
+        self.configure(limit or RateLimit())
+
+    def configure(self, limit: RateLimit):
+        """Apply new settings and start counting a new campaign."""
+        with self._lock:
+            self.limit = limit
+            self._tokens = float(max(1, limit.burst))
+            self._updated = self.clock()
+            self._slot = None
+            self._first_send = None
+            self._last_send = None
+            self.sends = 0
+            self.waited = 0.0
+            self.cap_waits = 0
+
+    def _load_history(self):
+        if self.history_file is None or not self.history_file.is_file():
+            return []
+        try:
+            cutoff = time.time() - DAY
+            history = sorted(t for t in map(float, self.history_file.read_text().split()) if t > cutoff)
+            # Drop what has aged out, the file only grows while the app runs
+            self.history_file.write_text("".join(f"{t}\n" for t in history))
+            return history
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable send history {self.history_file}: {str(e)}")
+            return []
+
+    def _save_send(self, sent_at: float):
+        if self.history_file is None:
+            return
+        try:
+            with self.history_file.open("a") as history:
+                history.write(f"{sent_at}\n")
+        except OSError as e:
+            logger.warning(f"Could not save send history: {str(e)}")
+
+    def _refill(self, now: float):
+        capacity = float(max(1, self.limit.burst))
+        if self.limit.interval > 0:
+            self._tokens = min(capacity, self._tokens + (now - self._updated) / self.limit.interval)
+        else:
+            self._tokens = capacity
+        self._updated = now
+
+    def _cap_delay(self) -> float:
+        """Seconds until the hourly and daily caps allow another send."""
+        now = time.time()
+        while self._history and self._history[0] <= now - DAY:
+            self._history.popleft()
+
+        delay = 0.0
+        for cap, window in ((self.limit.hourly_cap, HOUR), (self.limit.daily_cap, DAY)):
+            if not cap:
+                continue
+            recent = [t for t in self._history if t > now - window]
+            if len(recent) >= cap:
+                # Wait for the send that brings the window back under the cap to age out
+                delay = max(delay, recent[-cap] + window - now)
+        return delay
+
+    def next_slot(self) -> float:
+        """Clock time at which the next send may start. Stays fixed until acquire()."""
+        with self._lock:
+            if self._slot is None:
+                now = self.clock()
+                self._refill(now)
+                wait = 0.0 if self._tokens >= 1 else (1 - self._tokens) * self.limit.interval
+                if self.limit.jitter and self.limit.interval > 0:
+                    wait += random.uniform(-self.limit.jitter, self.limit.jitter) * self.limit.interval
+                cap_wait = self._cap_delay()
+                if cap_wait > max(0.0, wait):
+                    self.cap_waits += 1
+                self._slot = now + max(0.0, wait, cap_wait)
+            return self._slot
+
+    def wait_time(self) -> float:
+        return max(0.0, self.next_slot() - self.clock())
+
+    def acquire(self, should_stop: Callable[[], bool] = lambda: False) -> bool:
+        """Wait for the next slot and take a token for a send starting now.
+
+        Returns False if should_stop() turned true while waiting.
+        """
+        slot = self.next_slot()
+        started = self.clock()
+        while True:
+            remaining = slot - self.clock()
+            if remaining <= 0:
+                break
+            if should_stop():
+                self.waited += self.clock() - started
+                return False
+            time.sleep(min(RATE_WAIT_SLICE, remaining))
+        with self._lock:
+            now = self.clock()
+            self.waited += now - started
+            self._refill(now)
+            self._tokens -= 1  # may go negative after an early jittered slot
+            self._slot = None
+            self._first_send = self._first_send if self._first_send is not None else now
+            self._last_send = now
+            self.sends += 1
+            self._history.append(time.time())
+            self._save_send(self._history[-1])
+        return True
+
+    def achieved_per_minute(self) -> Optional[float]:
+        """Send rate since the first send of the campaign, None before the second send."""
+        if self.sends < 2 or self._last_send == self._first_send:
+            return None
+        return (self.sends - 1) * 60.0 / (self._last_send - self._first_send)
+
+    def summary(self) -> str:
+        achieved = self.achieved_per_minute()
+        text = (f"{self.sends} sends, achieved "
+                + (f"{achieved:.1f}" if achieved is not None else "n/a")
+                + f" msg/min vs configured {self.limit.describe()}, {self.waited:.1f}s spent pacing")
+        if self.cap_waits:
+            text += f", held back {self.cap_waits}x by caps"
+        return text
@@ -0,0 +1,149 @@
+import time
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from PyQt6.QtCore import QThread, pyqtSignal
+from models.contact import Contact
+from services.rate_limiter import RateLimit, RateLimiter
+from config import (
+    REGISTRATION_CACHE_TTL_DAYS,
+    VALIDATION_INTERVAL
+)
+
+logger = logging.getLogger(__name__)
+
+REGISTERED = "registered"
+NOT_REGISTERED = "not_registered"
+UNKNOWN = "unknown"
+
+# SQLite allows 999 bound parameters per statement in older builds
+_QUERY_CHUNK = 500
+
+
+def to_e164(phone: str) -> str:
+    """Cache key of a number already normalized with WhatsAppService.normalize_phone."""
+    return "+" + "".join(filter(str.isdigit, phone))
+
+
+class RegistrationCache:
+    """Remembers which numbers have a WhatsApp account, in SQLite, for `ttl_days`.
+
+    Filled by the validate-list job and by every send that opened a chat or hit the
+    invalid-number popup. One connection is shared by all threads behind a lock.
+    """
+
+    def __init__(self, path: Optional[Path] = None, ttl_days: float = REGISTRATION_CACHE_TTL_DAYS):
+        self.path = path or Path.home() / ".whatsapp_automator" / "registrations.sqlite3"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl_days * 24 * 3600
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), check_same_thread=False)
+        # Every opened chat is recorded; without WAL each of those waits for an fsync
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS registrations ("
+                "number TEXT PRIMARY KEY, registered INTEGER NOT NULL, checked_at REAL NOT NULL)"
+            )
+
+    def lookup(self, numbers: Iterable[str]) -> Dict[str, bool]:
+        """Fresh results for the given normalized numbers; unknown and stale ones are left out."""
+        keys = list(dict.fromkeys(to_e164(number) for number in numbers))
+        cutoff = time.time() - self.ttl
+        found = {}
+        with self._lock:
+            for start in range(0, len(keys), _QUERY_CHUNK):
+                chunk = keys[start:start + _QUERY_CHUNK]
+                rows = self._connection.execute(
+                    f"SELECT number, registered FROM registrations "
+                    f"WHERE checked_at > ? AND number IN ({','.join('?' * len(chunk))})",
+                    [cutoff, *chunk]
+                )
+                found.update((number, bool(registered)) for number, registered in rows)
+        return found
+
+    def get(self, number: str) -> Optional[bool]:
+        return self.lookup([number]).get(to_e164(number))
+
+    def is_unregistered(self, number: str) -> bool:
+        return self.get(number) is False
+
+    def record(self, number: str, registered: bool):
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO registrations (number, registered, checked_at) VALUES (?, ?, ?)",
+                    (to_e164(number), int(registered), time.time())
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not cache registration of {number}: {str(e)}")
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class ValidateListWorker(QThread):
+    """Checks which contacts are on WhatsApp without sending anything.
+
+    Only numbers without a fresh cache entry are opened in the browser, through the
+    same /send route and invalid-number detection the sender uses.
+    """
+    status_update = pyqtSignal(str)
+    progress_update = pyqtSignal(int)
+    checked = pyqtSignal(str, str)  # contact phone, REGISTERED / NOT_REGISTERED / UNKNOWN
+    completed = pyqtSignal(int, int, int)  # registered, not registered, unknown
+
+    def __init__(self, service, contacts: List[Contact], country_code: str = ""):
+        super().__init__()
+        self.service = service
+        self.contacts = contacts
+        self.country_code = country_code
+        self._stop_requested = False
+        self.limiter = RateLimiter(RateLimit(interval=VALIDATION_INTERVAL))
+
+    def run(self):
+        counts = {REGISTERED: 0, NOT_REGISTERED: 0, UNKNOWN: 0}
+        cache = self.service.registration_cache
+        numbers = {c.phone: self.service.normalize_phone(c.phone, self.country_code) for c in self.contacts}
+        known = cache.lookup(numbers.values())
+
+        todo = []
+        for contact in self.contacts:
+            registered = known.get(to_e164(numbers[contact.phone]))
+            if registered is None:
+                todo.append(contact)
+                continue
+            status = REGISTERED if registered else NOT_REGISTERED
+            counts[status] += 1
+            self.checked.emit(contact.phone, status)
+
+        self.status_update.emit(f"{len(self.contacts) - len(todo)} numbers known from the cache, "
+                                f"checking {len(todo)}")
+        if todo and not self.service.ensure_session():
+            counts[UNKNOWN] += len(todo)
+            todo = []
+
+        for i, contact in enumerate(todo):
+            if not self.limiter.acquire(lambda: self._stop_requested):
+                break
+            status = UNKNOWN
+            registered = self.service.check_registration(numbers[contact.phone])
+            if registered is not None:
+                status = REGISTERED if registered else NOT_REGISTERED
+            counts[status] += 1
+            self.checked.emit(contact.phone, status)
+            self.progress_update.emit(int((i + 1) / len(todo) * 100))
+
+        if self._stop_requested:
+            self.status_update.emit("Validation stopped")
+        logger.info(f"Validated {len(self.contacts)} numbers: {counts[REGISTERED]} on WhatsApp, "
+                    f"{counts[NOT_REGISTERED]} not on WhatsApp, {counts[UNKNOWN]} unknown "
+                    f"({self.limiter.summary()})")
+        self.completed.emit(counts[REGISTERED], counts[NOT_REGISTERED], counts[UNKNOWN])
+
+    def stop(self):
+        self._stop_requested = True
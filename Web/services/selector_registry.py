@@ -0,0 +1,123 @@
+import time
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import (
+    NoSuchElementException,
+    StaleElementReferenceException,
+    TimeoutException
+)
+from services.metrics import metrics_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class SelectorStats:
+    hits: int = 0
+    misses: int = 0
+    total_latency: float = 0.0
+
+    @property
+    def average_latency(self) -> float:
+        return self.total_latency / self.hits if self.hits else 0.0
+
+
+class SelectorRegistry:
+    """Resolves logical page elements from a list of candidate XPaths.
+
+    All candidates of an element are raced within one wait, with the last winner
+    checked first. A dead selector therefore costs no timeout as long as one of
+    its alternatives still matches.
+    """
+
+    def __init__(self, poll_frequency: float = 0.1):
+        self.poll_frequency = poll_frequency
+        self._candidates: Dict[str, List[str]] = {}
+        self._winners: Dict[str, str] = {}
+        self.stats: Dict[str, SelectorStats] = {}
+
+    def register(self, name: str, *xpaths: str):
+        self._candidates[name] = list(xpaths)
+        for xpath in xpaths:
+            self.stats.setdefault(xpath, SelectorStats())
+
+    def winner(self, name: str) -> Optional[str]:
+        return self._winners.get(name)
+
+    def _ordered(self, name: str) -> List[str]:
+        candidates = self._candidates[name]
+        winner = self._winners.get(name)
+        if winner is None:
+            return candidates
+        return [winner] + [xpath for xpath in candidates if xpath != winner]
+
+    def find(self, driver, name: str, timeout: float, condition=EC.element_to_be_clickable):
+        """Wait until any candidate for `name` satisfies `condition` and return the element.
+
+        Raises:
+            TimeoutException: if no candidate matched within the timeout
+        """
+        return self.race(driver, (name,), timeout, condition)[1]
+
+    def race(self, driver, names: Sequence[str], timeout: float,
+             condition=EC.element_to_be_clickable) -> Tuple[str, object]:
+        """Wait for whichever of several elements shows up first.
+
+        Earlier names win when several match in the same poll. Returns the name
+        and the element; raises TimeoutException if none matched in time.
+        """
+        ordered = [(name, xpath) for name in names for xpath in self._ordered(name)]
+        started = time.perf_counter()
+
+        def race(driver) -> Optional[Tuple[str, str, object]]:
+            for name, xpath in ordered:
+                try:
+                    element = condition((By.XPATH, xpath))(driver)
+                except (NoSuchElementException, StaleElementReferenceException):
+                    continue
+                if element:
+                    return name, xpath, element
+            return None
+
+        try:
+            name, xpath, element = WebDriverWait(driver, timeout, poll_frequency=self.poll_frequency).until(race)
+        except TimeoutException:
+            for _, candidate in ordered:
+                self.stats[candidate].misses += 1
+            raise TimeoutException(f"No selector for {' or '.join(repr(n) for n in names)} matched within {timeout}s")
+
+        self._record_win(name, xpath, time.perf_counter() - started)
+        return name, element
+
+    def _record_win(self, name: str, xpath: str, latency: float):
+        previous = self._winners.get(name)
+        if previous is not None and previous != xpath:
+            self.stats[previous].misses += 1
+            logger.warning(f"Selector for '{name}' changed, now using: {xpath}")
+        elif previous is None:
+            logger.info(f"Selector for '{name}' resolved to: {xpath}")
+
+        self._winners[name] = xpath
+        metrics = metrics_registry()
+        if metrics.enabled:
+            # Labelled by position in the candidate list, XPaths make unwieldy label values
+            metrics.count("selector_wins", element=name, candidate=str(self._candidates[name].index(xpath)))
+        stats = self.stats[xpath]
+        stats.hits += 1
+        stats.total_latency += latency
+
+    def summary(self) -> str:
+        lines = []
+        for name, candidates in self._candidates.items():
+            for xpath in candidates:
+                stats = self.stats[xpath]
+                marker = "*" if self._winners.get(name) == xpath else " "
+                lines.append(
+                    f"{marker} {name}: hits={stats.hits} misses={stats.misses} "
+                    f"avg={stats.average_latency * 1000:.0f}ms  {xpath[:80]}"
+                )
+        return "\n".join(lines)
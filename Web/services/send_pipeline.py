@@ -0,0 +1,50 @@
+import time
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List
+from models.contact import Contact
+from models.message import Message, Attachment
+
+
+@dataclass
+class PreparedSend:
+    """Everything about one send that can be worked out without the browser."""
+    contact: Contact
+    message: Message
+    text: str
+    phone: str
+    attachments: List[Attachment] = field(default_factory=list)
+    failure: str = ""  # SEND_FAILURE_* of the last failed attempt, empty otherwise
+
+
+class StageTimer:
+    """Accumulates wall-clock time per named stage of a bulk run.
+
+    Occupancy is reported relative to the elapsed time multiplied by the number of
+    lanes (threads sending in parallel), so a fully busy stage reads 100%.
+    """
+
+    def __init__(self, lanes: int = 1):
+        self.lanes = lanes
+        self.totals: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    @contextmanager
+    def measure(self, stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.totals[stage] += time.perf_counter() - started
+
+    def occupancy(self) -> Dict[str, float]:
+        elapsed = (time.perf_counter() - self._started) * self.lanes
+        with self._lock:
+            return {stage: total / elapsed for stage, total in self.totals.items()} if elapsed else {}
+
+    def summary(self) -> str:
+        return " | ".join(f"{stage} {share * 100:.0f}%" for stage, share in self.occupancy().items())
@@ -0,0 +1,72 @@
+import time
+import logging
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+from config import WHATSAPP_WEB_URL
+
+logger = logging.getLogger(__name__)
+
+# localStorage keys WhatsApp Web writes once a device is linked
+SESSION_MARKERS = (b"last-wid-md", b"last-wid")
+_ORIGIN = urlsplit(WHATSAPP_WEB_URL)
+WHATSAPP_ORIGIN = _ORIGIN.netloc.encode()
+# Chrome names IndexedDB folders scheme_host_port, with port 0 for the default one
+INDEXED_DB_FOLDER = f"{_ORIGIN.scheme}_{_ORIGIN.hostname}_{_ORIGIN.port or 0}.indexeddb.leveldb"
+SESSION_STATE_TTL = 300
+
+
+class SessionProbe:
+    """Answers "is this Chrome profile logged in to WhatsApp Web?" without starting Chrome.
+
+    The last state verified by a live driver is trusted for SESSION_STATE_TTL seconds.
+    Otherwise the profile's localStorage and IndexedDB are inspected on disk. The
+    disk probe is a hint only: the driver still verifies the login after loading
+    the page and records the outcome here.
+    """
+
+    def __init__(self, profile_dir: Path, ttl: float = SESSION_STATE_TTL):
+        self.profile_dir = profile_dir
+        self.ttl = ttl
+        self._known_state: Optional[bool] = None
+        self._known_at = 0.0
+
+    def record(self, logged_in: bool):
+        self._known_state = logged_in
+        self._known_at = time.monotonic()
+
+    def forget(self):
+        self._known_state = None
+
+    def has_session(self) -> bool:
+        if self._known_state is not None and time.monotonic() - self._known_at < self.ttl:
+            return self._known_state
+
+        started = time.perf_counter()
+        found = self._profile_has_session()
+        logger.info(f"Session probe for {self.profile_dir.name}: "
+                    f"{'session found' if found else 'no session'} in {(time.perf_counter() - started) * 1000:.1f}ms")
+        return found
+
+    def _profile_has_session(self) -> bool:
+        profile = self.profile_dir / "Default"
+
+        indexed_db = profile / "IndexedDB" / INDEXED_DB_FOLDER
+        if not indexed_db.is_dir() or not any(indexed_db.iterdir()):
+            return False
+
+        local_storage = profile / "Local Storage" / "leveldb"
+        if not local_storage.is_dir():
+            return False
+
+        for path in local_storage.iterdir():
+            if path.suffix not in (".ldb", ".log"):
+                continue
+            try:
+                data = path.read_bytes()
+            except OSError:
+                continue
+            if WHATSAPP_ORIGIN in data and any(marker in data for marker in SESSION_MARKERS):
+                return True
+
+        return False
@@ -0,0 +1,59 @@
+from typing import Callable, Optional
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import StaleElementReferenceException, WebDriverException
+
+# Conditions for WebDriverWait, following selenium's expected_conditions convention.
+
+
+class element_has_focus:
+    """The given element is the document's active element."""
+
+    def __init__(self, element):
+        self.element = element
+
+    def __call__(self, driver):
+        try:
+            return driver.switch_to.active_element == self.element
+        except StaleElementReferenceException:
+            return False
+
+
+class element_has_text:
+    """The given element contains some non-whitespace text."""
+
+    def __init__(self, element):
+        self.element = element
+
+    def __call__(self, driver):
+        try:
+            return bool(self.element.text.strip())
+        except StaleElementReferenceException:
+            return False
+
+
+class element_count_increased:
+    """More elements match the XPath than the given baseline count.
+
+    Args:
+        counter: Optional function counting XPath matches, e.g. a browser backend's count
+    """
+
+    def __init__(self, xpath: str, baseline: int, counter: Optional[Callable[[str], int]] = None):
+        self.xpath = xpath
+        self.baseline = baseline
+        self.counter = counter
+
+    def __call__(self, driver):
+        try:
+            if self.counter is not None:
+                return self.counter(self.xpath) > self.baseline
+            return len(driver.find_elements(By.XPATH, self.xpath)) > self.baseline
+        except WebDriverException:
+            return False
+
+
+def count_elements(driver, xpath: str) -> int:
+    try:
+        return len(driver.find_elements(By.XPATH, xpath))
+    except WebDriverException:
+        return 0
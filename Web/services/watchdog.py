@@ -0,0 +1,112 @@
+import os
+import time
+import signal
+import logging
+import threading
+from pathlib import Path
+from services.memory_governor import child_pids, psutil
+from config import LIVENESS_PING_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+
+def kill_browser(driver):
+    """Kill ChromeDriver and every Chrome process it started, without talking to them.
+
+    Used instead of driver.quit() when the session no longer answers, so that no
+    orphaned Chrome keeps the profile locked.
+    """
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return
+
+    if psutil is not None:
+        try:
+            children = psutil.Process(process.pid).children(recursive=True)
+        except psutil.Error:
+            children = []
+        for child in children:
+            try:
+                child.kill()
+            except psutil.Error:
+                pass
+    elif Path("/proc").is_dir():
+        for pid in child_pids(process.pid):
+            try:
+                os.kill(pid, signal.SIGKILL)
+            except OSError:
+                pass
+
+    try:
+        process.kill()
+        process.wait(timeout=5)
+    except Exception as e:
+        logger.debug(f"Could not kill ChromeDriver: {str(e)}")
+
+
+class DriverWatchdog:
+    """Tells a dead or hung browser apart from an ordinary send failure and restarts it.
+
+    A failed send triggers one liveness ping: a trivial script that has to answer
+    within `ping_timeout` seconds. Only if it does not, the browser is killed and
+    relaunched on the same profile, and the caller may retry the contact.
+    """
+
+    def __init__(self, service, ping_timeout: float = LIVENESS_PING_TIMEOUT):
+        self.service = service
+        self.ping_timeout = ping_timeout
+        self.reset()
+
+    def reset(self):
+        self.restarts = 0
+        self.failed_restarts = 0
+        self.downtime = 0.0
+
+    def is_alive(self) -> bool:
+        driver = self.service.driver
+        if driver is None:
+            return False
+        process = getattr(driver.service, "process", None)
+        if process is not None and process.poll() is not None:
+            return False  # ChromeDriver has exited
+
+        answer = {}
+
+        def ping():
+            try:
+                answer["ok"] = driver.execute_script("return 1") == 1
+            except Exception:  # WebDriverException, but also refused connections
+                answer["ok"] = False
+
+        # The ping thread is left behind if the browser hangs, it ends once the session is killed
+        thread = threading.Thread(target=ping, name="driver-liveness-ping", daemon=True)
+        thread.start()
+        thread.join(self.ping_timeout)
+        return answer.get("ok", False)
+
+    def handle_failure(self) -> bool:
+        """Call after a failed send. Returns True if the browser had died and was restarted,
+        i.e. the send is worth retrying."""
+        if self.service.driver is None or self.is_alive():
+            return False
+        return self.recover("browser stopped responding")
+
+    def recover(self, reason: str) -> bool:
+        started = time.monotonic()
+        logger.warning(f"Watchdog: {reason}, restarting the browser")
+        recovered = self.service.restart_after_crash(reason)
+        self.downtime += time.monotonic() - started
+        if recovered:
+            self.restarts += 1
+            logger.info(f"Watchdog: browser back after {time.monotonic() - started:.1f}s "
+                        f"({self.summary()})")
+        else:
+            self.failed_restarts += 1
+            logger.error(f"Watchdog: browser could not be restarted ({self.summary()})")
+        return recovered
+
+    def summary(self) -> str:
+        text = f"{self.restarts} restart(s), {self.downtime:.1f}s downtime"
+        if self.failed_restarts:
+            text += f", {self.failed_restarts} failed"
+        return text
@@ -1,7 +1,10 @@
 import time
+import base64
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.chrome.options import Options
@@ -10,10 +13,27 @@ from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
 from PyQt6.QtCore import QObject, pyqtSignal, QThread
 from models.message import Message, Attachment, MediaType
 from models.contact import Contact
+from services.driver_cache import resolve_chromedriver
+from services.session_probe import SessionProbe
+from services.selector_registry import SelectorRegistry
+from services.send_pipeline import PreparedSend, StageTimer
+from services.delivery_tracker import DeliveryTracker
+from services.media_cache import MediaCache
+from services.browser_backend import create_backend
+from services.network_profile import NetworkMeter, PERFORMANCE_LOGGING_PREFS, apply_lean_profile
+from services.memory_governor import MemoryGovernor
+from services.watchdog import DriverWatchdog, kill_browser
+from services.rate_limiter import RateLimit, RateLimiter
+from services.registration_cache import RegistrationCache
+from services.metrics import metrics_registry, timed
+from services.wait_conditions import (
+    element_has_focus,
+    element_has_text,
+    element_count_increased
+)
 from config import (
     WHATSAPP_WEB_URL,
     MESSAGE_INPUT_XPATH,
@@ -22,11 +42,99 @@ from config import (
     MEDIA_SEND_BUTTON_XPATH,
     LOGIN_CHECK_XPATH,
     MEDIA_CAPTION_INPUT_XPATH,
+    SEARCH_BAR_INPUT_XPATH,
+    SEARCH_RESULT_XPATH,
+    SEARCH_NO_RESULTS_XPATH,
+    CHAT_HEADER_TITLE_XPATH,
+    NAVIGATION_MODE_IN_APP,
+    NAVIGATION_MODE_URL,
+    DEFAULT_NAVIGATION_MODE,
+    BROWSER_BACKEND_WEBDRIVER,
+    BROWSER_BACKEND_CDP,
+    DEFAULT_BROWSER_BACKEND,
+    LOW_MEMORY_CHROME_FLAGS,
+    QR_CODE_XPATH,
+    MAX_CRASH_RETRIES,
+    IN_APP_LOOKUP_TIMEOUT,
+    OUTGOING_MESSAGE_XPATH,
+    DOCUMENT_FILE_INPUT_CSS,
+    MEDIA_FILE_INPUT_XPATH,
+    MEDIA_PREVIEW_THUMBNAIL_XPATH,
+    COMPOSER_READY_TIMEOUT,
+    ATTACHMENT_MENU_TIMEOUT,
+    ATTACHMENT_PREVIEW_TIMEOUT,
+    SEND_CONFIRM_TIMEOUT,
+    SEND_BUTTON_TIMEOUT,
+    DEFAULT_DELIVERY_WAIT_HORIZON,
+    WAIT_POLL_INTERVAL,
+    TEXT_ENTRY_MODE_INJECT,
+    DEFAULT_TEXT_ENTRY_MODE,
+    INVALID_NUMBER_POPUP_XPATH,
+    POPUP_CONFIRM_BUTTON_XPATH,
+    OFFLINE_BANNER_XPATH,
+    OFFLINE_GRACE_PERIOD,
+    OFFLINE_RECOVERY_TIMEOUT,
+    SEND_FAILURE_NOT_ON_WHATSAPP,
+    SEND_FAILURE_OFFLINE,
     DEFAULT_TIMEOUT, ATTACHMENT_ADD_BUTTON_XPATH
 )
 
 logger = logging.getLogger(__name__)
 
+# Imported while the app starts; the first successful send is timed from here
+# Reads the login QR canvas in one call: returns [data-ref, PNG data URL, null], or
+# with arguments[1] set, [data-ref, null, module rows] sampled from its pixels.
+QR_CAPTURE_SCRIPT = """
+const canvas = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!canvas) { return null; }
+const holder = canvas.closest('[data-ref]');
+const ref = holder ? holder.getAttribute('data-ref') : '';
+if (!arguments[1]) { return [ref, canvas.toDataURL('image/png'), null]; }
+
+const copy = document.createElement('canvas');
+copy.width = canvas.width;
+copy.height = canvas.height;
+const context = copy.getContext('2d');
+context.drawImage(canvas, 0, 0);
+const width = copy.width;
+const pixels = context.getImageData(0, 0, copy.width, copy.height).data;
+const dark = function (x, y) {
+    const i = (y * width + x) * 4;
+    return pixels[i + 3] > 128 && pixels[i] < 128;
+};
+
+// The top-left finder pattern is 7 modules wide, which gives the module size
+const size = Math.min(copy.width, copy.height);
+let start = -1;
+for (let d = 0; d < size; d++) { if (dark(d, d)) { start = d; break; } }
+if (start < 0) { return [ref, null, null]; }
+let run = 0;
+while (start + run < width && dark(start + run, start)) { run++; }
+const module = run / 7;
+let end = start;
+for (let x = width - 1; x > start; x--) { if (dark(x, start)) { end = x; break; } }
+const count = Math.round((end - start + 1) / module);
+
+const rows = [];
+for (let r = 0; r < count; r++) {
+    let row = '';
+    for (let c = 0; c < count; c++) {
+        row += dark(Math.floor(start + (c + 0.5) * module), Math.floor(start + (r + 0.5) * module)) ? '1' : '0';
+    }
+    rows.push(row);
+}
+return [ref, null, rows];
+"""
+
+
+class ChatOpenError(Exception):
+    """Opening a chat ended on a known page state instead of the composer."""
+
+    def __init__(self, reason: str, phone: str):
+        super().__init__(f"{phone}: {reason}")
+        self.reason = reason  # SEND_FAILURE_*
+        self.phone = phone
+
 
 class WhatsAppService(QObject):
     status_update = pyqtSignal(str)
@@ -36,15 +144,81 @@ class WhatsAppService(QObject):
     logged_in = pyqtSignal()
     error_occurred = pyqtSignal(str)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, profile_name: str = "chrome_profile", data_dir: Optional[Path] = None,
+                 registration_cache: Optional[RegistrationCache] = None):
         super().__init__(parent)
         self.driver: Optional[webdriver.Chrome] = None
         self.is_logged_in = False
-        self.profile_dir = Path.home() / ".whatsapp_automator" / "chrome_profile"
+        self.profile_name = profile_name
+        # Everything the service keeps on disk lives under data_dir
+        self.data_dir = data_dir or Path.home() / ".whatsapp_automator"
+        self.profile_dir = self.data_dir / profile_name
         self.profile_dir.mkdir(parents=True, exist_ok=True)
         self._stop_requested = False
         self.headless_enabled = False  # Set from settings
         self.current_headless_mode = None  # Track current driver mode
+        self.navigation_mode = DEFAULT_NAVIGATION_MODE
+        self.text_entry_mode = DEFAULT_TEXT_ENTRY_MODE
+        self.offline_driver = False  # Never resolve ChromeDriver over the network
+        self.session_probe = SessionProbe(self.profile_dir)
+        self.delivery_tracker = DeliveryTracker()
+        self.media_cache = MediaCache()
+        # Shared between the services of a worker pool, so one connection serves them all
+        self.registration_cache = registration_cache or RegistrationCache(self.data_dir / "registrations.sqlite3")
+        self.backend_name = DEFAULT_BROWSER_BACKEND
+        self._backend = None
+        self._backend_key = None
+        self.lean_sending = False  # Block non-essential resources in headless mode
+        self.network_meter = NetworkMeter()
+        self.memory_governor = MemoryGovernor()
+        self.watchdog = DriverWatchdog(self)
+        # Caps count every send of this account, so the history sits next to its profile
+        # (not inside it, the profile folder belongs to Chrome)
+        self.rate_limiter = RateLimiter(history_file=self.data_dir / f"{profile_name}.send_history")
+        self.metrics = metrics_registry()
+        self.selectors = SelectorRegistry(poll_frequency=WAIT_POLL_INTERVAL)
+        self.selectors.register("message_input", MESSAGE_INPUT_XPATH, MESSAGE_INPUT_XPATH_FALLBACK)
+        self.selectors.register("send_button", SEND_BUTTON_XPATH, MEDIA_SEND_BUTTON_XPATH)
+        self.selectors.register("invalid_number", INVALID_NUMBER_POPUP_XPATH)
+        self.selectors.register("offline_banner", OFFLINE_BANNER_XPATH)
+        self.selectors.register("search_result", SEARCH_RESULT_XPATH)
+        self.selectors.register("search_no_results", SEARCH_NO_RESULTS_XPATH)
+        self._warmup_done = threading.Event()
+        self._warmup_done.set()
+        self.prewarmed = False
+        self.app_started: Optional[float] = None  # perf_counter() at app start, set by the main window
+        # mode -> [chats opened, total seconds]
+        self.navigation_stats: Dict[str, List[float]] = {
+            NAVIGATION_MODE_IN_APP: [0, 0.0],
+            NAVIGATION_MODE_URL: [0, 0.0],
+        }
+
+    def apply_settings(self, settings):
+        """Pick up the browser related options saved by the Settings tab."""
+        self.headless_enabled = settings.value("headless_mode", False) == "true"
+        self.navigation_mode = (
+            NAVIGATION_MODE_URL if settings.value("in_app_navigation", True) == "false"
+            else NAVIGATION_MODE_IN_APP
+        )
+        self.offline_driver = settings.value("offline_driver", False) == "true"
+        self.media_cache.enabled = settings.value("optimize_attachments", True) != "false"
+        self.lean_sending = settings.value("lean_sending", False) == "true"
+        self.memory_governor.enabled = settings.value("memory_governor", True) != "false"
+        self.backend_name = (
+            BROWSER_BACKEND_CDP if settings.value("cdp_backend", False) == "true"
+            else BROWSER_BACKEND_WEBDRIVER
+        )
+        self.metrics.configure(settings.value("send_metrics", False) == "true")
+
+    @property
+    def backend(self):
+        """Backend for the per-message DOM operations, rebuilt whenever the driver changes."""
+        if self._backend_key != (self.driver, self.backend_name):
+            if self._backend is not None:
+                self._backend.close()
+            self._backend = create_backend(self.driver, self.backend_name)
+            self._backend_key = (self.driver, self.backend_name)
+        return self._backend
 
     def initialize_driver(self, use_headless: bool = False) -> bool:
         """Initialize Chrome driver with optional headless mode.
@@ -64,22 +238,44 @@ class WhatsAppService(QObject):
             options.add_experimental_option('useAutomationExtension', False)
             options.add_argument("--no-sandbox")
             options.add_argument("--disable-dev-shm-usage")
+            if self.memory_governor.enabled:
+                for flag in LOW_MEMORY_CHROME_FLAGS:
+                    options.add_argument(flag)
 
             # Add headless arguments if requested
             if use_headless:
                 options.add_argument("--headless=new")  # Chrome 109+ new headless mode
                 options.add_argument("--window-size=1920,1080")
                 options.add_argument("--disable-gpu")
+                # Network events for the transfer accounting of headless sessions
+                options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+                options.add_experimental_option("perfLoggingPrefs", PERFORMANCE_LOGGING_PREFS)
 
-            service = ChromeService(ChromeDriverManager().install())
+            started = time.perf_counter()
+            driver_path, cached = resolve_chromedriver(offline=self.offline_driver)
+            resolved = time.perf_counter()
+
+            service = ChromeService(driver_path)
 
             self.driver = webdriver.Chrome(
                 service=service,
                 options=options
             )
 
+            logger.info(
+                f"Driver startup ({'warm' if cached else 'cold'}): resolved ChromeDriver in "
+                f"{resolved - started:.2f}s, launched Chrome in {time.perf_counter() - resolved:.2f}s"
+            )
+
             self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
 
+            self.memory_governor.reset()
+            if use_headless and self.lean_sending:
+                try:
+                    apply_lean_profile(self.driver)
+                except WebDriverException as e:
+                    logger.warning(f"Could not apply the lean sending profile: {str(e)}")
+
             # Track the current mode
             self.current_headless_mode = use_headless
             self.status_update.emit(f"Chrome driver initialized successfully in {mode} mode")
@@ -91,27 +287,90 @@ class WhatsAppService(QObject):
             self.error_occurred.emit(error_msg)
             return False
 
+    def _log_page_ready(self, started: float):
+        loaded = self.network_meter.drain(self.driver)
+        logger.info(f"WhatsApp Web ready in {time.perf_counter() - started:.2f}s, {loaded / 1024:.0f} KB "
+                    f"transferred (lean sending {'on' if self.lean_sending else 'off'})")
+
+    def drain_network_log(self):
+        """Empty ChromeDriver's performance log into the meter; only headless sessions keep one."""
+        if self.driver and self.current_headless_mode:
+            self.network_meter.drain(self.driver)
+
+    def report_network_usage(self) -> str:
+        """Log and return the headless traffic since the meter was reset at the start of the run."""
+        self.drain_network_log()
+        summary = f"Network: {self.network_meter.summary()} (lean sending {'on' if self.lean_sending else 'off'})"
+        logger.info(summary)
+        return summary
+
     def check_session_exists(self) -> bool:
-        """Quick check if a WhatsApp session exists without full login."""
-        if not self.driver:
-            # Initialize in headless to quickly check
-            if not self.initialize_driver(use_headless=True):
-                return False
+        """Quick check if a WhatsApp session exists, without launching a browser."""
+        if self.driver and self.is_logged_in:
+            return True
+        return self.session_probe.has_session()
+
+    def prewarm(self) -> bool:
+        """Start the browser and load WhatsApp Web ahead of the first send.
 
+        Meant to run off the GUI thread; login() and send_message() wait for it
+        to finish before touching the driver.
+        """
+        self._warmup_done.clear()
+        self.prewarmed = True
+        started = time.perf_counter()
         try:
+            if self.driver:
+                return True
+
+            if not self.initialize_driver(use_headless=self.headless_enabled):
+                return False
+
             self.driver.get(WHATSAPP_WEB_URL)
-            wait = WebDriverWait(self.driver, 5)  # Short wait
-            wait.until(EC.presence_of_element_located((By.XPATH, LOGIN_CHECK_XPATH)))
-            return True
-        except:
+            try:
+                WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
+                    EC.presence_of_element_located((By.XPATH, LOGIN_CHECK_XPATH))
+                )
+                self.is_logged_in = True
+                self.session_probe.record(True)
+            except TimeoutException:
+                if self.current_headless_mode:
+                    # Stays on the QR page for the in-app login dialog
+                    self.session_probe.record(False)
+                    logger.info("No session for the pre-warmed headless browser, login required")
+
+            logger.info(f"Standby browser ready in {time.perf_counter() - started:.2f}s "
+                        f"(logged in: {self.is_logged_in})")
+            self.status_update.emit("Browser ready" + (" (session restored)" if self.is_logged_in else ""))
+            return self.is_logged_in
+
+        except Exception as e:
+            logger.error(f"Failed to pre-warm browser: {str(e)}")
             return False
+
         finally:
-            if self.driver:
-                self.driver.quit()
-                self.driver = None
+            self._warmup_done.set()
+
+    def wait_for_warmup(self):
+        if not self._warmup_done.is_set():
+            self.status_update.emit("Waiting for the browser to finish starting...")
+            self._warmup_done.wait()
 
     def login(self) -> bool:
         """Login to WhatsApp Web."""
+        self.wait_for_warmup()
+
+        if self.driver and self.current_headless_mode:
+            # A headless browser has no window to log in through, a visible one replaces it
+            # and restores the session if there is one
+            logger.info("Replacing the headless browser with a visible one for login")
+            try:
+                self.driver.quit()
+            except WebDriverException as e:
+                logger.warning(f"Error quitting headless browser before login: {str(e)}")
+            self.driver = None
+            self.is_logged_in = False
+
         # Check if already logged in
         if self.is_logged_in:
             self.status_update.emit("Already logged in to WhatsApp Web")
@@ -135,6 +394,7 @@ class WhatsAppService(QObject):
 
                 # We're already logged in from a previous session!
                 self.is_logged_in = True
+                self.session_probe.record(True)
                 self.logged_in.emit()
                 self.status_update.emit("Already logged in to WhatsApp Web (session restored)")
                 logger.info("User already logged in from persistent session")
@@ -153,6 +413,7 @@ class WhatsAppService(QObject):
                     wait_long.until(EC.presence_of_element_located((By.XPATH, LOGIN_CHECK_XPATH)))
 
                     self.is_logged_in = True
+                    self.session_probe.record(True)
                     self.logged_in.emit()
                     self.status_update.emit("Successfully logged in to WhatsApp Web")
                     logger.info("Successfully logged in after QR code scan")
@@ -170,16 +431,342 @@ class WhatsAppService(QObject):
             self.error_occurred.emit(error_msg)
             return False
 
-    def construct_message_url(self, phone_number: str, country_code: str = "") -> str:
+    def start_headless_login(self) -> bool:
+        """Bring a headless browser to the WhatsApp Web start page for an in-app QR login.
+
+        The QR code is shown through qr_code_png() and the login detected with
+        poll_login(). The same browser then goes on sending, so there is no
+        relaunch between logging in and going headless.
+        """
+        self.wait_for_warmup()
+        try:
+            if self.driver and not self.current_headless_mode:
+                # A visible browser can not be hidden, it is replaced this once
+                self.driver.quit()
+                self.driver = None
+                self.is_logged_in = False
+
+            if not self.driver and not self.initialize_driver(use_headless=True):
+                return False
+            if not self.driver.current_url.startswith(WHATSAPP_WEB_URL):
+                self.status_update.emit("Opening WhatsApp Web...")
+                self.driver.get(WHATSAPP_WEB_URL)
+            return True
+
+        except Exception as e:
+            error_msg = f"Login failed: {str(e)}"
+            logger.error(error_msg)
+            self.error_occurred.emit(error_msg)
+            return False
+
+    def poll_login(self) -> bool:
+        """Check once, without waiting, whether the session is logged in."""
+        if self.is_logged_in:
+            return True
+        try:
+            found = bool(self.driver and self.driver.find_elements(By.XPATH, LOGIN_CHECK_XPATH))
+        except WebDriverException:
+            return False
+        if found:
+            self.is_logged_in = True
+            self.session_probe.record(True)
+            self.logged_in.emit()
+            self.status_update.emit("Successfully logged in to WhatsApp Web")
+            logger.info(f"Logged in ({'headless' if self.current_headless_mode else 'GUI'} browser)")
+        return found
+
+    def qr_code_image(self) -> Optional[Tuple[str, bytes]]:
+        """The login QR code as (pairing ref, PNG bytes), or None while it is not on screen.
+
+        The ref changes whenever WhatsApp rotates the code, so callers only need to
+        redraw when it differs from the last one.
+        """
+        captured = self._capture_qr(as_matrix=False)
+        if not captured or not captured[1]:
+            return None
+        ref, data_url = captured[0], captured[1]
+        return ref, base64.b64decode(data_url.split(",", 1)[1])
+
+    def qr_code_matrix(self) -> Optional[Tuple[str, List[str]]]:
+        """The login QR code as (pairing ref, rows of "1"/"0" modules) for text rendering."""
+        captured = self._capture_qr(as_matrix=True)
+        if not captured or not captured[2]:
+            return None
+        return captured[0], captured[2]
+
+    def _capture_qr(self, as_matrix: bool):
+        if not self.driver:
+            return None
+        try:
+            return self.driver.execute_script(QR_CAPTURE_SCRIPT, QR_CODE_XPATH, as_matrix)
+        except WebDriverException as e:
+            logger.debug(f"Could not capture the QR code: {str(e)}")
+            return None
+
+    def normalize_phone(self, phone_number: str, country_code: str = "") -> str:
         cleaned_number = ''.join(filter(str.isdigit, phone_number))
+        country_code = ''.join(filter(str.isdigit, country_code))
 
         if country_code and not cleaned_number.startswith(country_code):
             cleaned_number = country_code + cleaned_number
 
-        return f"https://web.whatsapp.com/send?phone={cleaned_number}&type=phone_number&app_absent=0"
+        return cleaned_number
+
+    def construct_message_url(self, phone_number: str, country_code: str = "") -> str:
+        cleaned_number = self.normalize_phone(phone_number, country_code)
+        return f"{WHATSAPP_WEB_URL}/send?phone={cleaned_number}&type=phone_number&app_absent=0"
+
+    def open_chat(self, contact: Contact, phone: str):
+        """Open the chat with a contact and return its message input box.
+
+        Args:
+            contact: The contact, its name is used to double check the opened chat
+            phone: The normalized phone number (see normalize_phone)
+
+        In in-app mode the chat is looked up through the search bar of the already
+        loaded page; the /send URL route (a full page reload) is only used when
+        that lookup fails. Numbers the registration cache does not know as being on
+        WhatsApp have never been sent to from this app and rarely have a chat to
+        find, so they take the URL route directly, which also recognises an
+        invalid number as soon as WhatsApp says so.
+        """
+        started = time.perf_counter()
+        message_box = None
+        mode = NAVIGATION_MODE_URL
+        registered = self.registration_cache.get(phone)
+
+        if (self.navigation_mode == NAVIGATION_MODE_IN_APP and registered is True
+                and self._is_whatsapp_loaded()):
+            with self.metrics.span("navigation", mode=NAVIGATION_MODE_IN_APP):
+                message_box = self._open_chat_in_app(contact, phone)
+            if message_box is not None:
+                mode = NAVIGATION_MODE_IN_APP
+
+        if message_box is None:
+            message_box = self._open_chat_by_url(phone)
+        # A read is cheap, a write is a commit: only write what is missing or expired
+        if registered is not True:
+            self.registration_cache.record(phone, True)
+
+        elapsed = time.perf_counter() - started
+        stats = self.navigation_stats[mode]
+        stats[0] += 1
+        stats[1] += elapsed
+        logger.info(
+            f"Opened chat with {contact.phone} via {mode} in {elapsed:.2f}s "
+            f"(avg {stats[1] / stats[0]:.2f}s over {stats[0]} chats)"
+        )
+        return message_box
+
+    def average_open_time(self) -> float:
+        """Average seconds it took to open a chat so far, 2s before anything was measured."""
+        count = sum(stats[0] for stats in self.navigation_stats.values())
+        total = sum(stats[1] for stats in self.navigation_stats.values())
+        return total / count if count else 2.0
+
+    def _is_whatsapp_loaded(self) -> bool:
+        try:
+            return (self.driver.current_url.startswith(WHATSAPP_WEB_URL)
+                    and bool(self.driver.find_elements(By.XPATH, LOGIN_CHECK_XPATH)))
+        except WebDriverException:
+            return False
+
+    def _open_chat_in_app(self, contact: Contact, number: str):
+        """Search for the contact in the chat list and open it without reloading the page."""
+        wait = self._wait(IN_APP_LOOKUP_TIMEOUT)
+
+        try:
+            search_box = wait.until(EC.element_to_be_clickable((By.XPATH, SEARCH_BAR_INPUT_XPATH)))
+            search_box.click()
+            search_box.send_keys(Keys.CONTROL + "a", Keys.BACKSPACE)
+
+            # The chat list is re-rendered once the search applies, so wait for the
+            # old first row (or the empty-search text) to go away before picking a result
+            previous_rows = self.driver.find_elements(By.XPATH, f"{SEARCH_RESULT_XPATH} | {SEARCH_NO_RESULTS_XPATH}")
+            search_box.send_keys(number)
+            if previous_rows:
+                wait.until(EC.staleness_of(previous_rows[0]))
+
+            # A number without a chat or contact shows the empty-search text right away,
+            # no need to wait out the timeout before taking the URL route
+            name, result = self.selectors.race(
+                self.driver, ("search_result", "search_no_results"), IN_APP_LOOKUP_TIMEOUT
+            )
+            if name == "search_no_results":
+                logger.info(f"No chat with {number} in the chat list, falling back to URL route")
+                return None
+            result.click()
+
+            with self.metrics.span("composer_wait", mode=NAVIGATION_MODE_IN_APP) as span:
+                message_box = self.selectors.find(self.driver, "message_input", IN_APP_LOOKUP_TIMEOUT)
+                if span is not None:
+                    span.update(element="message_input", selector=self.selectors.winner("message_input"))
+
+            # Make sure the search did not land on some other chat before typing into it
+            title = self.driver.find_element(By.XPATH, CHAT_HEADER_TITLE_XPATH).text
+            title_digits = ''.join(filter(str.isdigit, title))
+            if not ((len(title_digits) >= 7 and number.endswith(title_digits[-7:]))
+                    or (contact.name and contact.name.strip().lower() == title.strip().lower())):
+                logger.info(f"In-app lookup for {number} opened '{title}', falling back to URL route")
+                return None
+
+            return message_box
+
+        except (TimeoutException, WebDriverException) as e:
+            logger.info(f"In-app lookup for {number} failed, falling back to URL route: {type(e).__name__}")
+            return None
+
+    def _open_chat_by_url(self, phone: str):
+        """Load the /send route and return the composer.
+
+        The composer is raced against the invalid-number popup and the offline
+        banner, so a number without WhatsApp is known as soon as the popup shows
+        instead of after DEFAULT_TIMEOUT.
+
+        Raises:
+            ChatOpenError: if the number is not on WhatsApp or the page is offline
+        """
+        with self.metrics.span("navigation", mode=NAVIGATION_MODE_URL):
+            self.driver.get(self.construct_message_url(phone))
+
+        with self.metrics.span("composer_wait") as span:
+            name, element = self.selectors.race(
+                self.driver, ("message_input", "invalid_number", "offline_banner"), DEFAULT_TIMEOUT
+            )
+            if span is not None:
+                span.update(element=name, selector=self.selectors.winner(name))
+        if name == "invalid_number":
+            self.registration_cache.record(phone, False)
+            self._dismiss_popup()
+            raise ChatOpenError(SEND_FAILURE_NOT_ON_WHATSAPP, phone)
+        if name == "offline_banner":
+            try:
+                return self.selectors.find(self.driver, "message_input", OFFLINE_GRACE_PERIOD)
+            except TimeoutException:
+                raise ChatOpenError(SEND_FAILURE_OFFLINE, phone)
+        return element
+
+    def _dismiss_popup(self):
+        """Close a modal popup so the page accepts the next chat."""
+        try:
+            self.driver.find_element(By.XPATH, POPUP_CONFIRM_BUTTON_XPATH).click()
+            self._wait(COMPOSER_READY_TIMEOUT).until(
+                EC.invisibility_of_element_located((By.XPATH, POPUP_CONFIRM_BUTTON_XPATH))
+            )
+        except (TimeoutException, WebDriverException) as e:
+            logger.warning(f"Could not dismiss popup: {type(e).__name__}")
+
+    def check_registration(self, phone: str) -> Optional[bool]:
+        """Open the chat for a normalized number without sending, to learn whether it is on WhatsApp.
+
+        Returns None if the page was offline or neither outcome showed up in time.
+        The result is stored in the registration cache.
+        """
+        try:
+            self._open_chat_by_url(phone)
+        except ChatOpenError as e:
+            return False if e.reason == SEND_FAILURE_NOT_ON_WHATSAPP else None
+        except (TimeoutException, WebDriverException) as e:
+            logger.info(f"Could not check {phone}: {type(e).__name__}")
+            return None
+        self.registration_cache.record(phone, True)
+        return True
+
+    def wait_until_online(self, timeout: float = OFFLINE_RECOVERY_TIMEOUT) -> bool:
+        """Wait for the offline banner to go away. Returns False if it is still shown."""
+        try:
+            self._wait(timeout).until(EC.invisibility_of_element_located((By.XPATH, OFFLINE_BANNER_XPATH)))
+            return True
+        except TimeoutException:
+            return False
+        except WebDriverException:
+            return False
+
+    def maybe_recycle(self) -> bool:
+        """Call between contacts: relaunch the browser if the memory governor asks for it.
+
+        Elements found before a relaunch are gone. If the relaunch fails, the watchdog
+        gets one more try. Returns False if there is still no usable browser after
+        that, in which case the run should stop.
+        """
+        if not self.driver:
+            return True
+        self.drain_network_log()
+        reason = self.memory_governor.after_message(self.driver)
+        if reason is None or self.recycle_driver(reason):
+            return True
+        return self.watchdog.recover("recycled browser did not come back")
+
+    def recycle_driver(self, reason: str) -> bool:
+        """Quit and relaunch the driver on the same profile, keeping the login.
+
+        The relaunch uses the configured headless setting, so a change made
+        while the browser was running applies here.
+        """
+        started = time.perf_counter()
+        logger.info(f"Recycling browser (#{self.memory_governor.recycles + 1}): {reason}")
+        self.status_update.emit(f"Restarting browser to free memory ({reason})...")
+
+        headless = self.headless_enabled
+        self.drain_network_log()
+        try:
+            self.driver.quit()
+        except WebDriverException as e:
+            logger.warning(f"Error quitting browser before recycling: {str(e)}")
+        if not self._relaunch(headless):
+            logger.error(f"Browser could not be relaunched after recycling ({reason})")
+            return False
+        self.memory_governor.recycles += 1
+        logger.info(f"Browser recycled in {time.perf_counter() - started:.1f}s")
+        return True
+
+    def switch_browser_mode(self) -> bool:
+        """Relaunch the running browser in the configured headless mode, keeping the login."""
+        mode = "headless" if self.headless_enabled else "visible"
+        logger.info(f"Headless mode changed from {self.current_headless_mode} to {self.headless_enabled}, "
+                    f"relaunching the browser")
+        self.status_update.emit(f"Switching to a {mode} browser...")
+        self.drain_network_log()
+        try:
+            self.driver.quit()
+        except WebDriverException as e:
+            logger.warning(f"Error quitting browser before switching mode: {str(e)}")
+        if not self._relaunch(self.headless_enabled):
+            logger.error(f"Session not restored in the {mode} browser")
+            return False
+        self.status_update.emit(f"Running in a {mode} browser")
+        return True
+
+    def restart_after_crash(self, reason: str) -> bool:
+        """Kill an unresponsive browser and relaunch it on the same profile, in the configured mode."""
+        self.status_update.emit(f"Browser {reason}, restarting...")
+        if self.driver:
+            kill_browser(self.driver)
+        return self._relaunch(self.headless_enabled)
+
+    def _relaunch(self, headless: bool) -> bool:
+        self.driver = None
+        self.is_logged_in = False
+        if not self.initialize_driver(use_headless=headless):
+            return False
+        try:
+            self.driver.get(WHATSAPP_WEB_URL)
+            WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
+                EC.presence_of_element_located((By.XPATH, LOGIN_CHECK_XPATH))
+            )
+        except TimeoutException:
+            self.session_probe.record(False)
+            logger.error("Session not restored after relaunching the browser")
+            return False
+
+        self.is_logged_in = True
+        self.session_probe.record(True)
+        return True
 
     def restart_in_headless(self) -> bool:
         """Restart the driver in headless mode after login."""
+        if self.driver and self.is_logged_in and self.current_headless_mode:
+            return True  # Logged in through the in-app QR dialog, nothing to restart
         try:
             # Close current driver
             if self.driver:
@@ -191,15 +778,19 @@ class WhatsAppService(QObject):
                 return False
 
             # Verify we're still logged in
+            started = time.perf_counter()
             self.driver.get(WHATSAPP_WEB_URL)
             wait = WebDriverWait(self.driver, 10)
             wait.until(EC.presence_of_element_located((By.XPATH, LOGIN_CHECK_XPATH)))
+            self._log_page_ready(started)
 
             self.is_logged_in = True
+            self.session_probe.record(True)
             self.status_update.emit("Successfully switched to headless mode")
             return True
 
         except TimeoutException:
+            self.session_probe.record(False)
             self.error_occurred.emit("Session not found in headless mode. Please disable headless mode or try logging in again.")
             return False
         except Exception as e:
@@ -210,13 +801,31 @@ class WhatsAppService(QObject):
         """Prepare the driver for messaging, handling headless mode if enabled."""
         # If headless is enabled and we have a session, use headless
         if self.headless_enabled:
+            if self.driver and self.is_logged_in and self.current_headless_mode:
+                return True
+
             # Check if session exists
             if self.check_session_exists():
-                # Session exists, start in headless
+                # Session exists, start in headless and let the real driver confirm it
+                if self.driver:
+                    self.driver.quit()
+                    self.driver = None
                 if not self.initialize_driver(use_headless=True):
                     return False
+                started = time.perf_counter()
                 self.driver.get(WHATSAPP_WEB_URL)
+                try:
+                    WebDriverWait(self.driver, 10).until(
+                        EC.presence_of_element_located((By.XPATH, LOGIN_CHECK_XPATH))
+                    )
+                    self._log_page_ready(started)
+                except TimeoutException:
+                    self.session_probe.record(False)
+                    self.driver.quit()
+                    self.driver = None
+                    return False  # Caller should handle login flow
                 self.is_logged_in = True
+                self.session_probe.record(True)
                 self.status_update.emit("Running in headless mode with existing session")
                 return True
             else:
@@ -228,19 +837,19 @@ class WhatsAppService(QObject):
                 return False
             return True
 
-    def send_message(self, contact: Contact, message: Message, country_code: str = "") -> bool:
-        # Debug output
-        logger.info(f"send_message called - headless_enabled: {self.headless_enabled}, is_logged_in: {self.is_logged_in}, current_headless_mode: {self.current_headless_mode}")
+    @timed("ensure_session")
+    def ensure_session(self) -> bool:
+        """Make sure a logged-in driver in the configured mode is available."""
+        self.wait_for_warmup()
 
-        # Check if we need to restart the driver due to headless mode change
-        if self.is_logged_in and self.driver and (self.current_headless_mode != self.headless_enabled):
-            logger.info(f"Headless mode changed from {self.current_headless_mode} to {self.headless_enabled}, restarting driver...")
-            self.status_update.emit(f"Switching to {'headless' if self.headless_enabled else 'GUI'} mode...")
+        # Debug output
+        logger.info(f"ensure_session called - headless_enabled: {self.headless_enabled}, is_logged_in: {self.is_logged_in}, current_headless_mode: {self.current_headless_mode}")
 
-            # Close current driver
-            self.driver.quit()
-            self.driver = None
-            self.is_logged_in = False  # Need to re-verify login
+        # A changed headless setting is applied between sends by relaunching on the same profile
+        if self.is_logged_in and self.driver and self.current_headless_mode != self.headless_enabled:
+            if not self.switch_browser_mode() and self.headless_enabled:
+                self.error_occurred.emit("No valid session found for headless mode. Please login first.")
+                return False
 
         # Ensure we're logged in - handle headless mode properly
         if not self.is_logged_in:
@@ -249,18 +858,26 @@ class WhatsAppService(QObject):
                 self.status_update.emit("Starting in headless mode...")
                 logger.info("Attempting to start in headless mode")
 
+                if self.driver:
+                    self.driver.quit()
+                    self.driver = None
+
                 if not self.initialize_driver(use_headless=True):
                     self.error_occurred.emit("Failed to start headless browser")
                     return False
 
                 try:
+                    started = time.perf_counter()
                     self.driver.get(WHATSAPP_WEB_URL)
                     wait = WebDriverWait(self.driver, 10)
                     wait.until(EC.presence_of_element_located((By.XPATH, LOGIN_CHECK_XPATH)))
+                    self._log_page_ready(started)
                     self.is_logged_in = True
+                    self.session_probe.record(True)
                     self.status_update.emit("✅ Running in headless mode")
                     logger.info("Successfully started in headless mode with existing session")
                 except TimeoutException:
+                    self.session_probe.record(False)
                     logger.warning("No valid session found for headless mode")
                     self.error_occurred.emit("No valid session found for headless mode. Please login first.")
                     return False
@@ -276,116 +893,295 @@ class WhatsAppService(QObject):
                     self.error_occurred.emit("Must be logged in to send messages")
                     return False
 
+        return True
+
+    def send_message(self, contact: Contact, message: Message, country_code: str = "") -> bool:
+        if not self.ensure_session():
+            return False
+        return self.send_prepared(self.prepare_send(contact, message, country_code))
+
+    def prepare_send(self, contact: Contact, message: Message, country_code: str = "") -> PreparedSend:
+        """Do the browser independent work for a send: personalization, number and attachment checks."""
+        attachments = []
+        for attachment in message.attachments:
+            if not Path(attachment.file_path).is_file():
+                logger.warning(f"Skipping missing attachment for {contact.phone}: {attachment.file_path}")
+                continue
+            # Upload the downscaled copy; already processed files are answered from memory
+            resolved = self.media_cache.resolve(attachment)
+            if resolved is not None:
+                attachments.append(resolved)
+
+        phone = self.normalize_phone(contact.phone, country_code)
+        return PreparedSend(
+            contact=contact,
+            message=message,
+            text=message.get_personalized_text(contact.name, contact.phone),
+            phone=phone,
+            attachments=attachments,
+            # Known from an earlier check or send, skipped without opening the chat
+            failure=SEND_FAILURE_NOT_ON_WHATSAPP if self.registration_cache.is_unregistered(phone) else ""
+        )
+
+    def preopen_chat(self, prepared: PreparedSend):
+        """Open the chat for an upcoming send, e.g. while waiting out the pacing delay.
+
+        Returns the message input, or None if the chat could not be opened; the
+        send itself will then retry.
+        """
+        if prepared.failure == SEND_FAILURE_NOT_ON_WHATSAPP:
+            return None
         try:
-            personalized_text = message.get_personalized_text(contact.name)
+            return self.open_chat(prepared.contact, prepared.phone)
+        except ChatOpenError as e:
+            # Remembered so the send skips a number without WhatsApp right away
+            if e.reason == SEND_FAILURE_NOT_ON_WHATSAPP:
+                prepared.failure = e.reason
+            logger.info(f"Could not pre-open chat with {prepared.contact.phone}: {e.reason}")
+            return None
+        except Exception as e:
+            logger.info(f"Could not pre-open chat with {prepared.contact.phone}: {str(e)}")
+            return None
 
-            url = self.construct_message_url(contact.phone, country_code)
-            self.status_update.emit(f"Sending message to {contact.name} ({contact.phone})...")
+    def send_prepared(self, prepared: PreparedSend, message_box=None) -> bool:
+        with self.metrics.span("send_total"):
+            sent_before = self.submit_prepared(prepared, message_box)
+            if sent_before is not None:
+                self.confirm_sent(prepared, sent_before)
+        self.record_outcome(prepared, sent_before is not None)
+        return sent_before is not None
 
-            self.driver.get(url)
+    def record_outcome(self, prepared: PreparedSend, success: bool):
+        self.metrics.count("send_attempts", outcome="sent" if success else prepared.failure or "error")
 
-            wait = WebDriverWait(self.driver, DEFAULT_TIMEOUT)
+    def submit_prepared(self, prepared: PreparedSend, message_box=None) -> Optional[int]:
+        """Open the chat, compose the message and press send.
 
-            # Try primary message input selector first, then fallback
-            try:
-                message_box = wait.until(
-                    EC.element_to_be_clickable((By.XPATH, MESSAGE_INPUT_XPATH))
-                )
-            except TimeoutException:
-                self.status_update.emit("Trying fallback selector for message input...")
-                message_box = wait.until(
-                    EC.element_to_be_clickable((By.XPATH, MESSAGE_INPUT_XPATH_FALLBACK))
-                )
+        Returns the number of outgoing bubbles before sending, to be handed to
+        confirm_sent(), or None if the send failed.
+        """
+        contact = prepared.contact
+        if prepared.failure == SEND_FAILURE_NOT_ON_WHATSAPP:
+            self._report_not_on_whatsapp(contact)
+            return None
+        prepared.failure = ""
+        try:
+            personalized_text = prepared.text
+
+            self.status_update.emit(f"Sending message to {contact.name} ({contact.phone})...")
 
-            time.sleep(1)
+            if message_box is not None and not self._is_attached(message_box):
+                message_box = None
+            if message_box is None:
+                message_box = self.open_chat(contact, prepared.phone)
 
             # TODO: Implement attachment sending when ATTACHMENT_BUTTON_XPATH is found
-            if message.has_attachments():
-                self._send_attachments(message.attachments)
-                time.sleep(1)
+            if prepared.attachments:
+                with self.metrics.span("attachment_upload", files=len(prepared.attachments)):
+                    self._send_attachments(prepared.attachments)
+                    # The composer is re-rendered once the media preview closes
+                    message_box = self.selectors.find(self.driver, "message_input", COMPOSER_READY_TIMEOUT)
+
+            with self.metrics.span("text_entry", mode=self.text_entry_mode, chars=len(personalized_text)):
+                message_box.click()
+                try:
+                    self._wait(COMPOSER_READY_TIMEOUT).until(element_has_focus(message_box))
+                except TimeoutException:
+                    logger.warning("Message input did not report focus, typing anyway")
 
-            # Clear any existing text first
-            message_box.clear()
+                # Clear any existing text first
+                message_box.clear()
 
-            # Send message with proper line breaks
-            lines = personalized_text.split('\n')
-            for i, line in enumerate(lines):
-                message_box.send_keys(line)
-                if i < len(lines) - 1:
-                    message_box.send_keys(Keys.SHIFT + Keys.ENTER)
+                self._enter_text(message_box, personalized_text)
 
-            # Small delay to ensure message is typed
-            time.sleep(0.5)
+                # Wait for the editor to hold the text before sending
+                if personalized_text.strip():
+                    try:
+                        self._wait(COMPOSER_READY_TIMEOUT).until(element_has_text(message_box))
+                    except TimeoutException:
+                        logger.warning("Message input still looks empty, sending anyway")
 
-            # Try to find and click send button
-            try:
-                send_button = self.driver.find_element(By.XPATH, SEND_BUTTON_XPATH)
-                send_button.click()
-            except:
-                # Try media send button as fallback
+            sent_before = self.backend.count(OUTGOING_MESSAGE_XPATH)
+
+            # Click whichever send button is present, pressing Enter as a last resort
+            with self.metrics.span("send_click"):
                 try:
-                    send_button = self.driver.find_element(By.XPATH, MEDIA_SEND_BUTTON_XPATH)
-                    send_button.click()
-                except:
-                    # Last resort - press Enter
+                    self.selectors.find(self.driver, "send_button", SEND_BUTTON_TIMEOUT).click()
+                except (TimeoutException, WebDriverException):
                     message_box.send_keys(Keys.ENTER)
 
             self.message_sent.emit(contact.phone, True)
             self.status_update.emit(f"Message sent successfully to {contact.name}")
+            self._report_first_send()
 
-            time.sleep(2)
+            return sent_before
 
-            return True
+        except ChatOpenError as e:
+            prepared.failure = e.reason
+            if e.reason == SEND_FAILURE_NOT_ON_WHATSAPP:
+                self._report_not_on_whatsapp(contact)
+            else:
+                logger.warning(f"WhatsApp Web is offline, could not send to {contact.phone}")
+                self.message_sent.emit(contact.phone, False)
+                self.error_occurred.emit(f"WhatsApp Web is offline, message to {contact.name} not sent")
+            return None
 
         except Exception as e:
             error_msg = f"Failed to send message to {contact.name}: {str(e)}"
             logger.error(error_msg)
             self.message_sent.emit(contact.phone, False)
             self.error_occurred.emit(error_msg)
+            return None
+
+    def _report_first_send(self):
+        if self.app_started is None:
+            return
+        logger.info(f"Time to first message sent: {time.perf_counter() - self.app_started:.1f}s after app start "
+                    f"(standby browser {'on' if self.prewarmed else 'off'})")
+        self.app_started = None  # Reported once
+
+    def _report_not_on_whatsapp(self, contact: Contact):
+        logger.info(f"{contact.phone} is not on WhatsApp")
+        self.message_sent.emit(contact.phone, False)
+        self.status_update.emit(f"{contact.name} ({contact.phone}) is not on WhatsApp, skipped")
+
+    def confirm_sent(self, prepared: PreparedSend, sent_before: int):
+        """Wait for the outgoing bubble of a submitted message and start tracking its ticks."""
+        phone = prepared.contact.phone
+        try:
+            with self.metrics.span("post_send_settle"):
+                self._wait(SEND_CONFIRM_TIMEOUT).until(
+                    element_count_increased(OUTGOING_MESSAGE_XPATH, sent_before, self.backend.count)
+                )
+        except TimeoutException:
+            logger.warning(f"No outgoing message bubble appeared for {phone} "
+                           f"within {SEND_CONFIRM_TIMEOUT}s")
+        except WebDriverException as e:
+            logger.warning(f"Could not confirm the message to {phone}: {str(e)}")
+
+        self.delivery_tracker.track(self.driver, phone)
+
+    def _is_attached(self, element) -> bool:
+        try:
+            return element.is_displayed()
+        except WebDriverException:
             return False
 
-    def _send_attachments(self, attachments: List[Attachment]):
-        """
-        Need to find:
-        1. ATTACHMENT_BUTTON_XPATH - The paperclip/attachment button
-        2. File input element after clicking attachment
-        3. Send button for attachments
-        """
+    def _enter_text(self, message_box, text: str):
+        if not text:
+            return
+        if self.text_entry_mode == TEXT_ENTRY_MODE_INJECT and self._inject_text(message_box, text):
+            return
+        self._type_text(message_box, text)
+
+    def _inject_text(self, message_box, text: str) -> bool:
+        """Insert the whole text in a single script call. Returns False if the editor rejected it."""
+        try:
+            self.backend.insert_text(message_box, text)
+        except WebDriverException as e:
+            logger.warning(f"Text injection failed, falling back to typing: {str(e)}")
+            self._clear_composer(message_box)
+            return False
+
+        # The editor renders the pasted text asynchronously
+        try:
+            self._wait(COMPOSER_READY_TIMEOUT).until(element_has_text(message_box))
+        except TimeoutException:
+            if element_has_text(message_box)(self.driver):
+                return True  # Landed just after the wait gave up
+            logger.warning("Text injection left the message input empty, falling back to typing")
+            # Typing on top of an injection that lands late would send the text twice
+            self._clear_composer(message_box)
+            return False
+        return True
 
+    def _clear_composer(self, message_box):
         try:
-            wait = WebDriverWait(self.driver, DEFAULT_TIMEOUT)
+            message_box.send_keys(Keys.CONTROL + "a", Keys.DELETE)
+        except WebDriverException as e:
+            logger.warning(f"Could not clear the message input: {str(e)}")
+
+    def _type_text(self, message_box, text: str):
+        if any(ord(char) > 0xFFFF for char in text):
+            logger.warning("Message contains characters outside the BMP (e.g. emoji) "
+                           "that ChromeDriver cannot type")
+
+        # Send message with proper line breaks
+        lines = text.split('\n')
+        for i, line in enumerate(lines):
+            message_box.send_keys(line)
+            if i < len(lines) - 1:
+                message_box.send_keys(Keys.SHIFT + Keys.ENTER)
+
+    def _wait(self, timeout: float) -> WebDriverWait:
+        return WebDriverWait(self.driver, timeout, poll_frequency=WAIT_POLL_INTERVAL)
+
+    def _send_attachment_batch(self, attachments: List[Attachment], file_input_locator):
+        """Upload several files through one file input so they land in a single preview tray."""
+        attachment_button = WebDriverWait(self.driver, DEFAULT_TIMEOUT).until(
+            EC.element_to_be_clickable((By.XPATH, ATTACHMENT_ADD_BUTTON_XPATH))
+        )
+        attachment_button.click()
+
+        self._wait(ATTACHMENT_MENU_TIMEOUT).until(EC.presence_of_element_located(file_input_locator))
+        self.backend.set_files(file_input_locator, [str(Path(a.file_path).absolute()) for a in attachments])
 
-            attachment_button = wait.until(
-                EC.element_to_be_clickable((By.XPATH, ATTACHMENT_ADD_BUTTON_XPATH))
+        # The send button only becomes clickable once the upload preview has rendered
+        send_attachment_button = self._wait(ATTACHMENT_PREVIEW_TIMEOUT).until(
+            EC.element_to_be_clickable((By.XPATH, MEDIA_SEND_BUTTON_XPATH))
+        )
+
+        for index, attachment in enumerate(attachments):
+            if not attachment.caption:
+                continue
+            if len(attachments) > 1:
+                # Select the file in the tray so the caption box belongs to it
+                thumbnails = self.driver.find_elements(By.XPATH, MEDIA_PREVIEW_THUMBNAIL_XPATH)
+                if index >= len(thumbnails):
+                    logger.warning(f"No preview thumbnail for {attachment.file_path}, caption skipped")
+                    continue
+                thumbnails[index].click()
+            caption_box = self._wait(COMPOSER_READY_TIMEOUT).until(
+                EC.element_to_be_clickable((By.XPATH, MEDIA_CAPTION_INPUT_XPATH))
             )
+            caption_box.click()
+            self._enter_text(caption_box, attachment.caption)
 
-            for attachment in attachments:
-                attachment_button.click()
-                time.sleep(1)
-
-                if Path(attachment.file_path).exists():
-                    if attachment.media_type == MediaType.Document:
-                        file_input = self.driver.find_element(By.CSS_SELECTOR, 'input[type="file"]')
-                    elif attachment.media_type == MediaType.Image or attachment.media_type == MediaType.Video:
-                        file_input = self.driver.find_element(By.XPATH, "//input[@type='file'][contains( @ accept, 'image/*')]")
-                    else:
-                        continue
-                    file_input.send_keys(str(Path(attachment.file_path).absolute()))
-                    time.sleep(1)
-
-                send_attachment_button = wait.until(
-                    EC.element_to_be_clickable((By.XPATH, MEDIA_SEND_BUTTON_XPATH))
-                )
-                send_attachment_button.click()
-                time.sleep(1)
+        send_attachment_button.click()
+        self._wait(ATTACHMENT_PREVIEW_TIMEOUT).until(
+            EC.invisibility_of_element_located((By.XPATH, MEDIA_SEND_BUTTON_XPATH))
+        )
+
+    def _send_attachments(self, attachments: List[Attachment]):
+
+        try:
+            started = time.perf_counter()
+
+            # Images and videos share one preview tray, documents need a second one
+            media = [a for a in attachments if a.media_type in (MediaType.Image, MediaType.Video)]
+            documents = [a for a in attachments if a.media_type == MediaType.Document]
+
+            batches = 0
+            for group, file_input_locator in (
+                (media, (By.XPATH, MEDIA_FILE_INPUT_XPATH)),
+                (documents, (By.CSS_SELECTOR, DOCUMENT_FILE_INPUT_CSS)),
+            ):
+                if group:
+                    self._send_attachment_batch(group, file_input_locator)
+                    batches += 1
+
+            if batches:
+                elapsed = time.perf_counter() - started
+                saved = elapsed / batches * (len(media) + len(documents) - batches)
+                logger.info(f"Sent {len(media) + len(documents)} attachments in {batches} batch(es) "
+                            f"in {elapsed:.2f}s, about {saved:.1f}s saved compared to one upload per file")
 
         except Exception as e:
             logger.error(f"Failed to send attachments: {str(e)}")
             raise
 
-
     def send_bulk_messages(self, contacts: List[Contact], message: Message,
-                          country_code: str = "", delay: int = 5):
+                          country_code: str = "", delay: float = 5):
         if not contacts:
             self.error_occurred.emit("No contacts provided")
             return
@@ -393,9 +1189,12 @@ class WhatsAppService(QObject):
         total = len(contacts)
         successful = 0
         failed = 0
+        self.rate_limiter.configure(RateLimit(interval=delay))
 
         for i, contact in enumerate(contacts):
-            if self._stop_requested:
+            with self.metrics.span("pacing"):
+                paced = not self._stop_requested and self.rate_limiter.acquire(lambda: self._stop_requested)
+            if not paced:
                 self.status_update.emit("Bulk sending stopped by user")
                 break
 
@@ -407,20 +1206,34 @@ class WhatsAppService(QObject):
             else:
                 failed += 1
 
-            if i < total - 1:
-                time.sleep(delay)
-
+        logger.info(f"Pacing: {self.rate_limiter.summary()}")
+        self.export_metrics()
         self.progress_update.emit(100)
         self.status_update.emit(
             f"Bulk sending completed: {successful} successful, {failed} failed"
         )
 
+    def export_metrics(self):
+        """Log the per-stage timings of the run and refresh the Prometheus file, if metrics are on."""
+        if not self.metrics.enabled:
+            return
+        logger.info("Send stage timings:\n" + self.metrics.summary())
+        try:
+            logger.info(f"Send metrics written to {self.metrics.write_prometheus()}")
+        except OSError as e:
+            logger.warning(f"Could not write send metrics: {str(e)}")
+
     def stop_bulk_sending(self):
         self._stop_requested = True
 
     def close(self):
+        if self._backend is not None:
+            self._backend.close()
+            self._backend = None
+            self._backend_key = None
         if self.driver:
             try:
+                self.drain_network_log()
                 self.driver.quit()
                 self.driver = None
                 self.is_logged_in = False
@@ -432,46 +1245,197 @@ class WhatsAppService(QObject):
         self.close()
 
 
+def announce_wait(limiter: RateLimiter, emit):
+    """Tell the user when a cap holds the next send back for more than a minute."""
+    wait = limiter.wait_time()
+    if wait > 60:
+        resume = time.strftime("%H:%M", time.localtime(time.time() + wait))
+        emit(f"Send cap reached, resuming at {resume}")
+
+
+class DriverWarmupWorker(QThread):
+    finished_warmup = pyqtSignal(bool)
+
+    def __init__(self, service: WhatsAppService):
+        super().__init__()
+        self.service = service
+        # Block senders right away, not only once the thread gets scheduled
+        self.service._warmup_done.clear()
+
+    def run(self):
+        self.finished_warmup.emit(self.service.prewarm())
+
+
 class BulkSendWorker(QThread):
     status_update = pyqtSignal(str)
     progress_update = pyqtSignal(int)
     message_sent = pyqtSignal(str, bool)
+    stage_update = pyqtSignal(str)
+    delivery_update = pyqtSignal(str, str)
     completed = pyqtSignal(int, int)
 
     def __init__(self, service: WhatsAppService, contacts: List[Contact],
-                 message: Message, country_code: str = "", delay: int = 5):
+                 message: Message, country_code: str = "", rate_limit: Optional[RateLimit] = None,
+                 delivery_horizon: float = DEFAULT_DELIVERY_WAIT_HORIZON):
         super().__init__()
         self.service = service
         self.contacts = contacts
         self.message = message
         self.country_code = country_code
-        self.delay = delay
+        self.rate_limit = rate_limit or RateLimit()
+        self.delivery_horizon = delivery_horizon
+        self.delivery_results: Dict[str, str] = {}
         self._stop_requested = False
+        self.stages = StageTimer()
+        self.crash_restarts = 0
+        self.crash_downtime = 0.0
+        self.pacing_summary = ""
+        self.not_on_whatsapp: List[str] = []
+
+    def _prepare(self, index: int) -> PreparedSend:
+        with self.stages.measure("preparing (background)"):
+            return self.service.prepare_send(self.contacts[index], self.message, self.country_code)
+
+    def _send(self, prepared: PreparedSend, preopened=None) -> bool:
+        """Send one contact, retrying it if the browser crashed while it was in flight."""
+        for attempt in range(MAX_CRASH_RETRIES + 1):
+            driver = self.service.driver
+            ready = self.service.ensure_session()
+            if self.service.driver is not driver:
+                preopened = None  # Opened in a browser that ensure_session relaunched
+            if ready and self.service.send_prepared(prepared, preopened):
+                return True
+            if prepared.failure == SEND_FAILURE_NOT_ON_WHATSAPP:
+                self.not_on_whatsapp.append(prepared.contact.phone)
+                break
+            if attempt == MAX_CRASH_RETRIES or self._stop_requested:
+                break
+            preopened = None
+            if prepared.failure == SEND_FAILURE_OFFLINE:
+                self.status_update.emit("WhatsApp Web is offline, waiting for the connection...")
+                with self.stages.measure("waiting for connection"):
+                    if not self.service.wait_until_online():
+                        break
+                self.status_update.emit(f"Connection back, retrying {prepared.contact.phone}")
+                continue
+            with self.stages.measure("restarting crashed browser"):
+                if not self.service.watchdog.handle_failure():
+                    break
+            self.status_update.emit(f"Browser restarted, retrying {prepared.contact.phone}")
+        return False
+
+    def _watch_delivery(self, until: float):
+        """Poll delivery ticks of the chat that is still open until the given monotonic time."""
+        tracker = self.service.delivery_tracker
+        while not self._stop_requested:
+            for phone, status in tracker.poll(self.service.driver):
+                self.delivery_update.emit(phone, status)
+            if time.monotonic() >= until or not tracker.has_live_messages():
+                break
+            time.sleep(min(0.25, max(0.0, until - time.monotonic())))
 
     def run(self):
         total = len(self.contacts)
         successful = 0
         failed = 0
-
-        for i, contact in enumerate(self.contacts):
-            if self._stop_requested:
-                self.status_update.emit("Bulk sending stopped")
-                break
-
-            progress = int(((i + 1) / total) * 100)
-            self.progress_update.emit(progress)
-
-            if self.service.send_message(contact, self.message, self.country_code):
-                successful += 1
-                self.message_sent.emit(contact.phone, True)
-            else:
-                failed += 1
-                self.message_sent.emit(contact.phone, False)
-
-            if i < total - 1 and not self._stop_requested:
-                time.sleep(self.delay)
-
+        preopened = None  # Message box of a chat opened during the previous pacing delay
+        browser_lost = False
+        self.service.delivery_tracker.reset()
+        self.service.watchdog.reset()
+        self.service.network_meter.reset()
+        limiter = self.service.rate_limiter
+        limiter.configure(self.rate_limit)
+        logger.info(f"Pacing at {self.rate_limit.describe()}")
+
+        # Shrink attachments once here instead of uploading the originals to every contact
+        existing = [a for a in self.message.attachments if Path(a.file_path).is_file()]
+        if existing:
+            self.status_update.emit("Preparing attachments...")
+            with self.stages.measure("preprocessing attachments"):
+                self.service.media_cache.prepare_all(existing)
+
+        # Contact N+1 is prepared in the background while contact N is being sent,
+        # and its chat is opened while the pacing delay after N runs out.
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="bulk-prepare") as executor:
+            upcoming = executor.submit(self._prepare, 0) if total else None
+
+            for i, contact in enumerate(self.contacts):
+                if self._stop_requested:
+                    self.status_update.emit("Bulk sending stopped")
+                    break
+
+                progress = int(((i + 1) / total) * 100)
+                self.progress_update.emit(progress)
+
+                with self.stages.measure("waiting for preparation"):
+                    prepared = upcoming.result()
+                if i < total - 1:
+                    upcoming = executor.submit(self._prepare, i + 1)
+
+                if prepared.failure == SEND_FAILURE_NOT_ON_WHATSAPP:
+                    # Known from the registration cache: no browser work and no pacing slot
+                    self.service.record_outcome(prepared, False)
+                    failed += 1
+                    self.not_on_whatsapp.append(contact.phone)
+                    self.message_sent.emit(contact.phone, False)
+                    preopened = None
+                    continue
+
+                # The pacing interval runs from the start of the previous send
+                announce_wait(limiter, self.status_update.emit)
+                with self.stages.measure("pacing"), self.service.metrics.span("pacing"):
+                    if not limiter.acquire(lambda: self._stop_requested):
+                        self.status_update.emit("Bulk sending stopped")
+                        break
+
+                with self.stages.measure("sending"):
+                    success = self._send(prepared, preopened)
+                preopened = None
+
+                if success:
+                    successful += 1
+                    self.message_sent.emit(contact.phone, True)
+                else:
+                    failed += 1
+                    self.message_sent.emit(contact.phone, False)
+
+                if i < total - 1 and not self._stop_requested:
+                    pacing_ends = limiter.next_slot()
+                    if success:
+                        # Watch the ticks of the message just sent for as long as the
+                        # delay allows while still leaving time to open the next chat
+                        with self.stages.measure("watching delivery"):
+                            self._watch_delivery(pacing_ends - self.service.average_open_time())
+                    with self.stages.measure("recycling browser"):
+                        browser_lost = not self.service.maybe_recycle()
+                    if browser_lost:
+                        self.status_update.emit("Browser could not be restarted, bulk sending stopped")
+                        break
+                    if success:
+                        with self.stages.measure("opening next chat"):
+                            preopened = self.service.preopen_chat(upcoming.result())
+
+                self.stage_update.emit(self.stages.summary())
+
+        if successful and not self._stop_requested and not browser_lost:
+            with self.stages.measure("watching delivery"):
+                self._watch_delivery(time.monotonic() + self.delivery_horizon)
+        self.delivery_results = dict(self.service.delivery_tracker.statuses)
+        logger.info(f"Delivery status counts: {self.service.delivery_tracker.summary()}")
+
+        logger.info(f"Bulk send stage occupancy: {self.stages.summary()}")
+        logger.info("Selector statistics:\n" + self.service.selectors.summary())
+        logger.info(f"Watchdog: {self.service.watchdog.summary()}")
+        if self.not_on_whatsapp:
+            logger.info(f"Not on WhatsApp ({len(self.not_on_whatsapp)}): {', '.join(self.not_on_whatsapp)}")
+        self.pacing_summary = limiter.summary()
+        logger.info(f"Pacing: {self.pacing_summary}")
+        self.service.export_metrics()
+        self.crash_restarts = self.service.watchdog.restarts
+        self.crash_downtime = self.service.watchdog.downtime
+        if self.service.current_headless_mode:
+            self.status_update.emit(self.service.report_network_usage())
         self.completed.emit(successful, failed)
 
     def stop(self):
-        self._stop_requested = True
\ No newline at end of file
+        self._stop_requested = True
@@ -0,0 +1,253 @@
+import queue
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+from PyQt6.QtCore import QSettings, QThread, pyqtSignal
+from models.message import Message
+from models.contact import Contact
+from services.whatsapp_service import WhatsAppService, announce_wait
+from services.rate_limiter import RateLimit
+from services.send_pipeline import StageTimer
+from services.send_pipeline import PreparedSend
+from config import (
+    DEFAULT_DELIVERY_WAIT_HORIZON,
+    MAX_CRASH_RETRIES,
+    SEND_FAILURE_NOT_ON_WHATSAPP,
+    SEND_FAILURE_OFFLINE
+)
+
+logger = logging.getLogger(__name__)
+
+
+def worker_profile_name(index: int) -> str:
+    """Chrome profile used by the browser worker with the given index.
+
+    Worker 0 shares the main profile, every other worker has its own linked
+    session that needs a one-time QR scan.
+    """
+    return "chrome_profile" if index == 0 else f"chrome_profile_{index + 1}"
+
+
+class ParallelBulkSendWorker(QThread):
+    """Bulk sender that spreads contacts over several browsers.
+
+    Emits the same signals as BulkSendWorker so both can be driven by the same UI.
+    """
+    status_update = pyqtSignal(str)
+    progress_update = pyqtSignal(int)
+    message_sent = pyqtSignal(str, bool)
+    stage_update = pyqtSignal(str)
+    delivery_update = pyqtSignal(str, str)
+    completed = pyqtSignal(int, int)
+
+    def __init__(self, service: WhatsAppService, contacts: List[Contact],
+                 message: Message, country_code: str = "", rate_limit: Optional[RateLimit] = None,
+                 worker_count: int = 2,
+                 delivery_horizon: float = DEFAULT_DELIVERY_WAIT_HORIZON):
+        super().__init__()
+        self.service = service
+        self.contacts = contacts
+        self.message = message
+        self.country_code = country_code
+        self.rate_limit = rate_limit or RateLimit()
+        self.delivery_horizon = delivery_horizon
+        self.delivery_results: Dict[str, str] = {}
+        self.worker_count = max(1, min(worker_count, len(contacts)))
+        self._stop_requested = False
+        self._lock = threading.Lock()
+        self._done = 0
+        self._successful = 0
+        self._failed = 0
+        self._crash_retries: Dict[int, int] = {}
+        self.crash_restarts = 0
+        self.crash_downtime = 0.0
+        self.pacing_summary = ""
+        self.not_on_whatsapp: List[str] = []
+        self._pacing: List[str] = []
+        self.stages = StageTimer(lanes=self.worker_count)
+
+    def run(self):
+        total = len(self.contacts)
+        pending: queue.Queue = queue.Queue()
+        for contact in self.contacts:
+            pending.put(contact)
+
+        # Workers share the main service's media cache, so attachments are shrunk only once
+        existing = [a for a in self.message.attachments if Path(a.file_path).is_file()]
+        if existing:
+            self.status_update.emit("Preparing attachments...")
+            with self.stages.measure("preprocessing attachments"):
+                self.service.media_cache.prepare_all(existing)
+
+        self.status_update.emit(f"Starting {self.worker_count} browser workers for {total} contacts")
+
+        threads = []
+        for index in range(self.worker_count):
+            thread = threading.Thread(
+                target=self._worker_loop,
+                args=(index, pending, total),
+                name=f"bulk-send-worker-{index}",
+                daemon=True
+            )
+            threads.append(thread)
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        if self._stop_requested:
+            self.status_update.emit("Bulk sending stopped")
+        elif not pending.empty():
+            # Every worker gave up (e.g. no linked session), count the rest as failed
+            unsent = pending.qsize()
+            self._failed += unsent
+            self.status_update.emit(f"{unsent} contacts were not sent: no browser worker available")
+
+        logger.info(f"Parallel bulk send stage occupancy: {self.stages.summary()}")
+        if self.not_on_whatsapp:
+            logger.info(f"Not on WhatsApp ({len(self.not_on_whatsapp)}): {', '.join(self.not_on_whatsapp)}")
+        self.pacing_summary = "; ".join(self._pacing)
+        self.service.export_metrics()
+        self.completed.emit(self._successful, self._failed)
+
+    def _create_service(self, index: int) -> WhatsAppService:
+        if index == 0:
+            return self.service
+
+        service = WhatsAppService(profile_name=worker_profile_name(index), data_dir=self.service.data_dir,
+                                  registration_cache=self.service.registration_cache)
+        service.media_cache = self.service.media_cache
+        service.apply_settings(QSettings("WhatsAppAutomator", "Settings"))
+        service.text_entry_mode = self.service.text_entry_mode
+        service.status_update.connect(lambda text, n=index: self.status_update.emit(f"[Worker {n + 1}] {text}"))
+        service.error_occurred.connect(lambda text, n=index: self.status_update.emit(f"[Worker {n + 1}] Error: {text}"))
+        return service
+
+    def _worker_loop(self, index: int, pending: queue.Queue, total: int):
+        service: Optional[WhatsAppService] = None
+        try:
+            service = self._create_service(index)
+            service.delivery_tracker.reset()
+            service.watchdog.reset()
+            service.network_meter.reset()
+            # Every worker is its own account and gets its own bucket at the configured rate
+            service.rate_limiter.configure(self.rate_limit)
+            sent_by_worker = 0
+            browser_lost = False
+
+            if service is not self.service and not service.prepare_for_messaging():
+                self.status_update.emit(
+                    f"[Worker {index + 1}] No WhatsApp session for profile "
+                    f"'{service.profile_name}', worker not started"
+                )
+                return
+
+            while not self._stop_requested:
+                try:
+                    contact = pending.get_nowait()
+                except queue.Empty:
+                    break
+
+                with self.stages.measure("preparing"):
+                    prepared = service.prepare_send(contact, self.message, self.country_code)
+                if prepared.failure == SEND_FAILURE_NOT_ON_WHATSAPP:
+                    # Known from the registration cache: no browser work and no pacing slot
+                    service.record_outcome(prepared, False)
+                    with self._lock:
+                        self.not_on_whatsapp.append(contact.phone)
+                    self._record_result(contact, False, total)
+                    continue
+
+                # Per-account pacing, the pool as a whole sends worker_count times faster
+                announce_wait(service.rate_limiter,
+                              lambda text, n=index: self.status_update.emit(f"[Worker {n + 1}] {text}"))
+                with self.stages.measure("pacing"), service.metrics.span("pacing"):
+                    if not service.rate_limiter.acquire(lambda: self._stop_requested):
+                        pending.put(contact)
+                        break
+
+                with self.stages.measure("sending"):
+                    success = service.ensure_session() and service.send_prepared(prepared)
+                sent_by_worker += 1
+
+                if not success and prepared.failure == SEND_FAILURE_NOT_ON_WHATSAPP:
+                    with self._lock:
+                        self.not_on_whatsapp.append(contact.phone)
+                elif not success and self._should_retry(contact, service, prepared):
+                    # The browser had crashed or lost its connection, hand the contact back to the pool
+                    pending.put(contact)
+                    continue
+                self._record_result(contact, success, total)
+
+                for phone, status in service.delivery_tracker.poll(service.driver):
+                    self.delivery_update.emit(phone, status)
+
+                with self.stages.measure("recycling browser"):
+                    browser_lost = not service.maybe_recycle()
+                if browser_lost:
+                    # Whatever is left goes to the other workers
+                    self.status_update.emit(f"[Worker {index + 1}] Browser could not be restarted, worker stopped")
+                    break
+
+            if sent_by_worker and not self._stop_requested and not browser_lost:
+                service.delivery_tracker.wait_for_final(
+                    service.driver, self.delivery_horizon, on_change=self.delivery_update.emit
+                )
+            with self._lock:
+                self.delivery_results.update(service.delivery_tracker.statuses)
+
+            logger.info(f"Bulk worker {index + 1} finished after {sent_by_worker} messages, "
+                        f"selector statistics:\n{service.selectors.summary()}")
+            pacing = service.rate_limiter.summary()
+            logger.info(f"Bulk worker {index + 1} pacing: {pacing}")
+            with self._lock:
+                self._pacing.append(f"worker {index + 1}: {pacing}")
+            if service.current_headless_mode:
+                self.status_update.emit(f"[Worker {index + 1}] {service.report_network_usage()}")
+
+        except Exception as e:
+            logger.error(f"Bulk worker {index + 1} crashed: {str(e)}")
+            self.status_update.emit(f"[Worker {index + 1}] stopped: {str(e)}")
+
+        finally:
+            if service is not None:
+                with self._lock:
+                    self.crash_restarts += service.watchdog.restarts
+                    self.crash_downtime += service.watchdog.downtime
+                if service.watchdog.restarts:
+                    logger.info(f"Bulk worker {index + 1} watchdog: {service.watchdog.summary()}")
+            if service is not None and service is not self.service:
+                service.close()
+
+    def _should_retry(self, contact: Contact, service: WhatsAppService, prepared: PreparedSend) -> bool:
+        with self._lock:
+            if self._crash_retries.get(id(contact), 0) >= MAX_CRASH_RETRIES:
+                return False
+        if prepared.failure == SEND_FAILURE_OFFLINE:
+            with self.stages.measure("waiting for connection"):
+                if not service.wait_until_online():
+                    return False
+        else:
+            with self.stages.measure("restarting crashed browser"):
+                if not service.watchdog.handle_failure():
+                    return False
+        with self._lock:
+            self._crash_retries[id(contact)] = self._crash_retries.get(id(contact), 0) + 1
+        return True
+
+    def _record_result(self, contact: Contact, success: bool, total: int):
+        with self._lock:
+            self._done += 1
+            if success:
+                self._successful += 1
+            else:
+                self._failed += 1
+            progress = int((self._done / total) * 100)
+
+        self.message_sent.emit(contact.phone, success)
+        self.progress_update.emit(progress)
+        self.stage_update.emit(self.stages.summary())
+
+    def stop(self):
+        self._stop_requested = True
@@ -7,26 +7,32 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QSize, pyqtSlot, QSettings
 from PyQt6.QtGui import QAction, QIcon
 from pathlib import Path
+from typing import Optional
 import logging
 from ui.tabs.single_message_tab import SingleMessageTab
 from ui.tabs.bulk_message_tab import BulkMessageTab
 from ui.tabs.settings_tab import SettingsTab
 from ui.tabs.logs_tab import LogsTab
-from services.whatsapp_service import WhatsAppService
+from ui.qr_login_dialog import QrLoginDialog
+from services.whatsapp_service import WhatsAppService, DriverWarmupWorker
+from services.async_core import shutdown_event_loop
 from config import APP_NAME, APP_VERSION
 
 logger = logging.getLogger(__name__)
 
 
 class MainWindow(QMainWindow):
-    def __init__(self):
+    def __init__(self, app_started: Optional[float] = None):
         super().__init__()
         self.whatsapp_service = WhatsAppService(self)
+        self.whatsapp_service.app_started = app_started
         self.full_status_text = ""  # Store full text for copying
         self.settings = QSettings("WhatsAppAutomator", "Settings")
         self.setup_ui()
         self.setup_connections()
         self.load_settings()
+        self.warmup_worker = None
+        self.start_standby_browser()
 
     def setup_ui(self):
         self.setWindowTitle(f"{APP_NAME} v{APP_VERSION}")
@@ -187,7 +193,7 @@ class MainWindow(QMainWindow):
     def login_whatsapp(self):
         # Get headless setting
         headless_enabled = self.settings.value("headless_mode", False) == "true"
-        self.whatsapp_service.headless_enabled = headless_enabled
+        self.whatsapp_service.apply_settings(self.settings)
 
         if headless_enabled:
             # Use the headless login flow
@@ -222,6 +228,25 @@ class MainWindow(QMainWindow):
         self.tab_widget.setCurrentWidget(self.bulk_message_tab)
         self.bulk_message_tab.start_bulk_send()
 
+    def start_standby_browser(self):
+        """Launch the browser in the background so the first send does not pay for it."""
+        if self.settings.value("prewarm_browser", False) != "true":
+            return
+
+        self.whatsapp_service.apply_settings(self.settings)
+        self.warmup_worker = DriverWarmupWorker(self.whatsapp_service)
+        self.warmup_worker.finished_warmup.connect(self.on_standby_browser_ready)
+        self.warmup_worker.start()
+        self.status_label.setText("Starting browser in the background...")
+
+    @pyqtSlot(bool)
+    def on_standby_browser_ready(self, logged_in: bool):
+        if logged_in:
+            self.connection_status.setText("Connected")
+            self.connection_status.setStyleSheet("QLabel { color: green; font-weight: bold; padding: 0 10px; }")
+        else:
+            self.status_label.setText("Browser ready - login required")
+
     def check_headless_login_needed(self) -> bool:
         """Check if headless mode is enabled and login is needed.
 
@@ -231,7 +256,7 @@ class MainWindow(QMainWindow):
         # Get headless setting
         headless_enabled = self.settings.value("headless_mode", False) == "true"
         print(f"DEBUG: headless setting = {self.settings.value('headless_mode', False)}, enabled = {headless_enabled}")
-        self.whatsapp_service.headless_enabled = headless_enabled
+        self.whatsapp_service.apply_settings(self.settings)
 
         if headless_enabled and not self.whatsapp_service.is_logged_in:
             # Check if session exists
@@ -244,8 +269,8 @@ class MainWindow(QMainWindow):
                     self,
                     "Login Required for Headless Mode",
                     "Headless mode is enabled but you need to login first.\n\n"
-                    "The browser will open for you to scan the QR code. "
-                    "After login, it will switch to headless mode automatically.\n\n"
+                    "The QR code will be shown here for you to scan, "
+                    "no browser window is needed.\n\n"
                     "Would you like to login now?",
                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
                     QMessageBox.StandardButton.Yes
@@ -260,13 +285,16 @@ class MainWindow(QMainWindow):
         return False  # Continue with normal flow
 
     def initiate_headless_login(self):
-        """Handle the login flow for headless mode."""
+        """Handle the login flow for headless mode.
+
+        The QR code of the headless browser is shown in a dialog, the browser that
+        gets linked is the one that sends afterwards.
+        """
         try:
-            # Login with GUI
-            self.status_label.setText("Opening browser for login...")
+            self.status_label.setText("Starting browser for login...")
             QApplication.processEvents()
 
-            if not self.whatsapp_service.login():
+            if not self.whatsapp_service.start_headless_login():
                 QMessageBox.critical(
                     self,
                     "Login Failed",
@@ -274,33 +302,13 @@ class MainWindow(QMainWindow):
                 )
                 return
 
-            # Success dialog
-            reply = QMessageBox.information(
-                self,
-                "Login Successful",
-                "Login successful! Click OK to switch to headless mode.",
-                QMessageBox.StandardButton.Ok
-            )
-
-            # Restart in headless
-            self.status_label.setText("Switching to headless mode...")
-            QApplication.processEvents()
+            if not self.whatsapp_service.poll_login():
+                dialog = QrLoginDialog(self.whatsapp_service, self)
+                if dialog.exec() != QDialog.DialogCode.Accepted:
+                    self.status_label.setText("Login cancelled")
+                    return
 
-            if self.whatsapp_service.restart_in_headless():
-                self.status_label.setText("Ready - Running in headless mode")
-                QMessageBox.information(
-                    self,
-                    "Headless Mode Active",
-                    "Successfully switched to headless mode. You can now send messages without the browser window."
-                )
-            else:
-                QMessageBox.warning(
-                    self,
-                    "Headless Mode Failed",
-                    "Could not switch to headless mode. The session may have expired. "
-                    "Please disable headless mode in Settings or try logging in again."
-                )
-                self.whatsapp_service.close()
+            self.status_label.setText("Ready - Running in headless mode")
 
         except Exception as e:
             logger.error(f"Headless login error: {e}")
@@ -471,6 +479,9 @@ class MainWindow(QMainWindow):
 
         if reply == QMessageBox.StandardButton.Yes:
             self.save_settings()
+            if self.warmup_worker and self.warmup_worker.isRunning():
+                self.warmup_worker.wait()
+            shutdown_event_loop()
             self.whatsapp_service.close()
             event.accept()
         else:
@@ -0,0 +1,89 @@
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLabel, QDialogButtonBox
+from PyQt6.QtCore import Qt, QTimer, pyqtSlot
+from PyQt6.QtGui import QPixmap
+from services.whatsapp_service import WhatsAppService
+from config import QR_REFRESH_INTERVAL_MS
+
+
+class QrLoginDialog(QDialog):
+    """Shows the QR code of a headless browser so it can be linked without a visible window.
+
+    Accepted once the browser reports a login; the browser keeps running headless.
+    """
+
+    def __init__(self, whatsapp_service: WhatsAppService, parent=None):
+        super().__init__(parent)
+        self.whatsapp_service = whatsapp_service
+        self.shown_ref = None
+        self.rotations = 0
+        self.setup_ui()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setInterval(QR_REFRESH_INTERVAL_MS)
+        self.refresh_timer.timeout.connect(self.refresh)
+
+    def setup_ui(self):
+        self.setWindowTitle("Link WhatsApp")
+        layout = QVBoxLayout(self)
+
+        instructions = QLabel(
+            "Open WhatsApp on your phone, go to Settings > Linked devices\n"
+            "and scan this code."
+        )
+        instructions.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(instructions)
+
+        self.qr_label = QLabel("Loading QR code...")
+        self.qr_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.qr_label.setMinimumSize(300, 300)
+        self.qr_label.setStyleSheet("QLabel { background-color: white; }")
+        layout.addWidget(self.qr_label)
+
+        self.status_label = QLabel("")
+        self.status_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.status_label)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Cancel)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh_timer.start()
+        QTimer.singleShot(0, self.refresh)
+
+    def done(self, result):
+        self.refresh_timer.stop()
+        super().done(result)
+
+    @pyqtSlot()
+    def refresh(self):
+        # Paused while polling, a login pops up a message box from the logged_in signal
+        self.refresh_timer.stop()
+
+        if self.whatsapp_service.poll_login():
+            self.accept()
+            return
+
+        qr = self.whatsapp_service.qr_code_image()
+        if qr is None:
+            self.status_label.setText("Waiting for WhatsApp Web...")
+        elif qr[0] != self.shown_ref or not qr[0]:
+            # Redraw only when WhatsApp has rotated the code
+            if self.shown_ref:
+                self.rotations += 1
+            self.shown_ref = qr[0]
+            pixmap = QPixmap()
+            pixmap.loadFromData(qr[1])
+            self.qr_label.setPixmap(pixmap.scaled(
+                self.qr_label.size(),
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.FastTransformation
+            ))
+            self.status_label.setText(
+                "Waiting for the code to be scanned..."
+                + (f" (code refreshed {self.rotations}x)" if self.rotations else "")
+            )
+
+        if self.isVisible():
+            self.refresh_timer.start()
@@ -2,19 +2,23 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QLineEdit, QTextEdit, QPushButton, QGroupBox,
     QTableWidget, QTableWidgetItem, QFileDialog,
-    QMessageBox, QSpinBox, QProgressBar, QComboBox,
+    QMessageBox, QSpinBox, QDoubleSpinBox, QProgressBar, QComboBox,
     QHeaderView, QDialog, QDialogButtonBox, QFormLayout,
-    QSplitter, QMenu
+    QSplitter, QMenu, QInputDialog
 )
 from PyQt6.QtCore import pyqtSlot, Qt, QPoint
-from PyQt6.QtGui import QAction
+from PyQt6.QtGui import QAction, QColor
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 import logging
 from models.contact import Contact
-from models.message import Message
+from models.message import Message, Attachment
 from services.whatsapp_service import BulkSendWorker
+from services.worker_pool import ParallelBulkSendWorker
+from services.rate_limiter import RateLimit
+from services.registration_cache import ValidateListWorker, REGISTERED, NOT_REGISTERED
 from utils.file_handler import FileHandler
+from config import DEFAULT_WORKER_COUNT, MAX_WORKER_COUNT, DEFAULT_DELIVERY_WAIT_HORIZON, MAX_RATE_JITTER
 
 logger = logging.getLogger(__name__)
 
@@ -25,7 +29,10 @@ class BulkMessageTab(QWidget):
         self.whatsapp_service = whatsapp_service
         self.contacts: List[Contact] = []
         self.bulk_worker = None
+        self.validate_worker = None
+        self.registration: Dict[str, str] = {}  # contact phone -> result of the last validation
         self.attachments = []
+        self.captions: Dict[str, str] = {}  # attachment path -> caption
         self.setup_ui()
 
     def setup_ui(self):
@@ -55,6 +62,14 @@ class BulkMessageTab(QWidget):
         export_btn.clicked.connect(self.export_contacts)
         import_layout.addWidget(export_btn)
 
+        self.validate_btn = QPushButton("Validate List")
+        self.validate_btn.setToolTip(
+            "Check which numbers are on WhatsApp without sending anything.\n"
+            "Results are cached, numbers without WhatsApp are skipped when sending."
+        )
+        self.validate_btn.clicked.connect(self.start_validation)
+        import_layout.addWidget(self.validate_btn)
+
         import_layout.addStretch()
         contacts_layout.addLayout(import_layout)
 
@@ -106,6 +121,10 @@ class BulkMessageTab(QWidget):
         self.attachments_label = QLabel("No attachments")
         attachments_layout.addWidget(self.attachments_label)
 
+        caption_btn = QPushButton("Edit Caption")
+        caption_btn.clicked.connect(self.edit_attachment_caption)
+        attachments_layout.addWidget(caption_btn)
+
         clear_attach_btn = QPushButton("Clear Attachments")
         clear_attach_btn.clicked.connect(self.clear_attachments)
         attachments_layout.addWidget(clear_attach_btn)
@@ -122,7 +141,9 @@ class BulkMessageTab(QWidget):
 
         # Initialize sending settings (hidden by default in dialog)
         self.country_code = ""
-        self.delay_seconds = 5
+        self.rate_limit = RateLimit()
+        self.worker_count = DEFAULT_WORKER_COUNT
+        self.delivery_horizon = DEFAULT_DELIVERY_WAIT_HORIZON
 
         progress_group = QGroupBox("Progress")
         progress_layout = QVBoxLayout()
@@ -137,6 +158,11 @@ class BulkMessageTab(QWidget):
         self.results_label = QLabel("")
         progress_layout.addWidget(self.results_label)
 
+        self.stage_label = QLabel("")
+        self.stage_label.setToolTip("Share of the run spent in each stage of the send pipeline")
+        self.stage_label.setStyleSheet("color: #666666;")
+        progress_layout.addWidget(self.stage_label)
+
         progress_group.setLayout(progress_layout)
         layout.addWidget(progress_group)
 
@@ -489,9 +515,68 @@ class BulkMessageTab(QWidget):
             self.contacts_table.setItem(i, 1, QTableWidgetItem(contact.phone))
             self.contacts_table.setItem(i, 2, QTableWidgetItem(contact.email))
             self.contacts_table.setItem(i, 3, QTableWidgetItem(contact.group))
+            self._mark_registration(i, self.registration.get(contact.phone))
 
         self.contacts_count_label.setText(f"Total contacts: {len(self.contacts)}")
 
+    def _mark_registration(self, row: int, status: str):
+        item = self.contacts_table.item(row, 1)
+        if item is None or status is None:
+            return
+        if status == NOT_REGISTERED:
+            item.setForeground(QColor("#dc3545"))
+            item.setToolTip("Not on WhatsApp, will be skipped")
+        elif status == REGISTERED:
+            item.setForeground(QColor("#128C7E"))
+            item.setToolTip("On WhatsApp")
+
+    @pyqtSlot()
+    def start_validation(self):
+        if not self.contacts:
+            QMessageBox.warning(self, "Warning", "No contacts loaded")
+            return
+
+        self.validate_btn.setEnabled(False)
+        self.start_btn.setEnabled(False)
+        self.stop_btn.setEnabled(True)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        self.progress_label.setText("Validating numbers...")
+
+        self._rows_by_phone: Dict[str, List[int]] = {}
+        for row, contact in enumerate(self.contacts):
+            self._rows_by_phone.setdefault(contact.phone, []).append(row)
+
+        # Same browser options as a bulk send, the job may have to start the browser
+        from PyQt6.QtCore import QSettings
+        self.whatsapp_service.apply_settings(QSettings("WhatsAppAutomator", "Settings"))
+
+        self.validate_worker = ValidateListWorker(self.whatsapp_service, self.contacts, self.country_code)
+        self.validate_worker.status_update.connect(self.update_status)
+        self.validate_worker.progress_update.connect(self.update_progress)
+        self.validate_worker.checked.connect(self.on_number_checked)
+        self.validate_worker.completed.connect(self.on_validation_complete)
+        self.validate_worker.start()
+
+    @pyqtSlot(str, str)
+    def on_number_checked(self, phone: str, status: str):
+        self.registration[phone] = status
+        for row in self._rows_by_phone.get(phone, []):
+            self._mark_registration(row, status)
+
+    @pyqtSlot(int, int, int)
+    def on_validation_complete(self, registered: int, unregistered: int, unknown: int):
+        self.validate_btn.setEnabled(True)
+        self.start_btn.setEnabled(True)
+        self.stop_btn.setEnabled(False)
+        self.progress_bar.setVisible(False)
+        self.validate_worker = None
+
+        self.results_label.setText(
+            f"Validated: {registered} on WhatsApp, {unregistered} not on WhatsApp"
+            + (f", {unknown} could not be checked" if unknown else "")
+        )
+
     def show_settings_dialog(self):
         dialog = QDialog(self)
         dialog.setWindowTitle("Sending Settings")
@@ -503,13 +588,62 @@ class BulkMessageTab(QWidget):
         country_code_input.setPlaceholderText("+1")
         layout.addRow("Country Code:", country_code_input)
 
-        delay_spinbox = QSpinBox()
-        delay_spinbox.setMinimum(1)
-        delay_spinbox.setMaximum(60)
-        delay_spinbox.setValue(self.delay_seconds)
+        delay_spinbox = QDoubleSpinBox()
+        delay_spinbox.setDecimals(1)
+        delay_spinbox.setMinimum(0.1)
+        delay_spinbox.setMaximum(3600)
+        delay_spinbox.setSingleStep(0.5)
+        delay_spinbox.setValue(self.rate_limit.interval)
         delay_spinbox.setSuffix(" seconds")
+        delay_spinbox.setToolTip("Time from the start of one message to the start of the next, per account")
         layout.addRow("Delay between messages:", delay_spinbox)
 
+        burst_spinbox = QSpinBox()
+        burst_spinbox.setMinimum(1)
+        burst_spinbox.setMaximum(100)
+        burst_spinbox.setValue(self.rate_limit.burst)
+        burst_spinbox.setToolTip("Messages that may go out back to back after a pause, the average rate stays the same")
+        layout.addRow("Burst:", burst_spinbox)
+
+        jitter_spinbox = QSpinBox()
+        jitter_spinbox.setMinimum(0)
+        jitter_spinbox.setMaximum(int(MAX_RATE_JITTER * 100))
+        jitter_spinbox.setValue(int(round(self.rate_limit.jitter * 100)))
+        jitter_spinbox.setSuffix(" %")
+        jitter_spinbox.setToolTip("Randomly shortens or lengthens each delay by up to this share")
+        layout.addRow("Jitter:", jitter_spinbox)
+
+        hourly_spinbox = QSpinBox()
+        hourly_spinbox.setMaximum(100000)
+        hourly_spinbox.setSpecialValueText("Unlimited")
+        hourly_spinbox.setValue(self.rate_limit.hourly_cap)
+        layout.addRow("Max messages per hour:", hourly_spinbox)
+
+        daily_spinbox = QSpinBox()
+        daily_spinbox.setMaximum(1000000)
+        daily_spinbox.setSpecialValueText("Unlimited")
+        daily_spinbox.setValue(self.rate_limit.daily_cap)
+        daily_spinbox.setToolTip("Counted per account over the last 24 hours, including earlier runs")
+        layout.addRow("Max messages per day:", daily_spinbox)
+
+        workers_spinbox = QSpinBox()
+        workers_spinbox.setMinimum(1)
+        workers_spinbox.setMaximum(MAX_WORKER_COUNT)
+        workers_spinbox.setValue(self.worker_count)
+        workers_spinbox.setToolTip(
+            "Number of browsers sending in parallel. Each extra browser uses its own\n"
+            "profile and has to be linked to WhatsApp once by scanning its QR code."
+        )
+        layout.addRow("Parallel browsers:", workers_spinbox)
+
+        horizon_spinbox = QSpinBox()
+        horizon_spinbox.setMinimum(0)
+        horizon_spinbox.setMaximum(300)
+        horizon_spinbox.setValue(int(self.delivery_horizon))
+        horizon_spinbox.setSuffix(" seconds")
+        horizon_spinbox.setToolTip("How long to keep watching for delivered/read ticks after the last message")
+        layout.addRow("Wait for delivery ticks:", horizon_spinbox)
+
         buttons = QDialogButtonBox(
             QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
         )
@@ -521,7 +655,15 @@ class BulkMessageTab(QWidget):
 
         if dialog.exec() == QDialog.DialogCode.Accepted:
             self.country_code = country_code_input.text().strip()
-            self.delay_seconds = delay_spinbox.value()
+            self.rate_limit = RateLimit(
+                interval=delay_spinbox.value(),
+                burst=burst_spinbox.value(),
+                jitter=jitter_spinbox.value() / 100,
+                hourly_cap=hourly_spinbox.value(),
+                daily_cap=daily_spinbox.value()
+            )
+            self.worker_count = workers_spinbox.value()
+            self.delivery_horizon = horizon_spinbox.value()
 
     @pyqtSlot()
     def add_attachments(self):
@@ -533,11 +675,37 @@ class BulkMessageTab(QWidget):
         )
         if files:
             self.attachments.extend(files)
-            self.attachments_label.setText(f"{len(self.attachments)} file(s) selected")
+            self._update_attachments_label()
+
+    @pyqtSlot()
+    def edit_attachment_caption(self):
+        if not self.attachments:
+            QMessageBox.information(self, "Edit Caption", "Add attachments first")
+            return
+
+        names = [f"{index + 1}. {Path(file_path).name}" for index, file_path in enumerate(self.attachments)]
+        name, ok = QInputDialog.getItem(self, "Edit Caption", "Attachment:", names, 0, False)
+        if not ok:
+            return
+        file_path = self.attachments[names.index(name)]
+        caption, ok = QInputDialog.getText(
+            self, "Edit Caption", f"Caption for {Path(file_path).name}:", text=self.captions.get(file_path, "")
+        )
+        if ok:
+            self.captions[file_path] = caption.strip()
+            self._update_attachments_label()
+
+    def _update_attachments_label(self):
+        text = f"{len(self.attachments)} file(s) selected"
+        captioned = sum(1 for file_path in self.attachments if self.captions.get(file_path))
+        if captioned:
+            text += f", {captioned} with caption"
+        self.attachments_label.setText(text)
 
     @pyqtSlot()
     def clear_attachments(self):
         self.attachments.clear()
+        self.captions.clear()
         self.attachments_label.setText("No attachments")
 
     @pyqtSlot()
@@ -563,42 +731,62 @@ class BulkMessageTab(QWidget):
 
         message = Message(
             text=message_text,
-            attachments=self.attachments.copy()
+            attachments=[
+                Attachment(file_path, FileHandler.detect_media_type(file_path), self.captions.get(file_path, ""))
+                for file_path in self.attachments
+            ]
         )
 
         country_code = self.country_code
-        delay = self.delay_seconds
 
         # Update headless setting before starting bulk send
         from PyQt6.QtCore import QSettings
         settings = QSettings("WhatsAppAutomator", "Settings")
         headless_enabled = settings.value("headless_mode", False) == "true"
         print(f"DEBUG: Bulk message - headless setting = {settings.value('headless_mode', False)}, enabled = {headless_enabled}")
-        self.whatsapp_service.headless_enabled = headless_enabled
+        self.whatsapp_service.apply_settings(settings)
 
         self.start_btn.setEnabled(False)
+        self.validate_btn.setEnabled(False)
         self.stop_btn.setEnabled(True)
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
         self.progress_label.setText("Starting bulk send...")
 
-        self.bulk_worker = BulkSendWorker(
-            self.whatsapp_service,
-            self.contacts,
-            message,
-            country_code,
-            delay
-        )
+        if self.worker_count > 1:
+            self.bulk_worker = ParallelBulkSendWorker(
+                self.whatsapp_service,
+                self.contacts,
+                message,
+                country_code,
+                self.rate_limit,
+                self.worker_count,
+                self.delivery_horizon
+            )
+        else:
+            self.bulk_worker = BulkSendWorker(
+                self.whatsapp_service,
+                self.contacts,
+                message,
+                country_code,
+                self.rate_limit,
+                self.delivery_horizon
+            )
 
         self.bulk_worker.status_update.connect(self.update_status)
         self.bulk_worker.progress_update.connect(self.update_progress)
         self.bulk_worker.message_sent.connect(self.on_message_sent)
+        self.bulk_worker.stage_update.connect(self.update_stages)
+        self.bulk_worker.delivery_update.connect(self.on_delivery_update)
         self.bulk_worker.completed.connect(self.on_bulk_complete)
 
         self.bulk_worker.start()
 
     @pyqtSlot()
     def stop_bulk_send(self):
+        if self.validate_worker:
+            self.validate_worker.stop()
+            self.stop_btn.setEnabled(False)
         if self.bulk_worker:
             self.bulk_worker.stop()
             self.stop_btn.setEnabled(False)
@@ -611,6 +799,14 @@ class BulkMessageTab(QWidget):
     def update_progress(self, progress: int):
         self.progress_bar.setValue(progress)
 
+    @pyqtSlot(str)
+    def update_stages(self, summary: str):
+        self.stage_label.setText(f"Stages: {summary}")
+
+    @pyqtSlot(str, str)
+    def on_delivery_update(self, phone: str, status: str):
+        logger.debug(f"Delivery status for {phone}: {status}")
+
     @pyqtSlot(str, bool)
     def on_message_sent(self, phone: str, success: bool):
         status = "✓" if success else "✗"
@@ -619,10 +815,24 @@ class BulkMessageTab(QWidget):
     @pyqtSlot(int, int)
     def on_bulk_complete(self, successful: int, failed: int):
         self.start_btn.setEnabled(True)
+        self.validate_btn.setEnabled(True)
         self.stop_btn.setEnabled(False)
         self.progress_bar.setVisible(False)
 
-        self.results_label.setText(f"Completed: {successful} successful, {failed} failed")
+        delivery_counts = {}
+        for status in self.bulk_worker.delivery_results.values():
+            delivery_counts[status] = delivery_counts.get(status, 0) + 1
+        delivery_text = ", ".join(f"{count} {status}" for status, count in sorted(delivery_counts.items()))
+
+        restarts = self.bulk_worker.crash_restarts
+        self.results_label.setText(
+            f"Completed: {successful} successful, {failed} failed"
+            + (f" ({len(self.bulk_worker.not_on_whatsapp)} not on WhatsApp)" if self.bulk_worker.not_on_whatsapp else "")
+            + (f" (delivery: {delivery_text})" if delivery_text else "")
+            + (f", browser restarted {restarts}x after crashes "
+               f"({self.bulk_worker.crash_downtime:.0f}s downtime)" if restarts else "")
+            + (f"\nPacing: {self.bulk_worker.pacing_summary}" if self.bulk_worker.pacing_summary else "")
+        )
 
         QMessageBox.information(
             self,
@@ -630,4 +840,5 @@ class BulkMessageTab(QWidget):
             f"Bulk sending completed!\n\n"
             f"Successful: {successful}\n"
             f"Failed: {failed}"
+            + (f"\nNot on WhatsApp: {len(self.bulk_worker.not_on_whatsapp)}" if self.bulk_worker.not_on_whatsapp else "")
         )
\ No newline at end of file
@@ -3,10 +3,12 @@ from PyQt6.QtWidgets import (
     QPushButton, QTextEdit, QComboBox,
     QLabel, QMessageBox
 )
-from PyQt6.QtCore import pyqtSlot, QDateTime
+from PyQt6.QtCore import Qt, pyqtSlot, QDateTime, QTimer
 from PyQt6.QtGui import QTextCharFormat, QColor, QFont
 from pathlib import Path
 import logging
+from services.metrics import metrics_registry
+from config import METRICS_SUMMARY_INTERVAL_MS
 
 
 class LogsTab(QWidget):
@@ -39,6 +41,11 @@ class LogsTab(QWidget):
         export_btn.clicked.connect(self.export_logs_dialog)
         controls_layout.addWidget(export_btn)
 
+        self.export_metrics_btn = QPushButton("Export Metrics")
+        self.export_metrics_btn.setToolTip("Save the send stage timings in the Prometheus text format")
+        self.export_metrics_btn.clicked.connect(self.export_metrics_dialog)
+        controls_layout.addWidget(self.export_metrics_btn)
+
         controls_layout.addStretch()
         layout.addLayout(controls_layout)
 
@@ -54,6 +61,17 @@ class LogsTab(QWidget):
         """)
         layout.addWidget(self.log_display)
 
+        # Live per-stage send timings, only shown while "Record send timings" is on
+        self.metrics_summary = QLabel()
+        self.metrics_summary.setFont(QFont("Consolas", 9))
+        self.metrics_summary.setTextInteractionFlags(Qt.TextInteractionFlag.TextSelectableByMouse)
+        self.metrics_summary.setVisible(False)
+        layout.addWidget(self.metrics_summary)
+
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.refresh_metrics_summary)
+        self.metrics_timer.start(METRICS_SUMMARY_INTERVAL_MS)
+
         self.all_logs = []
 
     def setup_logging(self):
@@ -178,6 +196,43 @@ class LogsTab(QWidget):
             )
 
 
+    @pyqtSlot()
+    def refresh_metrics_summary(self):
+        metrics = metrics_registry()
+        self.export_metrics_btn.setEnabled(metrics.enabled)
+        summary = metrics.summary() if metrics.enabled else ""
+        self.metrics_summary.setVisible(bool(summary))
+        if summary != self.metrics_summary.text():
+            self.metrics_summary.setText(summary)
+
+    @pyqtSlot()
+    def export_metrics_dialog(self):
+        from PyQt6.QtWidgets import QFileDialog
+
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Metrics",
+            f"whatsapp_metrics_{QDateTime.currentDateTime().toString('yyyyMMdd_HHmmss')}.prom",
+            "Prometheus Text Files (*.prom);;All Files (*.*)"
+        )
+        if not file_path:
+            return
+
+        try:
+            metrics_registry().write_prometheus(Path(file_path))
+            QMessageBox.information(
+                self,
+                "Export Successful",
+                f"Metrics exported successfully to:\n{file_path}"
+            )
+        except Exception as e:
+            QMessageBox.critical(
+                self,
+                "Export Error",
+                f"Failed to export metrics: {str(e)}"
+            )
+
+
 class GuiLogHandler(logging.Handler):
     def __init__(self, logs_tab):
         super().__init__()
@@ -64,6 +64,66 @@ class SettingsTab(QWidget):
         )
         browser_layout.addWidget(self.headless_checkbox)
 
+        self.in_app_navigation_checkbox = QCheckBox("Open chats without reloading WhatsApp Web")
+        self.in_app_navigation_checkbox.setChecked(True)
+        self.in_app_navigation_checkbox.setToolTip(
+            "Look up each contact inside the already loaded page instead of reloading it.\n"
+            "Falls back to a full reload when the contact cannot be found."
+        )
+        browser_layout.addWidget(self.in_app_navigation_checkbox)
+
+        self.offline_driver_checkbox = QCheckBox("Offline driver mode (never download ChromeDriver)")
+        self.offline_driver_checkbox.setToolTip(
+            "Only use the locally cached ChromeDriver or one found on PATH.\n"
+            "Enable this on machines without internet access."
+        )
+        browser_layout.addWidget(self.offline_driver_checkbox)
+
+        self.prewarm_checkbox = QCheckBox("Start browser in the background at launch")
+        self.prewarm_checkbox.setToolTip(
+            "Launch Chrome and load WhatsApp Web while the app starts,\n"
+            "so the first message does not wait for the browser. Takes effect on next start."
+        )
+        browser_layout.addWidget(self.prewarm_checkbox)
+
+        self.memory_governor_checkbox = QCheckBox("Restart the browser periodically to cap memory use")
+        self.memory_governor_checkbox.setChecked(True)
+        self.memory_governor_checkbox.setToolTip(
+            "Launch Chrome with low-memory flags and relaunch it between contacts during\n"
+            "long campaigns, after a number of messages or when it uses too much memory."
+        )
+        browser_layout.addWidget(self.memory_governor_checkbox)
+
+        self.lean_sending_checkbox = QCheckBox("Lean sending in headless mode")
+        self.lean_sending_checkbox.setToolTip(
+            "Block profile pictures, fonts, stickers and incoming media previews while\n"
+            "sending headless. Saves bandwidth and CPU; uploads are not affected."
+        )
+        browser_layout.addWidget(self.lean_sending_checkbox)
+
+        self.cdp_backend_checkbox = QCheckBox("Talk to Chrome directly over DevTools (experimental)")
+        self.cdp_backend_checkbox.setToolTip(
+            "Send text, file uploads and page checks as DevTools commands instead of\n"
+            "going through ChromeDriver. Falls back automatically if DevTools is unreachable."
+        )
+        browser_layout.addWidget(self.cdp_backend_checkbox)
+
+        self.send_metrics_checkbox = QCheckBox("Record send timings")
+        self.send_metrics_checkbox.setToolTip(
+            "Time every stage of each send (navigation, composer wait, upload, typing, send,\n"
+            "confirmation, pacing) and show a summary in the Logs tab. Spans are appended to\n"
+            "~/.whatsapp_automator/metrics/trace-<date>.jsonl, a Prometheus file is written after each run."
+        )
+        browser_layout.addWidget(self.send_metrics_checkbox)
+
+        self.optimize_attachments_checkbox = QCheckBox("Shrink attachments before sending")
+        self.optimize_attachments_checkbox.setChecked(True)
+        self.optimize_attachments_checkbox.setToolTip(
+            "Downscale and recompress images (and transcode oversized videos when ffmpeg\n"
+            "is installed) once per campaign, and upload the smaller copy to every contact."
+        )
+        browser_layout.addWidget(self.optimize_attachments_checkbox)
+
         self.persist_session_checkbox = QCheckBox("Persist login session")
         self.persist_session_checkbox.setChecked(True)
         self.persist_session_checkbox.setToolTip("Stay logged in between sessions")
@@ -256,6 +316,14 @@ class SettingsTab(QWidget):
             "default_delay": self.delay_spinbox.value(),
             "timeout": self.timeout_spinbox.value(),
             "headless_mode": self.headless_checkbox.isChecked(),
+            "in_app_navigation": self.in_app_navigation_checkbox.isChecked(),
+            "offline_driver": self.offline_driver_checkbox.isChecked(),
+            "prewarm_browser": self.prewarm_checkbox.isChecked(),
+            "optimize_attachments": self.optimize_attachments_checkbox.isChecked(),
+            "cdp_backend": self.cdp_backend_checkbox.isChecked(),
+            "lean_sending": self.lean_sending_checkbox.isChecked(),
+            "memory_governor": self.memory_governor_checkbox.isChecked(),
+            "send_metrics": self.send_metrics_checkbox.isChecked(),
             "persist_session": self.persist_session_checkbox.isChecked(),
             "auto_close_browser": self.auto_close_checkbox.isChecked(),
             "success_notifications": self.success_notification_checkbox.isChecked(),
@@ -268,6 +336,14 @@ class SettingsTab(QWidget):
         self.delay_spinbox.setValue(settings.get("default_delay", 5))
         self.timeout_spinbox.setValue(settings.get("timeout", 30))
         self.headless_checkbox.setChecked(settings.get("headless_mode", False))
+        self.in_app_navigation_checkbox.setChecked(settings.get("in_app_navigation", True))
+        self.offline_driver_checkbox.setChecked(settings.get("offline_driver", False))
+        self.prewarm_checkbox.setChecked(settings.get("prewarm_browser", False))
+        self.optimize_attachments_checkbox.setChecked(settings.get("optimize_attachments", True))
+        self.cdp_backend_checkbox.setChecked(settings.get("cdp_backend", False))
+        self.lean_sending_checkbox.setChecked(settings.get("lean_sending", False))
+        self.memory_governor_checkbox.setChecked(settings.get("memory_governor", True))
+        self.send_metrics_checkbox.setChecked(settings.get("send_metrics", False))
         self.persist_session_checkbox.setChecked(settings.get("persist_session", True))
         self.auto_close_checkbox.setChecked(settings.get("auto_close_browser", False))
         self.success_notification_checkbox.setChecked(settings.get("success_notifications", True))
@@ -292,6 +368,14 @@ class SettingsTab(QWidget):
         self.delay_spinbox.setValue(int(self.settings.value("default_delay", 5)))
         self.timeout_spinbox.setValue(int(self.settings.value("timeout", 30)))
         self.headless_checkbox.setChecked(self.settings.value("headless_mode", False) == "true")
+        self.in_app_navigation_checkbox.setChecked(self.settings.value("in_app_navigation", True) != "false")
+        self.offline_driver_checkbox.setChecked(self.settings.value("offline_driver", False) == "true")
+        self.prewarm_checkbox.setChecked(self.settings.value("prewarm_browser", False) == "true")
+        self.optimize_attachments_checkbox.setChecked(self.settings.value("optimize_attachments", True) != "false")
+        self.cdp_backend_checkbox.setChecked(self.settings.value("cdp_backend", False) == "true")
+        self.lean_sending_checkbox.setChecked(self.settings.value("lean_sending", False) == "true")
+        self.memory_governor_checkbox.setChecked(self.settings.value("memory_governor", True) != "false")
+        self.send_metrics_checkbox.setChecked(self.settings.value("send_metrics", False) == "true")
         self.persist_session_checkbox.setChecked(self.settings.value("persist_session", True) != "false")
         self.auto_close_checkbox.setChecked(self.settings.value("auto_close_browser", False) == "true")
         self.success_notification_checkbox.setChecked(self.settings.value("success_notifications", True) != "false")
@@ -315,6 +399,14 @@ class SettingsTab(QWidget):
             self.delay_spinbox.setValue(5)
             self.timeout_spinbox.setValue(30)
             self.headless_checkbox.setChecked(False)
+            self.in_app_navigation_checkbox.setChecked(True)
+            self.offline_driver_checkbox.setChecked(False)
+            self.prewarm_checkbox.setChecked(False)
+            self.optimize_attachments_checkbox.setChecked(True)
+            self.cdp_backend_checkbox.setChecked(False)
+            self.lean_sending_checkbox.setChecked(False)
+            self.memory_governor_checkbox.setChecked(True)
+            self.send_metrics_checkbox.setChecked(False)
             self.persist_session_checkbox.setChecked(True)
             self.auto_close_checkbox.setChecked(False)
             self.success_notification_checkbox.setChecked(True)
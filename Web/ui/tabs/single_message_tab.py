@@ -1,13 +1,14 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel,
     QLineEdit, QTextEdit, QPushButton, QGroupBox,
-    QListWidget, QFileDialog, QMessageBox, QComboBox
+    QListWidget, QFileDialog, QMessageBox, QComboBox, QInputDialog
 )
 from PyQt6.QtCore import pyqtSlot
 from pathlib import Path
 from models.contact import Contact
 from models.message import Message, Attachment, MediaType
 from services.whatsapp_service import WhatsAppService
+from services.async_core import AsyncCall, AsyncWhatsAppService
 from utils.file_handler import FileHandler
 
 
@@ -15,6 +16,8 @@ class SingleMessageTab(QWidget):
     def __init__(self, whatsapp_service: WhatsAppService):
         super().__init__()
         self.whatsapp_service = whatsapp_service
+        self.async_service = AsyncWhatsAppService(whatsapp_service)
+        self.pending_send = None
         self.attachments = []
         self.setup_ui()
 
@@ -110,6 +113,10 @@ class SingleMessageTab(QWidget):
         attach_video_btn.clicked.connect(self.add_video_attachment)
         attach_buttons_layout.addWidget(attach_video_btn)
 
+        caption_btn = QPushButton("Edit Caption")
+        caption_btn.clicked.connect(self.edit_attachment_caption)
+        attach_buttons_layout.addWidget(caption_btn)
+
         clear_attachments_btn = QPushButton("Clear All")
         clear_attachments_btn.clicked.connect(self.clear_attachments)
         attach_buttons_layout.addWidget(clear_attachments_btn)
@@ -119,6 +126,7 @@ class SingleMessageTab(QWidget):
 
         self.attachments_list = QListWidget()
         self.attachments_list.setMaximumHeight(100)
+        self.attachments_list.itemDoubleClicked.connect(self.edit_attachment_caption)
         attachments_layout.addWidget(self.attachments_list)
 
         attachments_group.setLayout(attachments_layout)
@@ -209,7 +217,7 @@ class SingleMessageTab(QWidget):
         )
         if file_path:
             self.attachments.append(Attachment(file_path, MediaType.Image))
-            self.attachments_list.addItem(Path(file_path).name)
+            self.attachments_list.addItem(self._attachment_label(self.attachments[-1]))
 
     @pyqtSlot()
     def add_document_attachment(self):
@@ -221,7 +229,7 @@ class SingleMessageTab(QWidget):
         )
         if file_path:
             self.attachments.append(Attachment(file_path, MediaType.Document))
-            self.attachments_list.addItem(Path(file_path).name)
+            self.attachments_list.addItem(self._attachment_label(self.attachments[-1]))
 
     @pyqtSlot()
     def add_video_attachment(self):
@@ -233,7 +241,27 @@ class SingleMessageTab(QWidget):
         )
         if file_path:
             self.attachments.append(Attachment(file_path, MediaType.Video))
-            self.attachments_list.addItem(Path(file_path).name)
+            self.attachments_list.addItem(self._attachment_label(self.attachments[-1]))
+
+    @staticmethod
+    def _attachment_label(attachment: Attachment) -> str:
+        name = Path(attachment.file_path).name
+        return f"{name} - {attachment.caption}" if attachment.caption else name
+
+    @pyqtSlot()
+    def edit_attachment_caption(self):
+        row = self.attachments_list.currentRow()
+        if row < 0:
+            QMessageBox.information(self, "Edit Caption", "Select an attachment first")
+            return
+
+        attachment = self.attachments[row]
+        caption, ok = QInputDialog.getText(
+            self, "Edit Caption", f"Caption for {Path(attachment.file_path).name}:", text=attachment.caption
+        )
+        if ok:
+            attachment.caption = caption.strip()
+            self.attachments_list.item(row).setText(self._attachment_label(attachment))
 
     @pyqtSlot()
     def clear_attachments(self):
@@ -276,10 +304,20 @@ class SingleMessageTab(QWidget):
         settings = QSettings("WhatsAppAutomator", "Settings")
         headless_enabled = settings.value("headless_mode", False) == "true"
         print(f"DEBUG: Single message - headless setting = {settings.value('headless_mode', False)}, enabled = {headless_enabled}")
-        self.whatsapp_service.headless_enabled = headless_enabled
-
-        success = self.whatsapp_service.send_message(contact, message, country_code)
+        self.whatsapp_service.apply_settings(settings)
 
+        # Sending runs on the async core, the window stays responsive meanwhile
+        self.pending_send = AsyncCall(
+            self.async_service.send_message(contact, message, country_code), self
+        )
+        self.pending_send.finished.connect(self.on_send_finished)
+        self.pending_send.failed.connect(self.on_send_failed)
+        self.pending_send.start()
+
+    @pyqtSlot(object)
+    def on_send_finished(self, success):
+        self.pending_send.deleteLater()
+        self.pending_send = None
         self.send_btn.setEnabled(True)
         self.send_btn.setText("Send Message")
 
@@ -293,6 +331,14 @@ class SingleMessageTab(QWidget):
             ) == QMessageBox.StandardButton.Yes:
                 self.clear_form()
 
+    @pyqtSlot(str)
+    def on_send_failed(self, error):
+        self.pending_send.deleteLater()
+        self.pending_send = None
+        self.send_btn.setEnabled(True)
+        self.send_btn.setText("Send Message")
+        QMessageBox.critical(self, "Error", f"Failed to send message: {error}")
+
     @pyqtSlot()
     def clear_form(self):
         self.phone_input.clear()
@@ -0,0 +1,72 @@
+import sys
+import time
+import logging
+from typing import List
+from services.whatsapp_service import WhatsAppService
+from config import QR_REFRESH_INTERVAL_MS, QR_LOGIN_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+QUIET_ZONE = 2
+CLEAR_SCREEN = "\033[2J\033[H"
+
+
+def render_qr(rows: List[str]) -> str:
+    """Draw QR modules ("1" = dark) with half-block characters, two module rows per line.
+
+    Light modules are drawn filled, so the code scans from the usual dark terminal.
+    """
+    width = len(rows[0]) + 2 * QUIET_ZONE
+    padded = (["0" * width] * QUIET_ZONE
+              + ["0" * QUIET_ZONE + row + "0" * QUIET_ZONE for row in rows]
+              + ["0" * width] * QUIET_ZONE)
+    if len(padded) % 2:
+        padded.append("0" * width)
+
+    lines = []
+    for top, bottom in zip(padded[::2], padded[1::2]):
+        line = ""
+        for upper, lower in zip(top, bottom):
+            if upper == "0" and lower == "0":
+                line += "█"
+            elif upper == "0":
+                line += "▀"
+            elif lower == "0":
+                line += "▄"
+            else:
+                line += " "
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def run_terminal_login(profile_name: str = "chrome_profile") -> int:
+    """Link a profile by scanning a QR code drawn in the terminal, e.g. on a server without a display."""
+    service = WhatsAppService(profile_name=profile_name)
+    try:
+        if not service.start_headless_login():
+            print("Could not start the browser", file=sys.stderr)
+            return 1
+
+        shown_ref = None
+        deadline = time.monotonic() + QR_LOGIN_TIMEOUT
+        while not service.poll_login():
+            if time.monotonic() >= deadline:
+                print("QR code was not scanned in time", file=sys.stderr)
+                return 1
+
+            qr = service.qr_code_matrix()
+            if qr is not None and qr[0] != shown_ref:
+                shown_ref = qr[0]
+                print(CLEAR_SCREEN + render_qr(qr[1]))
+                print("\nOpen WhatsApp on your phone > Linked devices and scan this code.")
+                print("It refreshes by itself, press Ctrl+C to cancel.")
+            time.sleep(QR_REFRESH_INTERVAL_MS / 1000)
+
+        print(f"Logged in. Profile '{profile_name}' is now linked and used by headless sends.")
+        return 0
+
+    except KeyboardInterrupt:
+        return 130
+
+    finally:
+        service.close()
@@ -5,7 +5,8 @@ from pathlib import Path
 from typing import List, Dict, Any, Optional
 import pandas as pd
 from models.contact import Contact
-from models.message import Message
+from models.message import Message, MediaType
+from config import SUPPORTED_IMAGE_FORMATS, SUPPORTED_VIDEO_FORMATS
 
 logger = logging.getLogger(__name__)
 
@@ -138,6 +139,16 @@ class FileHandler:
             logger.error(f"Error saving settings: {str(e)}")
             raise
 
+    @staticmethod
+    def detect_media_type(file_path: str) -> MediaType:
+        suffix = Path(file_path).suffix.lower()
+        if suffix in SUPPORTED_IMAGE_FORMATS:
+            return MediaType.Image
+        if suffix in SUPPORTED_VIDEO_FORMATS:
+            return MediaType.Video
+        # Anything else goes out as a document
+        return MediaType.Document
+
     @staticmethod
     def validate_phone_number(phone: str) -> bool:
         cleaned = ''.join(filter(str.isdigit, phone))